@@ -54,7 +54,7 @@ if bpy.app.version < get_min_blender_version():
 
 from . import global_data
 from .registration import register_base, unregister_base, register_full, unregister_full
-from .utilities.install import check_module
+from .utilities.install import has_module
 from .utilities.register import cleanse_modules
 from .utilities.presets import ensure_addon_presets
 from .utilities.logging import setup_logger, update_logger
@@ -81,13 +81,19 @@ def register():
 
     logger.info("Enabled CAD Sketcher base, version: {}".format(get_addon_version()))
 
-    # Check Module and register all modules
+    # Check Module and register all modules,
+    # py_slvs itself is only imported once the solver runs
     try:
-        check_module("py_slvs", raise_exception=True)
+        if not has_module("py_slvs"):
+            raise ModuleNotFoundError("No module named 'py_slvs'")
         register_full()
 
         global_data.registered = True
-        logger.info("Solvespace available, fully registered modules")
+        logger.info(
+            "Solvespace available, fully registered modules in {:.2f}ms".format(
+                sum(map(sum, global_data.startup_timings.values())) * 1000
+            )
+        )
     except ModuleNotFoundError as e:
         global_data.registered = False
         logger.warning(
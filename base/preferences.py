@@ -132,6 +132,50 @@ class Preferences(AddonPreferences):
         name="Make all Entities Selectable", update=update_cb
     )
     force_redraw: BoolProperty(name="Force Entity Redraw", default=True)
+    collect_solver_stats: BoolProperty(
+        name="Collect Solver Statistics",
+        description="Record timings and sizes of every solver run",
+        default=False,
+    )
+    decompose_sketches: BoolProperty(
+        name="Solve Components Separately",
+        description=(
+            "Split sketches into parts that aren't connected by constraints and "
+            "solve them individually, unchanged parts are skipped"
+        ),
+        default=False,
+    )
+    use_solve_cache: BoolProperty(
+        name="Cache Solver Results",
+        description=(
+            "Remember results of recently solved sketches and reuse them when "
+            "a sketch is solved again with the same input"
+        ),
+        default=False,
+    )
+    use_parallel_solving: BoolProperty(
+        name="Parallel Solving",
+        description=(
+            "Solve independent sketches in separate processes when solving all "
+            "sketches at once"
+        ),
+        default=False,
+    )
+    solver_processes: IntProperty(
+        name="Solver Processes",
+        description="Number of processes for parallel solving, 0 uses one per CPU",
+        default=0,
+        min=0,
+        soft_max=32,
+    )
+    use_async_tweak: BoolProperty(
+        name="Background Tweaking",
+        description=(
+            "Solve in a separate process while tweaking, only the latest mouse "
+            "position is solved"
+        ),
+        default=False,
+    )
 
     decimal_precision: IntProperty(
         name="Decimal Precision",
@@ -223,6 +267,12 @@ class Preferences(AddonPreferences):
         col = box.column(align=True)
         col.prop(self, "show_debug_settings")
         col.prop(self, "logging_level")
+        col.prop(self, "decompose_sketches")
+        col.prop(self, "use_solve_cache")
+        col.prop(self, "use_parallel_solving")
+        sub = col.column(align=True)
+        sub.active = self.use_parallel_solving
+        sub.prop(self, "solver_processes")
 
         box = layout.box()
         row = box.row()
@@ -0,0 +1,311 @@
+"""Headless batch processing of .blend files
+
+Solves all sketches of every given file, updates the converted geometry of
+sketches with a convert type and saves the file. Files are distributed over a
+pool of blender processes that run in the background.
+
+Run from the repository root with any python interpreter:
+
+    python ./batch.py --jobs=4 --output=summary.json parts/*.blend
+
+Arguments:
+    --blender=PATH      Blender executable, defaults to "blender"
+    --jobs=INT          Number of parallel blender processes, defaults to one per cpu
+    --batch-size=INT    Number of files a blender process opens one after another
+    --output=PATH       Write a json summary of all files
+    --no-save           Process files without saving them
+
+The process exits with a non zero code if a file couldn't be processed or
+failed to solve.
+"""
+
+import glob
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Add parent directory to sys.path to allow importing the addon
+module_path = Path(__file__).parent.parent.as_posix()
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+ADDON_NAME = "CAD_Sketcher"
+DEFAULT_BATCH_SIZE = 4
+
+# Lines of a crashed worker's output that are kept in the summary
+OUTPUT_TAIL = 20
+
+
+# Worker, runs inside of blender
+
+
+@contextmanager
+def _measure(timings: Dict, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def _sketch_states(scene) -> List[Dict]:
+    return [
+        {
+            "name": sketch.name,
+            "index": sketch.slvs_index,
+            "state": sketch.solver_state,
+            "dof": sketch.dof,
+        }
+        for sketch in scene.sketcher.entities.sketches
+    ]
+
+
+def process_file(filepath: str, save: bool = True) -> Dict:
+    """Open a file, solve and convert all of its scenes and save it"""
+    import bpy
+    from CAD_Sketcher.converters import update_convertor_geometry
+    from CAD_Sketcher.solver import Solver
+
+    timings = {}
+    result = {
+        "file": filepath,
+        "ok": False,
+        "error": None,
+        "timings": timings,
+        "scenes": {},
+    }
+
+    try:
+        with _measure(timings, "open"):
+            bpy.ops.wm.open_mainfile(filepath=filepath, load_ui=False)
+
+        context = bpy.context
+        ok = True
+        for scene in bpy.data.scenes:
+            with context.temp_override(scene=scene):
+                with _measure(timings, "solve"):
+                    solver = Solver(context, None, all=True)
+                    solved = solver.solve(report=False)
+                with _measure(timings, "convert"):
+                    update_convertor_geometry(scene)
+
+            result["scenes"][scene.name] = {
+                "ok": solved,
+                "sketches": _sketch_states(scene),
+            }
+            ok = ok and solved
+
+        if save:
+            with _measure(timings, "save"):
+                bpy.ops.wm.save_mainfile()
+        result["ok"] = ok
+    except Exception as e:
+        logger.error(traceback.format_exc())
+        result["error"] = "{}: {}".format(type(e).__name__, e)
+
+    result["time"] = sum(timings.values())
+    return result
+
+
+def run_worker(files: List[str], result_path: str, save: bool = True):
+    results = []
+    for filepath in files:
+        results.append(process_file(filepath, save=save))
+
+        # Keep the results of processed files if blender crashes on a later one
+        with open(result_path, "w") as f:
+            json.dump(results, f)
+
+
+# Dispatcher, runs in any python interpreter
+
+
+def _worker_command(blender: str, files: List[str], result_path: str, save: bool):
+    cmd = [
+        blender,
+        "--background",
+        "--factory-startup",
+        "--addons",
+        ADDON_NAME,
+        "--python",
+        os.path.abspath(__file__),
+        "--",
+        "--worker",
+        "--result={}".format(result_path),
+    ]
+    if not save:
+        cmd.append("--no-save")
+    return cmd + files
+
+
+def _run_batch(blender: str, files: List[str], result_path: str, save: bool):
+    process = subprocess.run(
+        _worker_command(blender, files, result_path, save),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+
+    results = []
+    if os.path.exists(result_path):
+        with open(result_path) as f:
+            results = json.load(f)
+
+    # Files that weren't reached because the worker crashed
+    output = process.stdout.splitlines()[-OUTPUT_TAIL:]
+    error = "Blender exited with code {}".format(process.returncode)
+    for filepath in files[len(results) :]:
+        results.append(
+            {
+                "file": filepath,
+                "ok": False,
+                "error": error,
+                "output": output,
+                "timings": {},
+                "scenes": {},
+                "time": 0.0,
+            }
+        )
+    return results
+
+
+def expand_files(patterns: List[str]) -> List[str]:
+    """Resolve glob patterns, shells on windows don't expand them"""
+    files = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        files.extend(os.path.abspath(path) for path in matches)
+    return list(dict.fromkeys(files))
+
+
+def summarize(results: List[Dict], wall_time: float) -> Dict:
+    errors = [r for r in results if r["error"]]
+    failed = [r for r in results if not r["ok"] and not r["error"]]
+    return {
+        "files": len(results),
+        "ok": len(results) - len(errors) - len(failed),
+        "failed": len(failed),
+        "errors": len(errors),
+        "time": wall_time,
+        "cpu_time": sum(r["time"] for r in results),
+    }
+
+
+def format_result(result: Dict) -> str:
+    if result["error"]:
+        status = "ERROR"
+    else:
+        status = "OK" if result["ok"] else "FAILED"
+    return "{:<60} {:>6} {:>10.2f}s".format(result["file"], status, result["time"])
+
+
+def run(
+    files: List[str],
+    blender: str = "blender",
+    jobs: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    save: bool = True,
+) -> Dict:
+    """Process files in parallel blender processes, returns the summary"""
+    jobs = jobs or os.cpu_count() or 1
+    batches = [files[i : i + batch_size] for i in range(0, len(files), batch_size)]
+
+    start = time.perf_counter()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, ThreadPoolExecutor(jobs) as pool:
+        futures = [
+            pool.submit(
+                _run_batch,
+                blender,
+                batch,
+                os.path.join(tmp, "{}.json".format(i)),
+                save,
+            )
+            for i, batch in enumerate(batches)
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                print(format_result(result))
+                results.append(result)
+
+    # Keep the order of the input
+    order = {filepath: i for i, filepath in enumerate(files)}
+    results.sort(key=lambda r: order[r["file"]])
+
+    return {
+        "meta": {
+            "time": time.time(),
+            "blender": blender,
+            "jobs": jobs,
+            "batch_size": batch_size,
+            "platform": platform.platform(),
+        },
+        "summary": summarize(results, time.perf_counter() - start),
+        "files": results,
+    }
+
+
+def main(kwargs: Dict, args: List[str]):
+    save = "--no-save" not in kwargs
+
+    if "--worker" in kwargs:
+        run_worker(args, kwargs["--result"], save=save)
+        return 0
+
+    files = expand_files(args)
+    if not files:
+        print("No files given")
+        return 1
+
+    report = run(
+        files,
+        blender=kwargs.get("--blender", "blender"),
+        jobs=int(kwargs.get("--jobs", 0)),
+        batch_size=int(kwargs.get("--batch-size", DEFAULT_BATCH_SIZE)),
+        save=save,
+    )
+
+    if "--output" in kwargs:
+        with open(kwargs["--output"], "w") as f:
+            json.dump(report, f, indent=2)
+
+    summary = report["summary"]
+    print(
+        "{files} files, {ok} ok, {failed} failed, {errors} errors in {time:.2f}s".format(
+            **summary
+        )
+    )
+    return 0 if summary["ok"] == summary["files"] else 1
+
+
+if __name__ == "__main__":
+    kwargs = {}
+    args = []
+    argv = sys.argv
+
+    # Blender passes the script's arguments after "--"
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1 :]
+    else:
+        argv = argv[1:]
+
+    for arg in argv:
+        if not arg.startswith("--"):
+            args.append(arg)
+            continue
+        key, _, value = arg.partition("=")
+        kwargs[key] = value
+
+    sys.exit(main(kwargs, args))
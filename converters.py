@@ -1,98 +1,246 @@
 import logging
 import math
-from typing import Union
+from collections import namedtuple
+from typing import Dict, List, Union
 
 import bpy
-import bmesh
+import numpy as np
 from bpy.types import Mesh, Scene, Object
+from mathutils import Vector
+from mathutils.geometry import tessellate_polygon
 
-from .utilities.bezier import set_handles
+from .solver import Solver
+from .utilities.constants import QUARTER_TURN
 from .utilities.walker import EntityWalker
 
 logger = logging.getLogger(__name__)
 
+# Vertices between edges that deviate less than this are dissolved
+DISSOLVE_ANGLE_LIMIT = math.radians(0.1)
+
+# Geometry of a path as returned by evaluate_sketch, coordinates are arrays of
+# shape (N, 2) in the sketch's space or (N, 3) in world space
+Polyline = namedtuple("Polyline", ("coords", "cyclic"))
+BezierSpline = namedtuple(
+    "BezierSpline", ("co", "handle_left", "handle_right", "cyclic")
+)
+
+
+def _to_3d(coords, dtype=np.float32):
+    co = np.zeros((len(coords), 3), dtype=dtype)
+    co[:, :2] = coords
+    return co
+
 
 class BezierConverter(EntityWalker):
     def __init__(self, scene, sketch):
         super().__init__(scene, sketch)
 
+    def _bezier_spline(self, spline_path):
+        path_segments, directions = spline_path
+        is_cyclic = self.is_cyclic_path(path_segments)
+
+        segment_coords = [
+            seg.bezier_coords(directions[i]) for i, seg in enumerate(path_segments)
+        ]
+        amount = sum(len(handles) for _, handles in segment_coords)
+
+        if not is_cyclic:
+            amount += 1
+
+        co, handle_left, handle_right = (np.zeros((amount, 2)) for _ in range(3))
+
+        index = 0
+        for locations, handles in segment_coords:
+            sub_segment_count = len(handles)
+
+            # The last point of a cyclic spline is its first point
+            indices = (index + np.arange(sub_segment_count + 1)) % amount
+            co[indices] = locations
+            handle_right[indices[:-1]] = handles[:, 0]
+            handle_left[indices[1:]] = handles[:, 1]
+            index += sub_segment_count
+
+        if not is_cyclic:
+            handle_left[0] = co[0]
+            handle_right[-1] = co[-1]
+        return BezierSpline(co, handle_left, handle_right, is_cyclic)
+
+    def splines(self) -> List["BezierSpline"]:
+        """Returns the control points of all paths in the sketch's space"""
+        return [self._bezier_spline(path) for path in self.paths if path[0]]
+
     def to_bezier(self, curve_data):
         curve_data.fill_mode = "FRONT" if self.sketch.fill_shape else "NONE"
 
-        for spline_path in self.paths:
-            path_segments = spline_path[0]
+        for spline in self.splines():
             s = curve_data.splines.new("BEZIER")
-
-            is_cyclic = self.is_cyclic_path(path_segments)
-            if is_cyclic:
+            if spline.cyclic:
                 s.use_cyclic_u = True
 
-            segment_count = [
-                seg.bezier_segment_count()
-                if hasattr(seg, "bezier_segment_count")
-                else 1
-                for seg in path_segments
-            ]
-            amount = sum(segment_count)
-
-            if not is_cyclic:
-                amount += 1
             # NOTE: There's  already one point in a new spline
+            amount = len(spline.co)
             s.bezier_points.add(amount - 1)
 
-            startpoint = s.bezier_points[0]
-            set_handles(startpoint)
-            previous_point = startpoint
-
-            last_index = len(path_segments) - 1
-            index = 0
-            for i, segment in enumerate(path_segments):
-                invert_direction = spline_path[1][i]
-
-                # TODO: rename to seg_count and segment_counts
-                sub_segment_count = segment_count[i]
-
-                if i == last_index and is_cyclic:
-                    end = s.bezier_points[0]
-                else:
-                    end = s.bezier_points[index + sub_segment_count]
-
-                midpoints = (
-                    [
-                        s.bezier_points[index + i + 1]
-                        for i in range(sub_segment_count - 1)
-                    ]
-                    if sub_segment_count
-                    else []
-                )
-                kwargs = {}
-                if i == 0:
-                    kwargs["set_startpoint"] = True
-                if sub_segment_count > 1:
-                    kwargs["midpoints"] = midpoints
-
-                previous_point = segment.to_bezier(
-                    s, previous_point, end, invert_direction, **kwargs
-                )
-                index += sub_segment_count
+            points = s.bezier_points
+            free = np.zeros(amount, dtype=np.int32)
+            points.foreach_set("handle_left_type", free)
+            points.foreach_set("handle_right_type", free)
+            points.foreach_set("co", _to_3d(spline.co).ravel())
+            points.foreach_set("handle_left", _to_3d(spline.handle_left).ravel())
+            points.foreach_set("handle_right", _to_3d(spline.handle_right).ravel())
+
+
+def _dissolve_collinear(coords, cyclic: bool):
+    """Remove vertices between edges that (nearly) continue in the same direction"""
+    if len(coords) < 3:
+        return coords
+
+    prev = coords - np.roll(coords, 1, axis=0)
+    next = np.roll(coords, -1, axis=0) - coords
+    cross = prev[:, 0] * next[:, 1] - prev[:, 1] * next[:, 0]
+    dot = (prev * next).sum(axis=1)
+
+    keep = np.abs(np.arctan2(cross, dot)) >= DISSOLVE_ANGLE_LIMIT
+    if not cyclic:
+        keep[0] = keep[-1] = True
+    elif keep.sum() < 3:
+        return coords
+    return coords[keep]
+
+
+class MeshConverter(EntityWalker):
+    """Samples the paths of a sketch directly into mesh data, arcs and circles
+    get the sketch's curve resolution per quarter turn. Unlike a bezier curve
+    that uses the full resolution for every spline segment, the number of
+    segments follows the angle of an arc.
+    """
+
+    def __init__(self, scene, sketch, resolution: Union[int, None] = None):
+        super().__init__(scene, sketch)
+        self.resolution = resolution or sketch.curve_resolution
 
+    def _sample_segment(self, segment, invert: bool):
+        """Returns the coordinates of a segment in the direction of the path"""
+        if not segment.is_curve():
+            coords = np.array((segment.p1.co, segment.p2.co), dtype=np.float64)
+        else:
+            center = np.array(segment.ct.co, dtype=np.float64)
+            if segment.is_closed():
+                start_angle, angle = 0.0, math.tau
+            else:
+                start_angle, angle = segment.start_angle, segment.angle
+
+            # Round first so float noise doesn't add a segment
+            count = round(angle / QUARTER_TURN * self.resolution, 6)
+            count = max(math.ceil(count), 1)
+            angles = start_angle + angle * np.arange(count + 1) / count
+            coords = center + segment.radius * np.column_stack(
+                (np.cos(angles), np.sin(angles))
+            )
+            if not segment.is_closed():
+                # Avoid gaps to connected segments
+                coords[0], coords[-1] = segment.start.co, segment.end.co
+
+        if invert:
+            coords = coords[::-1]
+        return coords
+
+    def _sample_path(self, path):
+        segments, directions = path
+        cyclic = self.is_cyclic_path(segments)
+
+        # Segments share their endpoint with the next segment's startpoint
+        parts = [
+            self._sample_segment(seg, directions[i])[:-1]
+            for i, seg in enumerate(segments)
+        ]
+        if not cyclic:
+            parts.append(self._sample_segment(segments[-1], directions[-1])[-1:])
+
+        coords = _dissolve_collinear(np.concatenate(parts), cyclic)
+        return Polyline(coords, cyclic)
+
+    def polylines(self) -> List[Polyline]:
+        """Returns the sampled paths in the sketch's space"""
+        return [self._sample_path(path) for path in self.paths if path[0]]
+
+    def to_mesh(self, mesh: Mesh):
+        """Write the sketch's geometry to a mesh, replaces existing geometry"""
+        polylines = []
+        edges = []
+        fill_paths = []
+        offset = 0
+
+        for coords, cyclic in self.polylines():
+            count = len(coords)
+
+            indices = np.arange(offset, offset + count, dtype=np.int32)
+            if cyclic:
+                edges.append(np.column_stack((indices, np.roll(indices, -1))))
+                fill_paths.append((coords, offset))
+            else:
+                edges.append(np.column_stack((indices[:-1], indices[1:])))
 
-def mesh_from_temporary(mesh: Mesh, name: str, existing_mesh: Union[bool, None] = None):
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
+            polylines.append(coords)
+            offset += count
 
-    bmesh.ops.dissolve_limit(
-        bm, angle_limit=math.radians(0.1), verts=bm.verts, edges=bm.edges
-    )
+        tris = self._fill(fill_paths) if self.sketch.fill_shape else None
 
-    if existing_mesh:
-        existing_mesh.clear_geometry()
-        new_mesh = existing_mesh
-    else:
-        new_mesh = bpy.data.meshes.new(name)
-    bm.to_mesh(new_mesh)
-    bm.free()
-    return new_mesh
+        mesh.clear_geometry()
+        if not polylines:
+            return mesh
+
+        co = _to_3d(np.concatenate(polylines))
+
+        mesh.vertices.add(len(co))
+        mesh.vertices.foreach_set("co", co.ravel())
+
+        edges = np.concatenate(edges).astype(np.int32)
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.ravel())
+
+        if tris is not None and len(tris):
+            tri_count = len(tris)
+            mesh.loops.add(tri_count * 3)
+            mesh.loops.foreach_set("vertex_index", tris.ravel())
+            mesh.polygons.add(tri_count)
+            mesh.polygons.foreach_set(
+                "loop_start", np.arange(0, tri_count * 3, 3, dtype=np.int32)
+            )
+            if bpy.app.version < (4, 0, 0):
+                mesh.polygons.foreach_set(
+                    "loop_total", np.full(tri_count, 3, dtype=np.int32)
+                )
+
+        mesh.update(calc_edges=tris is not None and len(tris) > 0)
+        return mesh
+
+    @staticmethod
+    def _fill(fill_paths):
+        """Triangulate closed paths, nested paths are treated as holes"""
+        if not fill_paths:
+            return None
+
+        coords = np.concatenate([coords for coords, _ in fill_paths])
+        polylines = [
+            [Vector((x, y, 0.0)) for x, y in coords] for coords, _ in fill_paths
+        ]
+        tris = np.array(tessellate_polygon(polylines), dtype=np.int32).reshape(-1, 3)
+
+        # Let all faces point up like a filled curve
+        a, b, c = (coords[tris[:, i]] for i in range(3))
+        area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (
+            c[:, 0] - a[:, 0]
+        )
+        flip = area < 0
+        tris[flip] = tris[flip][:, ::-1]
+
+        # Map indices of the concatenated polylines to the mesh's vertices
+        mapping = np.concatenate(
+            [np.arange(offset, offset + len(coords)) for coords, offset in fill_paths]
+        ).astype(np.int32)
+        return mapping[tris]
 
 
 def _cleanup_data(sketch, mode: str):
@@ -117,6 +265,44 @@ def _link_unlink_object(scene: Scene, ob: Object, keep: bool):
         objects.link(ob)
 
 
+def _update_curve_object(scene: Scene, sketch):
+    name = sketch.name
+
+    # Create curve object
+    if not sketch.target_curve_object:
+        curve = bpy.data.objects.data.curves.new(name, "CURVE")
+        object = bpy.data.objects.new(name, curve)
+        sketch.target_curve_object = object
+    else:
+        # Clear curve data
+        sketch.target_curve_object.data.splines.clear()
+
+    # Convert geometry to curve data
+    conv = BezierConverter(scene, sketch)
+    conv.to_bezier(sketch.target_curve_object.data)
+
+    _link_unlink_object(scene, sketch.target_curve_object, True)
+    return sketch.target_curve_object
+
+
+def _update_mesh_object(scene: Scene, sketch):
+    name = sketch.name
+
+    # Sample geometry directly into mesh data
+    if sketch.target_object:
+        mesh = sketch.target_object.data
+    else:
+        mesh = bpy.data.meshes.new(name)
+    MeshConverter(scene, sketch).to_mesh(mesh)
+
+    # Create mesh object
+    if not sketch.target_object:
+        mesh_object = bpy.data.objects.new(name, mesh)
+        scene.collection.objects.link(mesh_object)
+        sketch.target_object = mesh_object
+    return sketch.target_object
+
+
 def update_convertor_geometry(scene: Scene, sketch=None):
     coll = (sketch,) if sketch else scene.sketcher.entities.sketches
     for sketch in coll:
@@ -125,62 +311,85 @@ def update_convertor_geometry(scene: Scene, sketch=None):
             _cleanup_data(sketch, mode)
             continue
 
-        data = bpy.data
-        name = sketch.name
-
-        # Create curve object
-        if not sketch.target_curve_object:
-            curve = bpy.data.objects.data.curves.new(name, "CURVE")
-            object = bpy.data.objects.new(name, curve)
-            sketch.target_curve_object = object
-        else:
-            # Clear curve data
-            sketch.target_curve_object.data.splines.clear()
-
-        # Convert geometry to curve data
-        conv = BezierConverter(scene, sketch)
-
         # TODO: Avoid re-converting sketches where nothing has changed!
         logger.info("Convert sketch {} to {}: ".format(sketch, mode.lower()))
-        curve_data = sketch.target_curve_object.data
-        conv.to_bezier(curve_data)
-        data = curve_data
-
-        # Link / unlink curve object
-        _link_unlink_object(scene, sketch.target_curve_object, mode == "BEZIER")
-
         if mode == "MESH":
-            # Set curve resolution
-            for spline in sketch.target_curve_object.data.splines:
-                spline.resolution_u = sketch.curve_resolution
-
-            # Create mesh data
-            temp_mesh = sketch.target_curve_object.to_mesh()
-            mesh = mesh_from_temporary(
-                temp_mesh,
-                name,
-                existing_mesh=(
-                    sketch.target_object.data if sketch.target_object else None
-                ),
-            )
-            sketch.target_curve_object.to_mesh_clear()
-
-            # Create mesh object
-            if not sketch.target_object:
-                mesh_object = bpy.data.objects.new(name, mesh)
-                scene.collection.objects.link(mesh_object)
-                sketch.target_object = mesh_object
-            else:
-                sketch.target_object.data = mesh
+            target_ob = _update_mesh_object(scene, sketch)
+        else:
+            target_ob = _update_curve_object(scene, sketch)
 
         _cleanup_data(sketch, mode)
 
-        target_ob = (
-            sketch.target_object if mode == "MESH" else sketch.target_curve_object
-        )
         target_ob.matrix_world = sketch.wp.matrix_basis
 
         target_ob.sketch_index = sketch.slvs_index
 
         # Update object name
         target_ob.name = sketch.name
+
+
+def _to_world(path, matrix):
+    """Transform the coordinates of a path from the sketch's to world space"""
+    coords = {
+        name: _to_3d(getattr(path, name), np.float64) @ matrix[:3, :3].T + matrix[:3, 3]
+        for name in path._fields
+        if name != "cyclic"
+    }
+    return path._replace(**coords)
+
+
+def _evaluate(scene: Scene, sketch, mode: str, world_space: bool, resolution):
+    if mode == "POLYLINE":
+        paths = MeshConverter(scene, sketch, resolution=resolution).polylines()
+    elif mode == "BEZIER":
+        paths = BezierConverter(scene, sketch).splines()
+    else:
+        raise ValueError("Unknown evaluation mode: {}".format(mode))
+
+    if world_space:
+        matrix = np.array(sketch.wp.matrix_basis)
+        paths = [_to_world(path, matrix) for path in paths]
+    return paths
+
+
+def evaluate_sketch(
+    context,
+    sketch,
+    mode: str = "POLYLINE",
+    solve: bool = True,
+    world_space: bool = False,
+    resolution: Union[int, None] = None,
+):
+    """Returns the paths of a sketch as arrays without creating any blender data
+
+    Arguments:
+        mode: "POLYLINE" returns a Polyline per path which is sampled like the
+            mesh converter does, "BEZIER" returns a BezierSpline per path with
+            the control points the bezier converter would write
+        solve: Solve the sketch before evaluating it
+        world_space: Return 3D coordinates in world space instead of 2D
+            coordinates in the sketch's space
+        resolution: Segments per bezier segment of arcs and circles, defaults
+            to the sketch's curve resolution
+    """
+    if solve:
+        Solver(context, sketch).solve(report=False)
+    return _evaluate(context.scene, sketch, mode, world_space, resolution)
+
+
+def evaluate_sketches(
+    context, sketches=None, solve: bool = True, **kwargs
+) -> Dict[int, list]:
+    """Evaluate multiple sketches, defaults to all sketches of the scene.
+    Solves everything at once and returns the paths by sketch index, see
+    evaluate_sketch for the other arguments
+    """
+    if sketches is None:
+        sketches = context.scene.sketcher.entities.sketches
+    if solve:
+        Solver(context, None, all=True).solve(report=False)
+
+    return {
+        sketch.slvs_index: evaluate_sketch(context, sketch, solve=False, **kwargs)
+        for sketch in sketches
+    }
@@ -46,11 +46,14 @@ class Operators(str, Enum):
     AlignWorkplaneCursor = "view3d.slvs_align_workplane_cursor"
     AlignView = "view3d.slvs_align_view"
     BatchSet = "view3d.slvs_batch_set"
+    ClearSolverStats = "view3d.slvs_clear_solver_stats"
     ContextMenu = "view3d.slvs_context_menu"
     Copy = "view3d.slvs_copy"
     DeleteConstraint = "view3d.slvs_delete_constraint"
     DeleteEntity = "view3d.slvs_delete_entity"
+    ExportSolverStats = "view3d.slvs_export_solver_stats"
     InstallPackage = "view3d.slvs_install_package"
+    MergePoints = "view3d.slvs_merge_points"
     Paste = "view3d.slvs_paste"
     Move = "view3d.slvs_move"
     Offset = "view3d.slvs_offset"
@@ -7,6 +7,9 @@ from bpy.utils import register_class, unregister_class
 
 from . import global_data
 from .utilities.preferences import use_experimental
+from .utilities.culling import get_culled, update_bounds
+from .utilities.draw import curve_lod_view_changed, update_curve_lod
+from .utilities.draw_state import get_draw_state, update_draw_state
 from .declarations import Operators
 
 logger = logging.getLogger(__name__)
@@ -25,13 +28,17 @@ def draw_selection_buffer(context: Context):
         fb = gpu.state.active_framebuffer_get()
         fb.clear(color=(0.0, 0.0, 0.0, 0.0))
 
+        state = get_draw_state(context)
+        culled = get_culled(context)
         entities = list(context.scene.sketcher.entities.all)
         for e in reversed(entities):
             if e.slvs_index in global_data.ignore_list:
                 continue
             if not hasattr(e, "draw_id"):
                 continue
-            if not e.is_selectable(context):
+            if e.slvs_index in culled:
+                continue
+            if not state.is_selectable(e):
                 continue
             e.draw_id(context)
 
@@ -49,18 +56,32 @@ def update_elements(context: Context, force: bool = False):
     TODO: Avoid to always update batches and selection texture
     """
     entities = list(context.scene.sketcher.entities.all)
+    view_changed = curve_lod_view_changed(context)
+
+    # Updating a point clears its dirty flag, collect the changed geometry
+    # before dependent entities are checked
+    dirty = [e.is_dirty for e in entities]
 
-    for e in entities:
+    for e, changed in zip(entities, dirty):
         if not hasattr(e, "update"):
             continue
-        if not force and not e.is_dirty:
+
+        if e.is_curve() and (
+            view_changed or changed or e.slvs_index not in global_data.curve_lods
+        ):
+            update_curve_lod(e, context)
+        if not force and not changed and not e.is_dirty:
             continue
         e.update()
 
+        # Only changed geometry affects the bounds, not a forced batch rebuild
+        if changed:
+            update_bounds(e)
+
     def _get_msg():
         msg = "Update geometry batches:"
-        for e in entities:
-            if not e.is_dirty:
+        for e, changed in zip(entities, dirty):
+            if not changed:
                 continue
             msg += "\n - " + str(e)
         return msg
@@ -70,9 +91,16 @@ def update_elements(context: Context, force: bool = False):
 
 
 def draw_elements(context: Context):
+    state = get_draw_state(context)
+    culled = get_culled(context)
     for entity in reversed(list(context.scene.sketcher.entities.all)):
-        if hasattr(entity, "draw"):
-            entity.draw(context)
+        if not hasattr(entity, "draw"):
+            continue
+        if entity.slvs_index in culled:
+            continue
+        if not state.is_visible(entity):
+            continue
+        entity.draw(context)
 
 
 def draw_cb():
@@ -80,6 +108,7 @@ def draw_cb():
 
     force = use_experimental("force_redraw", True)
     update_elements(context, force=force)
+    update_draw_state(context)
     draw_elements(context)
 
     global_data.redraw_selection_buffer = True
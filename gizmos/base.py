@@ -1,7 +1,13 @@
 from .. import global_data
 from ..declarations import Operators
 from ..model.types import GenericConstraint
-from .utilities import get_color, get_constraint_color_type, set_gizmo_colors
+from ..utilities.draw_state import get_draw_state, update_draw_state
+from .utilities import (
+    get_color,
+    get_constraint_color_type,
+    set_gizmo_colors,
+    sync_gizmos,
+)
 
 
 class ConstraintGizmo:
@@ -10,17 +16,17 @@ class ConstraintGizmo:
             self.type, self.index
         )
 
-    def get_constraint_color(self, constraint: GenericConstraint):
+    def get_constraint_color(self, constraint: GenericConstraint, state=None):
         is_highlight = (
             constraint == global_data.highlight_constraint or self.is_highlight
         )
         col = get_constraint_color_type(constraint)
-        return get_color(col, is_highlight)
+        return get_color(col, is_highlight, state)
 
     def _set_colors(self, context, constraint: GenericConstraint):
         """Overwrite default color when gizmo is highlighted"""
 
-        color_setting = self.get_constraint_color(constraint)
+        color_setting = self.get_constraint_color(constraint, get_draw_state(context))
         self.color = color_setting[:3]
         return color_setting
 
@@ -65,25 +71,41 @@ class ConstraintGenericGGT:
     def _list_from_type(self, context):
         return context.scene.sketcher.constraints.get_list(self.type)
 
-    def setup(self, context):
-        for c in self._list_from_type(context):
-            if not c.is_active(context.scene.sketcher.active_sketch):
-                continue
-            gz = self.gizmos.new(self.gizmo_type)
-            gz.index = context.scene.sketcher.constraints.get_index(c)
+    def _create_gizmo(self, index, constraint):
+        gz = self.gizmos.new(self.gizmo_type)
+        gz.index = index
+        gz.use_draw_modal = True
+
+        props = gz.target_set_operator(Operators.TweakConstraintValuePos)
+        props.type = self.type
+        props.index = index
+        return gz
 
-            set_gizmo_colors(gz, c)
+    @staticmethod
+    def _update_gizmo(gz, constraint):
+        set_gizmo_colors(gz, constraint)
 
-            gz.use_draw_modal = True
-            gz.target_set_prop("offset", c, "draw_offset")
+        # NOTE: Adding or removing constraints moves the collection's items,
+        # the target property has to be set again
+        gz.target_set_prop("offset", constraint, "draw_offset")
 
-            props = gz.target_set_operator(Operators.TweakConstraintValuePos)
-            props.type = self.type
-            props.index = gz.index
+    def setup(self, context):
+        state = update_draw_state(context)
+        items = {
+            index: c
+            for index, c in enumerate(self._list_from_type(context))
+            if state.is_constraint_active(c)
+        }
+        sync_gizmos(
+            self.gizmos,
+            items,
+            lambda gz: gz.index,
+            self._create_gizmo,
+            self._update_gizmo,
+        )
 
     def refresh(self, context):
-        # recreate gizmos here!
-        self.gizmos.clear()
+        # Only add or remove gizmos of changed constraints
         self.setup(context)
 
     @classmethod
@@ -9,13 +9,19 @@ from .. import icon_manager, units
 from ..declarations import Gizmos, GizmoGroups, Operators
 from ..utilities.preferences import get_prefs
 from ..utilities.view import get_2d_coords
+from ..utilities.draw_state import get_draw_state, update_draw_state
 from .base import ConstraintGizmo
-from .utilities import Color, get_color, set_gizmo_colors
+from .utilities import Color, get_color, set_gizmo_colors, sync_gizmos
 from ..utilities.view import get_scale_from_pos
 
 GIZMO_OFFSET = Vector((1.0, 1.0))
 FONT_ID = 0
 
+# Formatted text and dimensions of value labels, see _get_label
+MAX_CACHED_LABELS = 4096
+_labels = {}
+_label_settings = None
+
 
 def _get_formatted_value(context, constr):
     unit = constr.rna_type.properties["value"].unit
@@ -32,6 +38,27 @@ def _get_formatted_value(context, constr):
     return ""
 
 
+def _get_label(context, constr, state):
+    """Returns the formatted value of a constraint with its text dimensions,
+    labels are reused until unit settings or preferences change
+    """
+    global _label_settings
+    if _label_settings != state.label_settings:
+        _labels.clear()
+        _label_settings = state.label_settings
+
+    key = (constr.type, constr.type == "DIAMETER" and constr.setting, constr.value)
+    label = _labels.get(key)
+    if label is None:
+        if len(_labels) >= MAX_CACHED_LABELS:
+            _labels.clear()
+
+        text = _get_formatted_value(context, constr)
+        blf.size(FONT_ID, state.text_size)
+        label = _labels[key] = (text, *blf.dimensions(FONT_ID, text))
+    return label
+
+
 class VIEW3D_GGT_slvs_constraint(GizmoGroup):
     bl_idname = GizmoGroups.Constraint
     bl_label = "Constraint Gizmo Group"
@@ -44,73 +71,89 @@ class VIEW3D_GGT_slvs_constraint(GizmoGroup):
         # TODO: Allow to hide
         return True
 
-    def setup(self, context):
-        mapping = {}
-        for c in context.scene.sketcher.constraints.all:
-            if not hasattr(c, "placements"):
-                continue
+    def _create_gizmo(self, key, item):
+        idname, type, index, entity_index = key
+        gz = self.gizmos.new(idname)
+        gz.type = type
+        gz.index = index
 
-            for e in c.placements():
-                if not mapping.get(e):
-                    mapping[e] = [
-                        c,
-                    ]
-                else:
-                    mapping[e].append(c)
+        if idname == VIEW3D_GT_slvs_constraint_value.bl_idname:
+            props = gz.target_set_operator(Operators.TweakConstraintValuePos)
+            props.type = type
+            props.index = index
+            return gz
 
-        for e, constrs in mapping.items():
-            if not hasattr(e, "placement"):
-                continue
-            if not e.is_visible(context):
-                continue
+        gz.entity_index = entity_index
+        gz.use_draw_modal = True
 
-            active_sketch = context.scene.sketcher.active_sketch
-            for i, c in enumerate(constrs):
-                if not c.is_active(active_sketch):
-                    continue
-                gz = self.gizmos.new(VIEW3D_GT_slvs_constraint.bl_idname)
-                gz.type = c.type
-                gz.index = context.scene.sketcher.constraints.get_index(c)
+        op = Operators.ContextMenu
+        props = gz.target_set_operator(op)
+        props.type = type
+        props.index = index
 
-                gz.entity_index = e.slvs_index
+        props.highlight_hover = True
+        props.highlight_members = True
+        return gz
 
-                ui_scale = context.preferences.system.ui_scale
-                scale = get_prefs().gizmo_scale * ui_scale
-                offset_base = Vector((scale * 1.0, 0.0))
-                offset = offset_base * i * ui_scale
+    @staticmethod
+    def _update_gizmo(gz, item):
+        constraint, offset, scale = item
+        if offset is None:
+            return
+        gz.offset = offset
+        gz.scale_basis = scale
+        set_gizmo_colors(gz, constraint)
 
-                gz.offset = offset
-                gz.scale_basis = scale
+    @staticmethod
+    def _get_key(gz):
+        return (gz.bl_idname, gz.type, gz.index, getattr(gz, "entity_index", -1))
 
-                set_gizmo_colors(gz, c)
+    def setup(self, context):
+        constraints = context.scene.sketcher.constraints
 
-                gz.use_draw_modal = True
+        mapping = {}
+        for constraint_list in constraints.get_lists():
+            for index, c in enumerate(constraint_list):
+                if not hasattr(c, "placements"):
+                    continue
 
-                op = Operators.ContextMenu
-                props = gz.target_set_operator(op)
-                props.type = c.type
-                props.index = gz.index
+                for e in c.placements():
+                    mapping.setdefault(e, []).append((index, c))
 
-                props.highlight_hover = True
-                props.highlight_members = True
+        ui_scale = context.preferences.system.ui_scale
+        scale = get_prefs().gizmo_scale * ui_scale
+        offset_base = Vector((scale * 1.0, 0.0))
 
-        # Add value gizmos for dimensional constraints
-        for c in context.scene.sketcher.constraints.dimensional:
-            if not c.is_active(context.scene.sketcher.active_sketch):
+        # Gizmos might get refreshed before the entities are drawn
+        state = update_draw_state(context)
+        items = {}
+        icon_idname = VIEW3D_GT_slvs_constraint.bl_idname
+        for e, constrs in mapping.items():
+            if not hasattr(e, "placement"):
+                continue
+            if not state.is_visible(e):
                 continue
 
-            gz = self.gizmos.new(VIEW3D_GT_slvs_constraint_value.bl_idname)
-            index = context.scene.sketcher.constraints.get_index(c)
-            gz.type = c.type
-            gz.index = index
+            for i, (index, c) in enumerate(constrs):
+                if not state.is_constraint_active(c):
+                    continue
+                key = (icon_idname, c.type, index, e.slvs_index)
+                items[key] = (c, offset_base * i * ui_scale, scale)
 
-            props = gz.target_set_operator(Operators.TweakConstraintValuePos)
-            props.type = c.type
-            props.index = index
+        # Add value gizmos for dimensional constraints
+        value_idname = VIEW3D_GT_slvs_constraint_value.bl_idname
+        for constraint_list in constraints.get_dimensional_lists():
+            for index, c in enumerate(constraint_list):
+                if not state.is_constraint_active(c):
+                    continue
+                items[(value_idname, c.type, index, -1)] = (c, None, None)
+
+        sync_gizmos(
+            self.gizmos, items, self._get_key, self._create_gizmo, self._update_gizmo
+        )
 
     def refresh(self, context):
-        # recreate gizmos here!
-        self.gizmos.clear()
+        # Only add or remove gizmos of changed constraints
         self.setup(context)
 
 
@@ -196,13 +239,13 @@ class VIEW3D_GT_slvs_constraint_value(ConstraintGizmo, Gizmo):
         if not constr.visible or not hasattr(constr, "value_placement"):
             return
 
-        color = get_color(Color.Text, self.is_highlight)
-        text = _get_formatted_value(context, constr)
-        text_size = get_prefs().text_size
+        state = get_draw_state(context)
+        color = get_color(Color.Text, self.is_highlight, state)
+        text, self.width, self.height = _get_label(context, constr, state)
+        text_size = state.text_size
 
         blf.color(FONT_ID, *color)
         blf.size(FONT_ID, text_size)
-        self.width, self.height = blf.dimensions(FONT_ID, text)
 
         margin = text_size / 4
 
@@ -23,20 +23,27 @@ def get_constraint_color_type(constraint: GenericConstraint):
     return Color.Default
 
 
-def get_color(color_type: Color, highlit: bool):
-    c_theme = get_prefs().theme_settings.constraint
-    theme_match = {
-        # (type, highlit): color
-        (Color.Default, False): c_theme.default,
-        (Color.Default, True): c_theme.highlight,
-        (Color.Failed, False): c_theme.failed,
-        (Color.Failed, True): c_theme.failed_highlight,
-        (Color.Reference, False): c_theme.reference,
-        (Color.Reference, True): c_theme.reference_highlight,
-        (Color.Text, False): c_theme.text,
-        (Color.Text, True): c_theme.text_highlight,
-    }
-    return theme_match[(color_type, highlit)]
+_theme_match = {
+    # (type, highlit): theme property
+    (Color.Default, False): "default",
+    (Color.Default, True): "highlight",
+    (Color.Failed, False): "failed",
+    (Color.Failed, True): "failed_highlight",
+    (Color.Reference, False): "reference",
+    (Color.Reference, True): "reference_highlight",
+    (Color.Text, False): "text",
+    (Color.Text, True): "text_highlight",
+}
+
+
+def get_color(color_type: Color, highlit: bool, state=None):
+    """Get a constraint theme color, pass the frame's DrawState to avoid
+    looking up the preferences
+    """
+    name = _theme_match[(color_type, highlit)]
+    if state:
+        return state.constraint_colors[name]
+    return getattr(get_prefs().theme_settings.constraint, name)
 
 
 def set_gizmo_colors(gz, constraint):
@@ -50,6 +57,35 @@ def set_gizmo_colors(gz, constraint):
     gz.alpha_highlight = color_highlight[-1]
 
 
+def sync_gizmos(gizmos, items: dict, get_key, create, update):
+    """Reconcile the gizmos of a group with the items they should represent
+
+    Gizmos whose key isn't in items get removed, missing ones are created and
+    all remaining ones are updated, this avoids recreating every gizmo on each
+    refresh.
+
+    Arguments:
+        gizmos: The gizmos collection of a gizmo group.
+        items: Mapping of gizmo key to the item it represents.
+        get_key: Returns the key of an existing gizmo.
+        create: Creates the gizmo for a key and item.
+        update: Updates a gizmo from its item.
+    """
+    existing = {}
+    for gz in list(gizmos):
+        key = get_key(gz)
+        if key in items and key not in existing:
+            existing[key] = gz
+        else:
+            gizmos.remove(gz)
+
+    for key, item in items.items():
+        gz = existing.get(key)
+        if gz is None:
+            gz = create(key, item)
+        update(gz, item)
+
+
 def draw_arrow_shape(target, shoulder, width, is_3d=False):
     v = shoulder - target
     mat = Matrix.Rotation(QUARTER_TURN, (3 if is_3d else 2), "Z")
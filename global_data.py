@@ -5,11 +5,30 @@ from mathutils import Vector
 
 registered = False
 
+# Import and register time of the addon's modules, see utilities.register
+startup_timings = {}
+
 PYPATH = sys.executable
 
 entities = {}
 batches = {}
 
+# Level of detail the batches of curves were created with
+curve_lods = {}
+
+# View matrix and region size the curve lods were computed for
+curve_lod_view = None
+
+# World space bounding boxes of entities and sketches, see utilities.culling
+bounds = {}
+sketch_bounds = {}
+
+# Entity and constraint indices per sketch, see utilities.membership
+sketch_membership = None
+
+# Evaluated entity state of the current frame, see utilities.draw_state
+draw_state = None
+
 offscreen = None
 redraw_selection_buffer = False
 
@@ -63,9 +63,16 @@ def unregister_handlers():
 
 def _setup_builtin_handlers():
     from .versioning import write_addon_version, do_versioning
+    from .utilities.solver import clear_pending
+    from .utilities.membership import invalidate_membership
 
     add_builtin_handler("version_update", do_versioning)
     add_builtin_handler("save_pre", write_addon_version)
+    add_builtin_handler("load_pre", clear_pending)
+
+    # Indices might differ from the collected sketch membership
+    for event in ("load_post", "undo_post", "redo_post"):
+        add_builtin_handler(event, invalidate_membership)
 
 
 def register():
@@ -74,4 +81,9 @@ def register():
 
 
 def unregister():
+    from .utilities.solver import clear_pending
+    from .utilities.solver_pool import shutdown
+
     unregister_handlers()
+    clear_pending()
+    shutdown()
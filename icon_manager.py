@@ -4,12 +4,14 @@ from functools import cache
 import gpu
 import bpy
 import bpy.utils.previews
+import numpy as np
 from gpu_extras.batch import batch_for_shader
 from bpy.app import background
 
 from .declarations import Operators
 from .shaders import Shaders
 
+# Textures of the constraint icons, only created once a type is drawn
 icons = {}
 preview_icons = None
 _operator_types = {
@@ -26,6 +28,7 @@ _operator_types = {
     Operators.AddMidPoint: "MIDPOINT",
     Operators.AddRatio: "RATIO",
 }
+_type_operators = {type: operator for operator, type in _operator_types.items()}
 
 @cache
 def _get_shader():
@@ -48,9 +51,28 @@ def get_icon(name: str):
 
 def load_icon(type, icon):
     size, pixels = icon.icon_size, icon.icon_pixels_float
-    buffer = gpu.types.Buffer('FLOAT', (1, len(pixels)), [pixels])
+    if not size[0] or not size[1]:
+        # Preview isn't loaded yet
+        return None
+
+    data = np.empty(len(pixels), dtype=np.float32)
+    pixels.foreach_get(data)
+    buffer = gpu.types.Buffer('FLOAT', len(data), data)
     texture = gpu.types.GPUTexture(size=size, data=buffer)
     icons[type] = texture
+    return texture
+
+
+def get_texture(type):
+    """Returns the icon texture of a constraint type, creates it on first use"""
+    texture = icons.get(type)
+    if texture or not preview_icons:
+        return texture
+
+    icon = preview_icons.get(_type_operators.get(type))
+    if not icon:
+        return None
+    return load_icon(type, icon)
 
 
 def load():
@@ -62,16 +84,13 @@ def load():
     if background:
         return
 
+    # Only registers the image files, textures are created when drawn
     load_preview_icons()
 
-    for operator, icon in preview_icons.items():
-        load_icon(_operator_types[operator], icon)
-
 
 def unload():
-    global icons
     unload_preview_icons()
-    icons = {}
+    icons.clear()
 
 
 def load_preview_icons():
@@ -115,7 +134,7 @@ def get_constraint_icon(operator: str):
 
 
 def draw(type, color):
-    texture = icons.get(type)
+    texture = get_texture(type)
 
     if not texture:
         return
@@ -6,6 +6,7 @@ from bpy.types import PropertyGroup, Context
 from bpy.props import BoolProperty
 from gpu_extras.batch import batch_for_shader
 import math
+import numpy as np
 from mathutils import Vector, Matrix
 from mathutils.geometry import intersect_line_sphere_2d, intersect_sphere_sphere_2d
 from bpy.utils import register_classes_factory
@@ -14,14 +15,13 @@ from ..solver import Solver
 from .base_entity import SlvsGenericEntity
 from .base_entity import Entity2D
 from .utilities import slvs_entity_pointer, tag_update
-from .constants import CURVE_RESOLUTION
-from ..utilities.constants import HALF_TURN, FULL_TURN, QUARTER_TURN
+from ..utilities.constants import FULL_TURN, QUARTER_TURN
 from ..utilities.math import range_2pi, pol2cart
-from ..utilities.draw import coords_arc_2d
+from ..utilities.draw import coords_arc_lod, coords_to_3d, get_curve_lod
 from .utilities import (
     get_connection_point,
     get_bezier_curve_midpoint_positions,
-    create_bezier_curve,
+    bezier_arc_handles,
     round_v,
 )
 from ..utilities.math import range_2pi, pol2cart
@@ -93,14 +93,10 @@ class SlvsArc(Entity2D, PropertyGroup):
             offset = p1.angle_signed(Vector((1, 0)))
             angle = range_2pi(p2.angle_signed(p1))
 
-            # TODO: resolution should depend on segment length?!
-            segments = round(CURVE_RESOLUTION * (angle / FULL_TURN))
-
-            coords = coords_arc_2d(0, 0, radius, segments, angle=angle, offset=offset)
+            coords = coords_arc_lod(radius, get_curve_lod(self), angle, offset)
 
             mat_local = Matrix.Translation(self.ct.co.to_3d())
-            mat = self.wp.matrix_basis @ mat_local
-            coords = [(mat @ Vector((*co, 0)))[:] for co in coords]
+            coords = coords_to_3d(self.wp.matrix_basis @ mat_local, coords)
 
         kwargs = {"pos": coords}
         self._batch = batch_for_shader(self._shader, "LINE_STRIP", kwargs)
@@ -219,49 +215,32 @@ class SlvsArc(Entity2D, PropertyGroup):
         dir1, dir2 = directions
         return dir1.angle_signed(dir2)
 
-    def to_bezier(
-        self,
-        spline,
-        startpoint,
-        endpoint,
-        invert_direction,
-        set_startpoint=False,
-        midpoints=[],
-    ):
-        # Get midpoint positions
-        segment_count = len(midpoints) + 1
-        curve_angle = self.angle
-        radius, center, start = self.radius, self.ct.co, self.start.co
+    def bezier_coords(self, invert_direction, segment_count=None):
+        """Returns the locations of the bezier points in the direction of the
+        path and the handles of each bezier segment
+        """
+        if segment_count is None:
+            segment_count = max(self.bezier_segment_count(), 1)
 
+        curve_angle = self.angle
         midpoint_positions = get_bezier_curve_midpoint_positions(
-            self, segment_count, midpoints, curve_angle
+            self, segment_count, range(segment_count - 1), curve_angle
         )
 
-        angle = curve_angle / segment_count
-
-        locations = [self.start.co, *midpoint_positions, self.end.co]
-        bezier_points = [startpoint, *midpoints, endpoint]
-
+        locations = np.array(
+            [self.start.co, *midpoint_positions, self.end.co], dtype=np.float64
+        )
         if invert_direction:
-            locations.reverse()
-
-        if set_startpoint:
-            startpoint.co = locations[0].to_3d()
+            locations = locations[::-1]
 
-        n = FULL_TURN / angle if angle != 0.0 else 0
-        q = (4 / 3) * math.tan(HALF_TURN / (2 * n))
-        base_offset = Vector((radius, q * radius))
-
-        create_bezier_curve(
-            segment_count,
-            bezier_points,
+        handles = bezier_arc_handles(
+            self.ct.co,
+            self.radius,
             locations,
-            center,
-            base_offset,
+            curve_angle / segment_count,
             invert=invert_direction,
         )
-
-        return endpoint
+        return locations, handles
 
     def draw_props(self, layout):
         sub = super().draw_props(layout)
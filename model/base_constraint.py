@@ -5,7 +5,7 @@ from bpy.props import StringProperty, BoolProperty
 from bpy.types import UILayout, Property, Context
 
 from ..global_data import WpReq
-from ..utilities import preferences
+from ..utilities import preferences, transaction
 from ..declarations import Operators
 from .constants import ENTITY_PROP_NAMES
 from .base_entity import SlvsGenericEntity
@@ -30,6 +30,10 @@ class GenericConstraint:
     signature = ()
     props = ()
 
+    def __setattr__(self, name, value):
+        transaction.record_write(self, name)
+        super().__setattr__(name, value)
+
     def needs_wp(args):
         return WpReq.OPTIONAL
 
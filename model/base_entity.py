@@ -6,11 +6,12 @@ from bpy.props import IntProperty, StringProperty, BoolProperty
 from bpy.types import Context
 
 from .. import global_data
-from ..utilities import preferences
+from ..utilities import preferences, transaction
 from ..shaders import Shaders
 from ..declarations import Operators
 from ..utilities.preferences import get_prefs
 from ..utilities.index import index_to_rgb, breakdown_index
+from ..utilities.draw_state import get_draw_state
 from ..utilities.view import update_cb
 from ..utilities.solver import update_system_cb
 
@@ -38,6 +39,10 @@ class SlvsGenericEntity:
     props = ()
     dirty: BoolProperty(name="Needs Update", default=True, options={"SKIP_SAVE"})
 
+    def __setattr__(self, name, value):
+        transaction.record_write(self, name)
+        super().__setattr__(name, value)
+
     @classmethod
     @property
     def type(cls) -> str:
@@ -212,7 +217,8 @@ class SlvsGenericEntity:
         return False
 
     def draw(self, context):
-        if not self.is_visible(context):
+        state = get_draw_state(context)
+        if not state.is_visible(self):
             return None
 
         batch = self._batch
@@ -225,7 +231,7 @@ class SlvsGenericEntity:
         gpu.state.blend_set("ALPHA")
         gpu.state.point_size_set(self.point_size)
 
-        col = self.color(context)
+        col = state.color(self)
         shader.uniform_float("color", col)
 
         if not self.is_point():
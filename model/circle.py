@@ -2,6 +2,8 @@ import logging
 import math
 from typing import List
 
+import numpy as np
+
 import bpy
 from bpy.types import PropertyGroup
 from bpy.props import FloatProperty
@@ -15,12 +17,11 @@ from ..utilities.math import range_2pi, pol2cart
 from .base_entity import SlvsGenericEntity
 from .base_entity import Entity2D
 from .utilities import slvs_entity_pointer, tag_update
-from .constants import CURVE_RESOLUTION
-from ..utilities.constants import HALF_TURN, FULL_TURN
-from ..utilities.draw import coords_arc_2d
+from ..utilities.constants import FULL_TURN
+from ..utilities.draw import coords_arc_lod, coords_to_3d, get_curve_lod
 from .utilities import (
     get_bezier_curve_midpoint_positions,
-    create_bezier_curve,
+    bezier_arc_handles,
 )
 
 logger = logging.getLogger(__name__)
@@ -68,13 +69,12 @@ class SlvsCircle(Entity2D, PropertyGroup):
         if bpy.app.background:
             return
 
-        coords = coords_arc_2d(0, 0, self.radius, CURVE_RESOLUTION)
+        coords = coords_arc_lod(self.radius, get_curve_lod(self))
 
         u, v = self.ct.co
 
         mat_local = Matrix.Translation(Vector((u, v, 0)))
-        mat = self.wp.matrix_basis @ mat_local
-        coords = [(mat @ Vector((*co, 0)))[:] for co in coords]
+        coords = coords_to_3d(self.wp.matrix_basis @ mat_local, coords)
 
         kwargs = {"pos": coords}
         self._batch = batch_for_shader(self._shader, "LINE_STRIP", kwargs)
@@ -123,40 +123,27 @@ class SlvsCircle(Entity2D, PropertyGroup):
     def bezier_point_count(self):
         return self.bezier_segment_count()
 
-    def to_bezier(
-        self,
-        spline,
-        startpoint,
-        endpoint,
-        invert_direction,
-        set_startpoint=False,
-        midpoints=[],
-    ):
-        # Get midpoint positions
-        segment_count = len(midpoints) + 1
-        radius, center = self.radius, self.ct.co
-
-        bezier_points = [startpoint, *midpoints]
-
-        locations = get_bezier_curve_midpoint_positions(
-            self, segment_count, bezier_points, FULL_TURN, cyclic=True
-        )
-        angle = FULL_TURN / segment_count
+    def bezier_coords(self, invert_direction, segment_count=None):
+        """Returns the locations of the bezier points, the first location is
+        repeated at the end to close the circle, and the handles of each bezier
+        segment
+        """
+        if segment_count is None:
+            segment_count = self.bezier_segment_count()
 
-        n = FULL_TURN / angle
-        q = (4 / 3) * math.tan(HALF_TURN / (2 * n))
-        base_offset = Vector((radius, q * radius))
+        positions = get_bezier_curve_midpoint_positions(
+            self, segment_count, range(segment_count), FULL_TURN, cyclic=True
+        )
+        locations = np.array([*positions, positions[0]], dtype=np.float64)
 
-        create_bezier_curve(
-            segment_count,
-            bezier_points,
+        handles = bezier_arc_handles(
+            self.ct.co,
+            self.radius,
             locations,
-            center,
-            base_offset,
+            FULL_TURN / segment_count,
             invert=invert_direction,
-            cyclic=True,
         )
-        return endpoint
+        return locations, handles
 
     def overlaps_endpoint(self, co):
         return False
@@ -1,11 +1,18 @@
 import logging
 from typing import Union
 
+import bpy
+import numpy as np
 from bpy.types import PropertyGroup
 from bpy.props import CollectionProperty
 from bpy.utils import register_classes_factory
 
+from ..utilities.bpy import foreach_set_tail
+from ..utilities import transaction
+from ..utilities.membership import invalidate_membership
+from ..utilities.solver import schedule_solve
 from .base_entity import SlvsGenericEntity
+from .group_entities import type_from_index
 from .sketch import SlvsSketch
 
 from .base_constraint import GenericConstraint
@@ -93,6 +100,10 @@ class SlvsConstraints(PropertyGroup):
     def get_list(self, type: str):
         return getattr(self, type.lower())
 
+    def get_dimensional_lists(self):
+        """Returns the collections of all dimensional constraint types"""
+        return [self.get_list(cls.type) for cls in self._dimensional_constraints]
+
     def get_from_type_index(self, type: str, index: int) -> GenericConstraint:
         """Get constraint by type and local index.
 
@@ -129,8 +140,10 @@ class SlvsConstraints(PropertyGroup):
         Arguments:
             constr: Constraint to be removed.
         """
+        transaction.invalidate("constraint removed")
         i = self.get_index(constr)
         self.get_list(constr.type).remove(i)
+        invalidate_membership()
 
     @property
     def dimensional(self):
@@ -150,6 +163,108 @@ class SlvsConstraints(PropertyGroup):
             for entity in entity_list:
                 yield entity
 
+    def add_many(
+        self,
+        type: str,
+        entities,
+        sketch: Union[SlvsSketch, int, None] = None,
+        values=None,
+    ) -> np.ndarray:
+        """Add many constraints of one type at once and request a single solve
+        of the affected sketch, use utilities.solver.defer_solves to combine
+        multiple calls into one solve.
+
+        Arguments:
+            type: Type of the constraints, e.g. "HORIZONTAL".
+            entities: Array of shape (N, k) with the indices of each constraint's
+                entities, k can be lower than the number of entities a constraint
+                supports.
+            sketch: The sketch the constraints belong to.
+            values: Values of dimensional constraints, one per constraint. They're
+                interpreted like the value of the add_* methods with init=True.
+
+        Dimensional constraints are initialized from their entities like the
+        add_* methods with init=True do.
+
+        Point to point coincident rows don't create constraints, their points are
+        merged like the coincident tool does, see utilities.point_merge.
+
+        Returns:
+            numpy.ndarray: Local indices of the created constraints.
+        """
+        cls = self.cls_from_type(type)
+        if cls is None:
+            raise ValueError("Unknown constraint type: {}".format(type))
+
+        entities = np.asarray(entities, dtype=np.int32)
+        if entities.ndim == 1:
+            entities = entities[:, np.newaxis]
+        count, entity_count = entities.shape
+        if not 0 < entity_count <= len(cls.signature):
+            raise TypeError(
+                "{} constraints take up to {} entities".format(
+                    cls.type, len(cls.signature)
+                )
+            )
+        if values is not None:
+            if "value" not in cls.props:
+                raise TypeError("{} constraints don't have a value".format(cls.type))
+            values = np.broadcast_to(np.asarray(values, dtype=np.float64), count)
+
+        context = bpy.context
+        sketch_index = sketch.slvs_index if hasattr(sketch, "slvs_index") else sketch
+        if sketch_index is not None:
+            sketch = context.scene.sketcher.entities.get(sketch_index)
+
+        if cls is SlvsCoincident and count and entity_count == 2:
+            from ..utilities.point_merge import merge_point_pairs
+
+            type_indices = np.unique(entities >> 20)
+            point_types = [
+                t for t in type_indices if type_from_index(int(t) << 20).is_point()
+            ]
+            is_pair = np.all(np.isin(entities >> 20, point_types), axis=1)
+            pairs = entities[is_pair]
+            entities = entities[~is_pair]
+            if values is not None:
+                values = values[~is_pair]
+            count = len(entities)
+
+            # Indices of the remaining rows are updated to the merged points
+            if len(pairs):
+                merge_point_pairs(context.scene, pairs, sketch_index, entities)
+                schedule_solve(context, sketch=sketch)
+
+        collection = self.get_list(cls.type)
+        start = len(collection)
+        for _ in range(count):
+            collection.add()
+
+        indices = np.arange(start, start + count)
+        if not count:
+            return indices
+
+        for i in range(entity_count):
+            foreach_set_tail(
+                collection, "entity{}_i".format(i + 1), entities[:, i], start
+            )
+
+        if sketch_index is not None:
+            foreach_set_tail(
+                collection, "sketch_i", np.full(count, sketch_index, np.int32), start
+            )
+            invalidate_membership()
+
+        if cls in self._dimensional_constraints:
+            for i, c in enumerate(collection[start:]):
+                if values is None:
+                    c.assign_init_props()
+                else:
+                    c.assign_init_props(value=float(values[i]))
+
+        schedule_solve(context, sketch=sketch)
+        return indices
+
     def add_coincident(
         self,
         entity1: SlvsGenericEntity,
@@ -176,6 +291,7 @@ class SlvsConstraints(PropertyGroup):
         c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_equal(
@@ -199,6 +315,7 @@ class SlvsConstraints(PropertyGroup):
         c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch is not None:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_distance(
@@ -231,6 +348,7 @@ class SlvsConstraints(PropertyGroup):
             c.assign_init_props(**settings)
         else:
             c.assign_settings(**settings)
+        invalidate_membership()
         return c
 
     def add_angle(
@@ -261,6 +379,7 @@ class SlvsConstraints(PropertyGroup):
             c.assign_init_props(**settings)
         else:
             c.assign_settings(**settings)
+        invalidate_membership()
         return c
 
     def add_diameter(
@@ -288,6 +407,7 @@ class SlvsConstraints(PropertyGroup):
             c.assign_init_props(**settings)
         else:
             c.assign_settings(**settings)
+        invalidate_membership()
         return c
 
     def add_parallel(
@@ -311,6 +431,7 @@ class SlvsConstraints(PropertyGroup):
         c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch is not None:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_horizontal(
@@ -334,6 +455,7 @@ class SlvsConstraints(PropertyGroup):
             c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch is not None:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_vertical(
@@ -357,6 +479,7 @@ class SlvsConstraints(PropertyGroup):
             c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch is not None:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_tangent(
@@ -380,6 +503,7 @@ class SlvsConstraints(PropertyGroup):
         c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch is not None:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_midpoint(
@@ -403,6 +527,7 @@ class SlvsConstraints(PropertyGroup):
         c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch is not None:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_perpendicular(
@@ -426,6 +551,7 @@ class SlvsConstraints(PropertyGroup):
         c["entity2_i"] = entity2 if isinstance(entity2, int) else entity2.slvs_index
         if sketch is not None:
             c["sketch_i"] = sketch if isinstance(sketch, int) else sketch.slvs_index
+        invalidate_membership()
         return c
 
     def add_ratio(
@@ -456,6 +582,7 @@ class SlvsConstraints(PropertyGroup):
             c.assign_init_props(**settings)
         else:
             c.assign_settings(**settings)
+        invalidate_membership()
         return c
 
 
@@ -3,14 +3,18 @@ import math
 from typing import Type, Union, Tuple
 
 import bpy
+import numpy as np
 from bpy.types import PropertyGroup
 from bpy.props import CollectionProperty
 from bpy.utils import register_classes_factory
 from mathutils import Vector, Euler, Quaternion
 
 from .. import global_data
+from ..utilities.bpy import foreach_set_tail
 from ..utilities.constants import QUARTER_TURN
+from ..utilities import transaction
 from ..utilities.index import breakdown_index, assemble_index
+from ..utilities.membership import invalidate_membership
 
 from .base_entity import SlvsGenericEntity
 from .utilities import slvs_entity_pointer, update_pointers
@@ -147,6 +151,10 @@ class SlvsEntities(PropertyGroup):
         if self.get(index).origin:
             return
 
+        transaction.invalidate("entity removed")
+        scene = bpy.context.scene
+        scene.sketcher.remap_stale_data({}, removed=(index,))
+
         entity_list, i = self._get_list_and_index(index)
         entity_list.remove(i)
 
@@ -162,8 +170,9 @@ class SlvsEntities(PropertyGroup):
             entity_list.move(last_index, i)
 
         new_item = entity_list[i]
-        update_pointers(bpy.context.scene, new_item.slvs_index, index)
+        index_old = new_item.slvs_index
         new_item.slvs_index = index
+        update_pointers(scene, index_old, index)
 
     def _init_entity(self, entity, fixed, construction, index_reference, visible=True):
         """Initializes all shared entity properties"""
@@ -173,6 +182,7 @@ class SlvsEntities(PropertyGroup):
         entity["visible"] = visible
 
         index = self._set_index(entity)
+        invalidate_membership()
 
         if index_reference:
             return index
@@ -422,6 +432,134 @@ class SlvsEntities(PropertyGroup):
 
         return self._init_entity(c, fixed, construction, index_reference)
 
+    def _add_many(
+        self, entity_type, count: int, fixed, construction, **props
+    ) -> np.ndarray:
+        """Add entities of one type at once, props map property names to arrays
+        with one row per entity. Returns the indices of the created entities.
+        """
+        type_index = _entity_types.index(entity_type)
+        collection = getattr(self, _entity_collections[type_index])
+        start = len(collection)
+
+        if start + count > 1 << 20:
+            raise ValueError(
+                "Cannot add {} entities of type {}, only {} indices are left".format(
+                    count, entity_type.__name__, (1 << 20) - start
+                )
+            )
+
+        for _ in range(count):
+            collection.add()
+        if not count:
+            return np.empty(0, dtype=np.int32)
+
+        indices = assemble_index(
+            type_index, np.arange(start, start + count, dtype=np.int32)
+        )
+        props["slvs_index"] = indices
+        props["fixed"] = np.broadcast_to(np.asarray(fixed, dtype=bool), count)
+        props["construction"] = np.broadcast_to(
+            np.asarray(construction, dtype=bool), count
+        )
+
+        for name, values in props.items():
+            foreach_set_tail(collection, name, values, start)
+        invalidate_membership()
+        return indices
+
+    @staticmethod
+    def _index_array(elements, count: int) -> np.ndarray:
+        if hasattr(elements, "slvs_index"):
+            elements = elements.slvs_index
+        return np.broadcast_to(np.asarray(elements, dtype=np.int32), count)
+
+    def add_points_3d(self, coords, fixed=False, construction=False) -> np.ndarray:
+        """Add many points in 3d space at once.
+
+        Arguments:
+            coords: Array of shape (N, 3) with the locations of the points.
+            fixed: Either a single value or one value per point.
+            construction: Either a single value or one value per point.
+
+        Returns:
+            numpy.ndarray: Indices of the created points.
+        """
+        coords = np.asarray(coords, dtype=np.float32).reshape(-1, 3)
+        return self._add_many(
+            SlvsPoint3D, len(coords), fixed, construction, location=coords
+        )
+
+    def add_lines_3d(self, points, fixed=False, construction=False) -> np.ndarray:
+        """Add many lines in 3d space at once.
+
+        Arguments:
+            points: Array of shape (N, 2) with the indices of the lines' start-
+                and endpoints.
+
+        Returns:
+            numpy.ndarray: Indices of the created lines.
+        """
+        points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        return self._add_many(
+            SlvsLine3D,
+            len(points),
+            fixed,
+            construction,
+            p1_i=points[:, 0],
+            p2_i=points[:, 1],
+        )
+
+    def add_points_2d(
+        self, coords, sketch: SlvsSketch, fixed=False, construction=False
+    ) -> np.ndarray:
+        """Add many points in 2d space at once.
+
+        Arguments:
+            coords: Array of shape (N, 2) with the coordinates on the workplane.
+            sketch: The sketch the points belong to.
+            fixed: Either a single value or one value per point.
+            construction: Either a single value or one value per point.
+
+        Returns:
+            numpy.ndarray: Indices of the created points.
+        """
+        coords = np.asarray(coords, dtype=np.float32).reshape(-1, 2)
+        count = len(coords)
+        return self._add_many(
+            SlvsPoint2D,
+            count,
+            fixed,
+            construction,
+            co=coords,
+            sketch_i=self._index_array(sketch, count),
+        )
+
+    def add_lines_2d(
+        self, points, sketch: SlvsSketch, fixed=False, construction=False
+    ) -> np.ndarray:
+        """Add many lines in 2d space at once.
+
+        Arguments:
+            points: Array of shape (N, 2) with the indices of the lines' start-
+                and endpoints, e.g. as returned by add_points_2d.
+            sketch: The sketch the lines belong to.
+
+        Returns:
+            numpy.ndarray: Indices of the created lines.
+        """
+        points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        count = len(points)
+        return self._add_many(
+            SlvsLine2D,
+            count,
+            fixed,
+            construction,
+            p1_i=points[:, 0],
+            p2_i=points[:, 1],
+            sketch_i=self._index_array(sketch, count),
+        )
+
     @property
     def all(self):
         for coll_name in _entity_collections:
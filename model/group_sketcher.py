@@ -1,5 +1,5 @@
 import logging
-from typing import Union, Generator
+from typing import Dict, Generator, Iterable, Union
 
 import bpy
 from bpy.types import PropertyGroup, Context
@@ -8,10 +8,11 @@ from bpy.props import IntProperty, BoolProperty, PointerProperty, IntVectorPrope
 
 from .. import global_data
 from ..solver import solve_system
-from .utilities import slvs_entity_pointer
+from .utilities import slvs_entity_pointer, find_dependents
 from .base_entity import SlvsGenericEntity
 from .group_entities import SlvsEntities
 from .group_constraints import SlvsConstraints
+from ..utilities.membership import invalidate_membership
 from ..utilities.view import update_cb
 
 logger = logging.getLogger(__name__)
@@ -57,12 +58,56 @@ class SketcherProps(PropertyGroup):
         return solve_system(context)
 
     def purge_stale_data(self):
+        invalidate_membership()
         global_data.hover = -1
         global_data.selected.clear()
         global_data.batches.clear()
+        global_data.curve_lods.clear()
+        global_data.curve_lod_view = None
+        global_data.bounds.clear()
+        global_data.sketch_bounds.clear()
         for e in self.entities.all:
             e.dirty = True
 
+    def remap_stale_data(self, mapping: Dict[int, int], removed: Iterable[int] = ()):
+        """Update runtime data after entity indices changed, unlike purge_stale_data
+        this keeps the selection and only invalidates the affected entities
+
+        Arguments:
+            mapping: New index for each old index that changed.
+            removed: Indices of removed entities.
+        """
+        invalidate_membership()
+        removed = set(removed)
+
+        def _remap(index):
+            if index in removed:
+                return -1
+            return mapping.get(index, index)
+
+        global_data.hover = _remap(global_data.hover)
+
+        selected = []
+        for index in map(_remap, global_data.selected):
+            if index != -1 and index not in selected:
+                selected.append(index)
+        global_data.selected[:] = selected
+
+        targets = set(mapping.values())
+        for index in removed.union(mapping.keys(), targets):
+            global_data.batches.pop(index, None)
+            global_data.curve_lods.pop(index, None)
+            global_data.bounds.pop(index, None)
+            global_data.sketch_bounds.pop(index, None)
+
+        # Entities that now live at or point to a changed index need new batches
+        for index in targets:
+            entity = self.entities.get(index)
+            if entity:
+                entity.dirty = True
+        for entity in find_dependents(self.id_data, removed | targets):
+            entity.dirty = True
+
 
 slvs_entity_pointer(SketcherProps, "active_sketch", update=update_cb)
 
@@ -3,6 +3,7 @@ import math
 from typing import List, Tuple
 
 import bpy
+import numpy as np
 from bpy.types import PropertyGroup, Context
 from gpu_extras.batch import batch_for_shader
 from bpy.utils import register_classes_factory
@@ -125,21 +126,15 @@ class SlvsLine2D(Entity2D, PropertyGroup):
         )
         return dir1.angle_signed(dir2)
 
-    def to_bezier(
-        self, spline, startpoint, endpoint, invert_direction, set_startpoint=False
-    ):
-        locations = [self.p1.co.to_3d(), self.p2.co.to_3d()]
+    def bezier_coords(self, invert_direction):
+        """Returns the locations of the bezier points in the direction of the
+        path and the handles of the bezier segment
+        """
+        locations = np.array((self.p1.co, self.p2.co), dtype=np.float64)
         if invert_direction:
-            locations.reverse()
-
-        if set_startpoint:
-            startpoint.co = locations[0]
-        endpoint.co = locations[1]
-
-        startpoint.handle_right = locations[0]
-        endpoint.handle_left = locations[1]
-
-        return endpoint
+            locations = locations[::-1]
+        # Handles lie on the points themselves
+        return locations, locations[np.newaxis]
 
     def midpoint(self):
         return (self.p1.co + self.p2.co) / 2
@@ -11,6 +11,7 @@ from ..solver import Solver, solve_system
 from .base_entity import SlvsGenericEntity
 from .utilities import slvs_entity_pointer
 from ..utilities.bpy import bpyEnum
+from ..utilities.membership import get_membership
 
 logger = logging.getLogger(__name__)
 
@@ -65,12 +66,16 @@ class SlvsSketch(SlvsGenericEntity, PropertyGroup):
         ]
 
     def sketch_entities(self, context):
-        for e in context.scene.sketcher.entities.all:
-            if not hasattr(e, "sketch"):
-                continue
-            if e.sketch != self:
-                continue
-            yield e
+        entities = context.scene.sketcher.entities
+        membership = get_membership(context.scene)
+        for index in membership.entities.get(self.slvs_index, ()):
+            yield entities.get(index)
+
+    def sketch_constraints(self, context):
+        constraints = context.scene.sketcher.constraints
+        membership = get_membership(context.scene)
+        for type, index in membership.constraints.get(self.slvs_index, ()):
+            yield constraints.get_from_type_index(type, index)
 
     def update(self):
         self.is_dirty = False
@@ -101,6 +106,12 @@ class SlvsSketch(SlvsGenericEntity, PropertyGroup):
     def solve(self, context):
         return solve_system(context, sketch=self)
 
+    def evaluate(self, context, **kwargs):
+        """Returns the sketch's paths as arrays, see converters.evaluate_sketch"""
+        from ..converters import evaluate_sketch
+
+        return evaluate_sketch(context, self, **kwargs)
+
     @classmethod
     def is_sketch(cls):
         return True
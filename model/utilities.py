@@ -1,10 +1,15 @@
 import logging
+from typing import Dict
 
 import bpy
 from bpy.props import IntProperty
 from bpy.types import Context
 import math
-from mathutils import Vector, Matrix
+import numpy as np
+from mathutils import Vector
+
+from ..utilities import transaction
+from ..utilities.membership import invalidate_membership
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +32,8 @@ def slvs_entity_pointer(cls, name, **kwargs):
     def setter(self, entity):
         index = entity.slvs_index if entity else -1
         setattr(self, index_prop, index)
+        if index_prop == "sketch_i":
+            invalidate_membership()
 
     setattr(cls, name, setter)
 
@@ -68,38 +75,27 @@ def get_bezier_curve_midpoint_positions(
     return positions
 
 
-def create_bezier_curve(
-    segment_count,
-    bezier_points,
-    locations,
-    center,
-    base_offset,
-    invert=False,
-    cyclic=False,
-):
-    if cyclic:
-        bezier_points.append(bezier_points[0])
-        locations.append(locations[0])
-
-    for index in range(segment_count):
-        loc1, loc2 = locations[index], locations[index + 1]
-        b1, b2 = bezier_points[index], bezier_points[index + 1]
-
-        coords = []
-        for i, loc in enumerate((loc1, loc2)):
-            pos = loc - center
-            angle = math.atan2(pos[1], pos[0])
-            offset = base_offset.copy()
+def bezier_arc_handles(center, radius, locations, segment_angle, invert=False):
+    """Returns the handles of the bezier segments between consecutive locations
+    on a circle as an array of shape (segment_count, 2, 2) that holds the right
+    handle of each segment's start- and the left handle of its endpoint
+    """
+    locations = np.asarray(locations, dtype=np.float64)
+    center = np.asarray(center, dtype=np.float64)
 
-            if i == 0 and invert or i == 1 and not invert:
-                offset[1] *= -1
+    pos = locations - center
+    angles = np.arctan2(pos[:, 1], pos[:, 0])
+    cos, sin = np.cos(angles), np.sin(angles)
 
-            offset.rotate(Matrix.Rotation(angle, 2))
-            coords.append((center + offset).to_3d())
+    q = (4 / 3) * math.tan(segment_angle / 4)
+    radial = radius * np.column_stack((cos, sin))
+    tangent = q * radius * np.column_stack((-sin, cos))
+    if invert:
+        tangent *= -1
 
-        b1.handle_right = coords[0]
-        b2.handle_left = coords[1]
-        b2.co = loc2.to_3d()
+    right = center + radial[:-1] + tangent[:-1]
+    left = center + radial[1:] - tangent[1:]
+    return np.stack((right, left), axis=1)
 
 
 # NOTE: When tweaking, it's necessary to constrain a point that is only temporary available
@@ -157,4 +153,122 @@ def update_pointers(scene, index_old, index_new):
             continue
         o.update_pointers(index_old, index_new)
 
-    scene.sketcher.purge_stale_data()
+    scene.sketcher.remap_stale_data({index_old: index_new})
+
+
+def _pointer_props(cls):
+    return [
+        prop.identifier
+        for prop in cls.bl_rna.properties
+        if prop.type == "INT" and prop.identifier.endswith("_i")
+    ]
+
+
+def iter_pointer_collections(scene):
+    """Yields all entity and constraint collections together with the names of
+    their pointer properties
+    """
+    from .group_entities import _entity_types, _entity_collections
+    from .group_constraints import SlvsConstraints
+
+    sketcher = scene.sketcher
+    for cls, name in zip(_entity_types, _entity_collections):
+        yield getattr(sketcher.entities, name), _pointer_props(cls)
+    for cls in SlvsConstraints._constraints:
+        yield sketcher.constraints.get_list(cls.type), _pointer_props(cls)
+
+
+def find_dependents(scene, indices):
+    """Returns all entities that reference any of the given entity indices"""
+    from .group_entities import _entity_types, _entity_collections
+
+    indices = np.fromiter(indices, dtype=np.int32)
+    dependents = []
+    if not len(indices):
+        return dependents
+
+    entities = scene.sketcher.entities
+    for cls, name in zip(_entity_types, _entity_collections):
+        collection = getattr(entities, name)
+        props = _pointer_props(cls)
+        if not props or not len(collection):
+            continue
+
+        data = np.empty(len(collection), dtype=np.int32)
+        mask = np.zeros(len(collection), dtype=bool)
+        for prop in props:
+            collection.foreach_get(prop, data)
+            mask |= np.isin(data, indices)
+        dependents.extend(collection[int(i)] for i in np.flatnonzero(mask))
+    return dependents
+
+
+def _remap_all(scene, remap):
+    """Apply remap to the values of all pointers in a scene, remap takes an int32
+    array, changes it in place and returns a mask of the changed values
+    """
+    transaction.invalidate("pointers remapped")
+    for collection, props in iter_pointer_collections(scene):
+        if not len(collection):
+            continue
+
+        data = np.empty(len(collection), dtype=np.int32)
+        for prop in props:
+            collection.foreach_get(prop, data)
+            if remap(data).any():
+                collection.foreach_set(prop, data)
+
+    # Pointers that are stored directly on the property groups
+    sketcher = scene.sketcher
+    for group in (sketcher, sketcher.entities):
+        for prop in _pointer_props(type(group)):
+            data = np.array([getattr(group, prop)], dtype=np.int32)
+            if remap(data).any():
+                # Avoid update callbacks
+                group[prop] = int(data[0])
+
+
+def remap_pointers(scene, type_index: int, mapping):
+    """Replaces all references to entities of one type at once
+
+    Arguments:
+        type_index: Type index of the entities that are remapped.
+        mapping: The new global index for each old local index of that type.
+    """
+    mapping = np.asarray(mapping, dtype=np.int32)
+
+    def remap(data):
+        # Unset pointers are -1 and never match
+        affected = (data >> 20) == type_index
+        data[affected] = mapping[data[affected] & 0xFFFFF]
+        return affected
+
+    _remap_all(scene, remap)
+
+
+def remap_indices(scene, mapping: Dict[int, int]):
+    """Replaces all references to entities according to a mapping of old to new
+    indices in a single pass, unlike update_pointers the mapping may contain
+    chains or swaps of indices
+    """
+    if not mapping:
+        return
+
+    keys = np.fromiter(mapping.keys(), dtype=np.int32, count=len(mapping))
+    values = np.fromiter(mapping.values(), dtype=np.int32, count=len(mapping))
+    order = np.argsort(keys)
+    keys, values = keys[order], values[order]
+
+    def remap(data):
+        pos = np.minimum(np.searchsorted(keys, data), len(keys) - 1)
+        affected = keys[pos] == data
+        data[affected] = values[pos[affected]]
+        return affected
+
+    _remap_all(scene, remap)
+
+    # Converted objects store the index of their sketch
+    for sketch in scene.sketcher.entities.sketches:
+        for ob in (sketch.target_object, sketch.target_curve_object):
+            if ob and ob.sketch_index in mapping:
+                ob.sketch_index = mapping[ob.sketch_index]
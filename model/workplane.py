@@ -11,6 +11,7 @@ from bpy.utils import register_classes_factory
 from ..declarations import Operators
 from .. import global_data
 from ..utilities.draw import draw_rect_2d
+from ..utilities.draw_state import get_draw_state
 from ..shaders import Shaders
 from ..utilities import preferences
 from ..solver import Solver
@@ -57,7 +58,8 @@ class SlvsWorkplane(SlvsGenericEntity, PropertyGroup):
 
     # NOTE: probably better to avoid overwriting draw func..
     def draw(self, context):
-        if not self.is_visible(context):
+        state = get_draw_state(context)
+        if not state.is_visible(self):
             return
 
         with gpu.matrix.push_pop():
@@ -65,7 +67,7 @@ class SlvsWorkplane(SlvsGenericEntity, PropertyGroup):
             gpu.matrix.multiply_matrix(self.matrix_basis)
             gpu.matrix.scale(Vector((scale, scale, scale)))
 
-            col = self.color(context)
+            col = state.color(self)
             # Let parent draw outline
             super().draw(context)
 
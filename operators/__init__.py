@@ -6,6 +6,7 @@ modules = [
     "select_box",
     "context_menu",
     "solver_state",
+    "solver_stats",
     "solve",
     "update",
     "tweak",
@@ -39,6 +40,7 @@ modules = [
     "modifiers",
     "move",
     "duplicate",
+    "merge_points",
 ]
 
 
@@ -22,6 +22,8 @@ class View3D_OT_slvs_add_sketch(Operator, Operator3d):
     bl_idname = Operators.AddSketch
     bl_label = "Add Sketch"
     bl_options = {"UNDO"}
+    # Activating the sketch changes the view and objects
+    use_transaction = False
 
     sketch_state1_doc = ["Workplane", "Pick a workplane as base for the sketch."]
 
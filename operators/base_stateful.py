@@ -6,6 +6,7 @@ from bpy.props import FloatVectorProperty
 
 from .. import global_data
 from ..stateful_operator.integration import StatefulOperator
+from ..utilities import transaction
 from ..model.types import SlvsGenericEntity, SlvsPoint3D, SlvsPoint2D, SlvsNormal3D
 from .utilities import get_hovered
 
@@ -13,6 +14,15 @@ from .utilities import get_hovered
 class GenericEntityOp(StatefulOperator):
     """Extend StatefulOperator with extension specific types"""
 
+    # Revert previews with a transaction on the sketcher data, operators that
+    # change data outside of scene.sketcher have to disable this
+    use_transaction = True
+
+    def begin_transaction(self, context: Context):
+        if not self.use_transaction:
+            return None
+        return transaction.begin(context.scene)
+
     def check_event(self, event):
         return super().check_event(event)
 
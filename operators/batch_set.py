@@ -4,6 +4,7 @@ from bpy.utils import register_class, unregister_class
 
 from ..declarations import Operators
 from ..utilities.view import refresh
+from ..utilities.solver import defer_solves
 
 
 class View3D_OT_slvs_batch_set(Operator):
@@ -23,8 +24,11 @@ class View3D_OT_slvs_batch_set(Operator):
 
     def execute(self, context):
         data_path = context.path_resolve(self.data_path)
-        for entity in getattr(data_path, self.sequence):
-            setattr(entity, self.property, self.value)
+
+        # Run a single solve for all items
+        with defer_solves(context):
+            for entity in getattr(data_path, self.sequence):
+                setattr(entity, self.property, self.value)
         refresh(context)
         return {"FINISHED"}
 
@@ -7,13 +7,11 @@ from bpy.types import Operator, Context
 
 from .. import global_data
 from ..declarations import Operators
-from ..serialize import paste
 from ..utilities.select import deselect_all
 from ..utilities.data_handling import (
     get_collective_dependencies,
     get_scoped_constraints,
 )
-from ..serialize import iter_elements_dict
 
 
 def _filter_elements_dict(
@@ -95,6 +93,8 @@ class View3D_OT_slvs_paste(Operator):
             self.report({"INFO"}, "Pasting is not supported in 3d space")
             return {"CANCELLED"}
 
+        from ..serialize import paste, iter_elements_dict
+
         buffer = deepcopy(global_data.COPY_BUFFER)
 
         # Replace sketch indices with active sketch
@@ -0,0 +1,47 @@
+from bpy.types import Operator, Context
+from bpy.props import FloatProperty
+from bpy.utils import register_classes_factory
+
+from ..declarations import Operators
+from ..solver import solve_system
+from ..utilities.point_merge import MERGE_TOLERANCE, merge_points
+from ..utilities.view import refresh
+
+
+class View3D_OT_slvs_merge_points(Operator):
+    """Merge points of the active sketch that lie at the same location"""
+
+    bl_idname = Operators.MergePoints
+    bl_label = "Merge Points"
+    bl_options = {"UNDO", "REGISTER"}
+
+    tolerance: FloatProperty(
+        name="Tolerance",
+        description="Maximum distance between points that get merged",
+        subtype="DISTANCE",
+        unit="LENGTH",
+        default=MERGE_TOLERANCE,
+        min=0.0,
+        precision=6,
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.scene.sketcher.active_sketch_i != -1
+
+    def execute(self, context: Context):
+        sketch = context.scene.sketcher.active_sketch
+        result = merge_points(context.scene, sketch, self.tolerance)
+
+        msg = "Merged {} points".format(result.points)
+        if result.constraints:
+            msg += ", removed {} constraints".format(result.constraints)
+        self.report({"INFO"}, msg)
+
+        if result.points:
+            solve_system(context, sketch=sketch)
+        refresh(context)
+        return {"FINISHED"}
+
+
+register, unregister = register_classes_factory((View3D_OT_slvs_merge_points,))
@@ -56,6 +56,8 @@ class NodeOperator(Operator3d):
     bl_options = {"UNDO", "REGISTER"}
 
     resources = ()
+    # Modifiers are added to objects which isn't covered by transactions
+    use_transaction = False
 
     @classmethod
     def poll(cls, context):
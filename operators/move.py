@@ -8,6 +8,7 @@ from ..stateful_operator.state import state_from_args
 from ..stateful_operator.utilities.register import register_stateops_factory
 from ..utilities.data_handling import get_flat_deps
 from ..solver import solve_system
+from ..utilities import transaction
 from ..utilities.view import get_pos_2d
 
 
@@ -88,6 +89,8 @@ class View3D_OT_slvs_move(Operator, Operator2d):
             if point.fixed:
                 continue
 
+            # The vector is changed in place before the property is assigned
+            transaction.record_write(point, "co")
             point.co += self.offset
 
         return {"FINISHED"}
@@ -0,0 +1,43 @@
+from bpy.types import Operator, Context
+from bpy.props import StringProperty
+from bpy.utils import register_classes_factory
+from bpy_extras.io_utils import ExportHelper
+
+from ..declarations import Operators
+from ..utilities import solver_stats
+
+
+class View3D_OT_slvs_export_solver_stats(Operator, ExportHelper):
+    """Export the recorded solver statistics to a json file"""
+
+    bl_idname = Operators.ExportSolverStats
+    bl_label = "Export Solver Statistics"
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
+
+    def execute(self, context: Context):
+        solver_stats.export(self.filepath)
+        self.report(
+            {"INFO"},
+            "Exported {} solver runs to: {}".format(
+                len(solver_stats.history), self.filepath
+            ),
+        )
+        return {"FINISHED"}
+
+
+class View3D_OT_slvs_clear_solver_stats(Operator):
+    """Clear the recorded solver statistics"""
+
+    bl_idname = Operators.ClearSolverStats
+    bl_label = "Clear Solver Statistics"
+
+    def execute(self, context: Context):
+        solver_stats.clear()
+        return {"FINISHED"}
+
+
+register, unregister = register_classes_factory(
+    (View3D_OT_slvs_export_solver_stats, View3D_OT_slvs_clear_solver_stats)
+)
@@ -6,7 +6,6 @@ from ..model.categories import SEGMENT
 from ..declarations import Operators
 from ..stateful_operator.utilities.register import register_stateops_factory
 from ..stateful_operator.state import state_from_args
-from ..utilities.trimming import TrimSegment
 from .base_2d import Operator2d
 from ..utilities.view import refresh, get_pos_2d
 
@@ -55,6 +54,8 @@ class View3D_OT_slvs_trim(Operator, Operator2d):
         if mouse_pos is None:
             return False
 
+        from ..utilities.trimming import TrimSegment
+
         trim = TrimSegment(segment, mouse_pos)
 
         # Find intersections
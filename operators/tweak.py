@@ -5,6 +5,8 @@ from mathutils.geometry import intersect_line_plane
 from .. import global_data
 from ..declarations import Operators
 from ..solver import Solver
+from ..utilities.async_solver import AsyncTweak
+from ..utilities.preferences import use_experimental
 from ..utilities.view import get_picking_origin_dir
 
 
@@ -47,14 +49,39 @@ class View3D_OT_slvs_tweak(Operator):
         # find the depth
         self.depth = (pos - origin).length
 
+        self.async_tweak = None
+        self.timer = None
+        if use_experimental("use_async_tweak", False):
+            sketch = context.scene.sketcher.active_sketch
+            self.async_tweak = AsyncTweak(context, entity, sketch)
+            wm = context.window_manager
+            self.timer = wm.event_timer_add(1 / 60, window=context.window)
+
         context.window_manager.modal_handler_add(self)
         return {"RUNNING_MODAL"}
 
+    def _finish(self, context: Context):
+        if self.timer:
+            context.window_manager.event_timer_remove(self.timer)
+            self.timer = None
+
+        if self.async_tweak:
+            # Make sure the undo step holds the result of the final position
+            self.async_tweak.finish()
+            self.async_tweak = None
+
     def modal(self, context: Context, event: Event):
         if event.type == "LEFTMOUSE" and event.value == "RELEASE":
+            self._finish(context)
             context.window.cursor_modal_restore()
+            context.area.tag_redraw()
             return {"FINISHED"}
 
+        if event.type == "TIMER":
+            if self.async_tweak and self.async_tweak.update():
+                context.area.tag_redraw()
+            return {"RUNNING_MODAL"}
+
         context.window.cursor_modal_set("HAND")
 
         if event.type == "MOUSEMOVE":
@@ -71,6 +98,10 @@ class View3D_OT_slvs_tweak(Operator):
             else:
                 pos = dir * self.depth + origin
 
+            if self.async_tweak:
+                self.async_tweak.request(pos)
+                return {"RUNNING_MODAL"}
+
             sketch = context.scene.sketcher.active_sketch
             solver = Solver(context, sketch)
             solver.tweak(entity, pos)
@@ -3,7 +3,6 @@ from bpy.utils import register_classes_factory
 
 from ..declarations import Operators
 from ..solver import Solver
-from ..converters import update_convertor_geometry
 
 
 class View3D_OT_update(Operator):
@@ -13,6 +12,8 @@ class View3D_OT_update(Operator):
     bl_label = "Force Update"
 
     def execute(self, context: Context):
+        from ..converters import update_convertor_geometry
+
         solver = Solver(context, None, all=True)
         solver.solve()
 
@@ -5,7 +5,6 @@ from bpy.types import Context, Operator
 
 from .. import global_data
 from ..declarations import GizmoGroups, WorkSpaceTools
-from ..converters import update_convertor_geometry
 from ..utilities.preferences import get_prefs
 from ..utilities.data_handling import entities_3d
 
@@ -145,6 +144,8 @@ def activate_sketch(context: Context, index: int, operator: Operator):
     if context.mode != "OBJECT":
         return {"FINISHED"}
 
+    from ..converters import update_convertor_geometry
+
     update_convertor_geometry(context.scene, sketch=last_sketch)
 
     select_target_ob(context, last_sketch)
@@ -0,0 +1 @@
+blender --background --factory-startup --addons CAD_Sketcher --python ./testing/benchmarks/__init__.py -- %*
@@ -6,6 +6,7 @@ from typing import Dict
 from bpy.types import Scene
 
 from .utilities.index import breakdown_index, assemble_index
+from .utilities.membership import invalidate_membership
 
 
 def dict_extend(original_dict, other):
@@ -49,6 +50,7 @@ def scene_from_dict(scene: Scene, elements: Dict):
     original = scene["sketcher"].to_dict()
     original.update(elements)
     apply_dict(scene["sketcher"], original)
+    invalidate_membership()
 
 
 def _extend_element_dict(scene, elements):
@@ -1,6 +1,8 @@
 import logging
 from .utilities.bpy import bpyEnum
 from .global_data import solver_state_items
+from .utilities import solver_stats, solver_pool, solver_components, solve_cache
+from .utilities import transaction
 
 # TODO: Move to utilities.data_handling
 from .model.utilities import make_coincident
@@ -26,6 +28,9 @@ class Solver:
         self.report = False
         self.all = all
         self.failed_sketches = []
+        self.decompose = self._get_pref("decompose_sketches", False)
+        self.use_cache = self._get_pref("use_solve_cache", False)
+        self._system_data = None
 
         group = self._get_group(sketch) if sketch else self.group_3d
         logger.info(
@@ -41,6 +46,9 @@ class Solver:
         self.ok = True
         self.result = None
 
+        # Only collect statistics when enabled, see utilities.solver_stats
+        self.stats = solver_stats.new_record(sketch, all)
+
     def get_workplane(self):
         if self.sketch:
             return self.sketch.wp.py_data
@@ -117,7 +125,8 @@ class Solver:
             else:
                 group = self.group_3d
 
-            if self.report:
+            if self.report and c.failed:
+                transaction.record(c)
                 c.failed = False
 
             # Store a index-constraint mapping
@@ -192,68 +201,246 @@ class Solver:
         # TODO: skip entities that aren't in active group
         return True
 
-    def solve(self, report=True):
-        self.report = report
-        self._init_slvs_data()
+    @staticmethod
+    def _get_pref(name, fallback):
+        from .utilities.preferences import get_prefs
+
+        try:
+            return getattr(get_prefs(), name)
+        except KeyError:
+            # Addon preferences aren't available
+            return fallback
+
+    def _get_parallel_workers(self):
+        """Returns the number of worker processes if independent sketches
+        should be solved in parallel, None otherwise
+        """
+        if not self.all or self.tweak_entity:
+            return None
+        if not self._get_pref("use_parallel_solving", False):
+            return None
+        return self._get_pref("solver_processes", 0)
+
+    def _get_static_groups(self, group):
+        """Returns the groups that a group depends on but doesn't modify"""
+        if group == self.group_3d:
+            return (self.group_fixed,)
+        return (self.group_fixed, self.group_3d)
+
+    def _get_system_data(self):
+        if self._system_data is None:
+            self._system_data = solver_pool.export_system(self.solvesys)
+        return self._system_data
+
+    def _handle_result(
+        self, sketch, retval, dof, fails, group_stats=None, partial=False
+    ):
+        """Report the result of a solved group, with partial the failures are
+        limited to components whose results haven't been applied
+        """
+        report = self.report
+
+        if retval > 5:
+            logger.debug("Solver returned undocumented value: {}".format(retval))
+
+        self.result = bpyEnum(solver_state_items, index=retval)
+
+        if report and sketch:
+            transaction.record(sketch)
+            sketch.solver_state = self.result.identifier
+            sketch.dof = dof
+
+        if retval != 0 and retval != 5:
+            self.ok = False
+
+            # Store sketch failures
+            if not partial:
+                self.failed_sketches.append(sketch)
 
-        if self.all:
-            sse = self.context.scene.sketcher.entities
-            sketches = [None, *sse.sketches]
-        else:
-            sketches = [
-                self.sketch,
-            ]
+        logger.info(self.result.description)
 
-        for sketch in sketches:
-            g = self._get_group(sketch)
+        if group_stats is not None:
+            group_stats["result"] = self.result.identifier
+            group_stats["dof"] = dof
+            group_stats["failed"] = len(fails)
+
+        if report and fails:
+
+            for i in fails:
+                if i == self.tweak_constraint:
+                    continue
+                constr = self.constraints[i]
+                transaction.record(constr)
+                constr.failed = True
+
+            def _get_msg_failed():
+                msg = "Failed constraints:"
+                for i in fails:
+                    constr = self.constraints[i]
+                    msg += "\n  - {}".format(constr)
+                return msg
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_get_msg_failed())
+
+    def _get_cache_key(self, group):
+        """Returns the key of a group in the solve cache or None if results
+        shouldn't be cached
+        """
+        if not self.use_cache or self.tweak_entity:
+            return None
+
+        data = solver_pool.split_system(
+            self._get_system_data(), group, self._get_static_groups(group)
+        )
+        return solve_cache.group_key(data, group)
+
+    def _solve_from_cache(self, sketch, group, key):
+        """Apply the cached result of a group, returns False on a cache miss"""
+        cached = solve_cache.cache.get(key)
+        if cached is None:
+            return False
+
+        with solver_stats.measure_group(self.stats, group, sketch) as group_stats:
+            solver_pool.apply_params(self.solvesys, group, cached.params)
+
+        if group_stats is not None:
+            group_stats["cached"] = True
+
+        self._handle_result(
+            sketch, cached.retval, cached.dof, cached.failed, group_stats
+        )
+        return True
+
+    def _solve_group(self, sketch, group):
+        with solver_stats.measure_group(self.stats, group, sketch) as group_stats:
             retval = self.solvesys.solve(
-                group=g,
-                reportFailed=report,
+                group=group,
+                reportFailed=self.report,
                 findFreeParams=False,
             )
 
-            if retval > 5:
-                logger.debug("Solver returned undocumented value: {}".format(retval))
+        dof, fails = self.solvesys.Dof, self.solvesys.Failed
+        self._handle_result(sketch, retval, dof, fails, group_stats)
+        return retval, dof, fails
 
-            self.result = bpyEnum(solver_state_items, index=retval)
+    def _solve_serial(self, sketches):
+        for sketch in sketches:
+            g = self._get_group(sketch)
 
-            if report and sketch:
-                sketch.solver_state = self.result.identifier
-                sketch.dof = self.solvesys.Dof
+            key = self._get_cache_key(g)
+            if key is None or not self._solve_from_cache(sketch, g, key):
+                self._solve_uncached(sketch, g, key)
+
+            if g == self.group_3d:
+                # Params that sketches depend on might have changed
+                self._system_data = None
+
+    def _solve_uncached(self, sketch, group, key):
+        result = None
+        if sketch and self.decompose:
+            result = self._solve_components(sketch, group)
+        if result is None:
+            result = self._solve_group(sketch, group)
+
+        retval, dof, fails = result
+        if key is not None and retval in (0, 5):
+            params = [(h, self.solvesys.getParam(h).val) for h in key.params]
+            solve_cache.cache.put(key, params, retval, dof, fails)
+
+    def _solve_components(self, sketch, group):
+        """Solve the connected components of a sketch individually, returns
+        None if the sketch doesn't consist of multiple components
+        """
+        stats = self.stats
+
+        with solver_stats.measure(stats, "decompose"):
+            data = self._get_system_data()
+            components = solver_components.find_components(data, group)
+            if len(components) < 2:
+                return None
+
+            static = solver_components.static_data(
+                data, (self.group_fixed, self.group_3d)
+            )
+            static_signature = solver_components.signature(static)
+
+        with solver_stats.measure_group(stats, group, sketch) as group_stats:
+            results = [
+                solver_components.solve_component(
+                    c, static, static_signature, group, self.report
+                )
+                for c in components
+            ]
 
-            if retval != 0 and retval != 5:
-                self.ok = False
+            # Only apply components that were solved successfully
+            for r in results:
+                if r.retval in (0, 5) and not r.skipped:
+                    solver_pool.apply_params(self.solvesys, group, r.params)
 
-                # Store sketch failures
-                self.failed_sketches.append(sketch)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Solved {} components of {}, skipped {}".format(
+                    len(results), sketch, sum(r.skipped for r in results)
+                )
+            )
 
-            logger.info(self.result.description)
+        if group_stats is not None:
+            group_stats["components"] = [
+                {
+                    "size": r.size,
+                    "result": bpyEnum(solver_state_items, index=r.retval).identifier,
+                    "dof": r.dof,
+                    "failed": len(r.failed),
+                    "skipped": r.skipped,
+                }
+                for r in results
+            ]
 
-            fails = self.solvesys.Failed
-            if report and fails:
+        retval = solver_components.combine_retval(results)
+        dof = sum(r.dof for r in results)
+        fails = [i for r in results for i in r.failed]
+        self._handle_result(sketch, retval, dof, fails, group_stats, partial=True)
+        return retval, dof, fails
+
+    def _solve_parallel(self, sketches, workers):
+        """Solve sketches in worker processes and merge the results into the
+        solver system, returns False if nothing was solved
+        """
+        stats = self.stats
+        groups = [self._get_group(sketch) for sketch in sketches]
+
+        with solver_stats.measure(stats, "parallel"):
+            data = solver_pool.export_system(self.solvesys)
+            results = solver_pool.solve_groups(
+                data,
+                groups,
+                (self.group_fixed, self.group_3d),
+                self.report,
+                workers=workers,
+            )
 
-                for i in fails:
-                    if i == self.tweak_constraint:
-                        continue
-                    constr = self.constraints[i]
-                    constr.failed = True
+        if results is None:
+            return False
 
-                def _get_msg_failed():
-                    msg = "Failed constraints:"
-                    for i in fails:
-                        constr = self.constraints[i]
-                        msg += "\n  - {}".format(constr)
-                    return msg
+        for sketch, result in zip(sketches, results):
+            with solver_stats.measure_group(stats, result.group, sketch) as group_stats:
+                solver_pool.apply_params(self.solvesys, result.group, result.params)
 
-                if logger.isEnabledFor(logging.DEBUG):
-                    logger.debug(_get_msg_failed())
+            self._handle_result(
+                sketch, result.retval, result.dof, result.failed, group_stats
+            )
+        return True
 
-        # Update entities from solver
-        for e in self.entities:
-            if not self.needs_update(e):
-                continue
+    def _update_entities(self):
+        """Update entities from solver"""
+        with solver_stats.measure(self.stats, "update"):
+            for e in self.entities:
+                if not self.needs_update(e):
+                    continue
 
-            e.update_from_slvs(self.solvesys)
+                transaction.record(e)
+                e.update_from_slvs(self.solvesys)
 
         def _get_msg_update():
             msg = "Update entities from solver:"
@@ -266,6 +453,66 @@ class Solver:
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug(_get_msg_update())
 
+    def export_group(self, report=False):
+        """Initialize the solver data and export everything that's needed to solve
+        the solver's group, this allows to solve it outside of blender's main thread
+
+        Returns:
+            Tuple[solver_pool.SystemData, int]: The exported data and its group
+        """
+        self.report = report
+        self._init_slvs_data()
+
+        group = self._get_group(self.sketch)
+        data = solver_pool.split_system(
+            solver_pool.export_system(self.solvesys),
+            group,
+            self._get_static_groups(group),
+        )
+        return data, group
+
+    def apply_group_result(self, result):
+        """Apply the result of a group that was solved from export_group"""
+        solver_pool.apply_params(self.solvesys, result.group, result.params)
+        self._handle_result(self.sketch, result.retval, result.dof, result.failed)
+        self._update_entities()
+        return self.ok
+
+    def solve(self, report=True):
+        self.report = report
+        stats = self.stats
+
+        with solver_stats.measure(stats, "init"):
+            self._init_slvs_data()
+
+        if stats:
+            stats.tweak = self.tweak_entity is not None
+            stats.entity_count = len(self.entities)
+            stats.param_count = self.solvesys.ParamHandle
+            stats.constraint_count = self.solvesys.ConstraintHandle
+
+        if self.all:
+            sse = self.context.scene.sketcher.entities
+            sketches = [None, *sse.sketches]
+        else:
+            sketches = [
+                self.sketch,
+            ]
+
+        workers = self._get_parallel_workers()
+        if workers is not None and len(sketches) > solver_pool.MIN_GROUPS:
+            # Sketches depend on the 3D group, solve it upfront
+            self._solve_serial(sketches[:1])
+            if not self._solve_parallel(sketches[1:], workers):
+                self._solve_serial(sketches[1:])
+        else:
+            self._solve_serial(sketches)
+
+        self._update_entities()
+
+        if stats:
+            solver_stats.commit(stats)
+
         return self.ok
 
 
@@ -33,6 +33,7 @@ class StatefulOperatorLogic:
     _last_coords = Vector((0, 0))
     _numeric_input = {}
     _undo = False
+    _transaction = None
 
     def get_property(self, index: Optional[int] = None):
         if index is None:
@@ -309,12 +310,37 @@ class StatefulOperatorLogic:
     def state_func(self, context, coords):
         return NotImplementedError
 
+    def begin_transaction(self, context: Context):
+        """Start recording the changes of a preview, returns an object with
+        rollback and commit methods or None to revert previews with blender's undo
+        """
+        return None
+
+    def _begin_preview(self, context: Context):
+        self._transaction = self.begin_transaction(context)
+
+    def _revert_preview(self, message: str):
+        transaction = self._transaction
+        self._transaction = None
+        if transaction is not None and transaction.rollback():
+            return
+
+        bpy.ops.ed.undo_push(message=message)
+        bpy.ops.ed.undo()
+
+    def _commit_preview(self):
+        if self._transaction is not None:
+            self._transaction.commit()
+        self._transaction = None
+
     def invoke(self, context: Context, event: Event):
         self._state_data.clear()
         if hasattr(self, "init"):
             if not self.init(context, event):
                 return self._end(context, False)
 
+        self._begin_preview(context)
+
         retval = {"RUNNING_MODAL"}
 
         go_modal = True
@@ -576,8 +602,8 @@ class StatefulOperatorLogic:
                 ok = True
 
         if self._undo:
-            bpy.ops.ed.undo_push(message="Redo: " + self.bl_label)
-            bpy.ops.ed.undo()
+            self._revert_preview("Redo: " + self.bl_label)
+            self._begin_preview(context)
             global_data.ignore_list.clear()
             self.redo_states(context)
             self._undo = False
@@ -627,6 +653,7 @@ class StatefulOperatorLogic:
         # end operator
         self._end(context, True)
         bpy.ops.ed.undo_push(message=self.bl_label)
+        self._begin_preview(context)
 
         # save last prop
         last_pointer = None
@@ -659,12 +686,14 @@ class StatefulOperatorLogic:
 
         context.workspace.status_text_set(None)
 
-        # Push undo step and undo if failed
+        # Push undo step and revert the preview if failed
         if succeede:
+            self._commit_preview()
             bpy.ops.ed.undo_push(message=self.bl_label)
         elif not skip_undo:
-            bpy.ops.ed.undo_push(message="Cancelled: " + self.bl_label)
-            bpy.ops.ed.undo()
+            self._revert_preview("Cancelled: " + self.bl_label)
+        else:
+            self._commit_preview()
 
         retval = {"FINISHED"} if succeede else {"CANCELLED"}
         return retval
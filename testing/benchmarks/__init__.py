@@ -0,0 +1,124 @@
+"""Headless benchmark suite
+
+Run from the repository root with:
+
+    blender --background --addons CAD_Sketcher --python ./testing/benchmarks/__init__.py -- --output=results.json
+
+Arguments (after "--"):
+    --output=PATH       Write results to a json file
+    --baseline=PATH     Compare results against a previously written result file
+    --threshold=FLOAT   Allowed slowdown relative to the baseline, e.g. 0.2 for 20%
+    --filter=TEXT       Only run cases whose name contains the given text
+    --repeat=INT        Override the number of repetitions of every case
+"""
+
+import logging
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Add parent directory to sys.path to allow importing from testing
+module_path = Path(__file__).parent.parent.parent.as_posix()
+if module_path not in sys.path:
+    sys.path.append(module_path)
+
+
+def run_case(context, name, func, repeat, params):
+    """Run a single case repeat times and return its timings"""
+    from CAD_Sketcher.testing.benchmarks import generators
+
+    timings = []
+    for i in range(repeat):
+        scene = generators.new_scene("{}_{}".format(name, i))
+
+        with context.temp_override(scene=scene):
+            context.scene.sketcher.entities.ensure_origin_elements(context)
+            steps = func(context, **params)
+
+            # Prepare the scene
+            next(steps)
+
+            start = time.perf_counter()
+            for _ in steps:
+                pass
+            timings.append(time.perf_counter() - start)
+
+        generators.remove_scene(scene)
+
+    return {
+        "params": params,
+        "repeat": repeat,
+        "min": min(timings),
+        "max": max(timings),
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+    }
+
+
+def run(filter=None, repeat=None):
+    import bpy
+    from CAD_Sketcher import get_addon_version
+    from CAD_Sketcher.testing.benchmarks.cases import CASES
+
+    context = bpy.context
+
+    results = {}
+    for name, (func, default_repeat, params) in CASES.items():
+        if filter and filter not in name:
+            continue
+
+        logger.info("Run benchmark: {}".format(name))
+        result = run_case(context, name, func, repeat or default_repeat, params)
+        results[name] = result
+        print("{:<36} {:>10.2f}ms".format(name, result["median"] * 1000))
+
+    return {
+        "meta": {
+            "time": time.time(),
+            "blender": bpy.app.version_string,
+            "addon": get_addon_version(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+
+
+def main(kwargs):
+    from CAD_Sketcher.testing.benchmarks import report
+
+    results = run(
+        filter=kwargs.get("--filter"),
+        repeat=int(kwargs["--repeat"]) if "--repeat" in kwargs else None,
+    )
+
+    if "--output" in kwargs:
+        report.write(results, kwargs["--output"])
+
+    if "--baseline" not in kwargs:
+        return 0
+
+    threshold = float(kwargs.get("--threshold", report.DEFAULT_THRESHOLD))
+    comparison = report.compare(
+        results, report.read(kwargs["--baseline"]), threshold=threshold
+    )
+    print(report.format_comparison(comparison))
+    return 1 if report.has_regressions(comparison) else 0
+
+
+if __name__ == "__main__":
+    kwargs = {}
+    argv = sys.argv
+    if "--" in argv:
+        for arg in argv[argv.index("--") + 1 :]:
+            if "=" not in arg:
+                continue
+            key, value = arg.split("=", 1)
+            kwargs[key] = value
+
+    print("kwargs: {}".format(kwargs))
+    sys.exit(main(kwargs))
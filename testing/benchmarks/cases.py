@@ -0,0 +1,350 @@
+"""Benchmark cases
+
+A case is a generator function, everything before the first yield prepares the
+scene and isn't measured, everything after it is timed. Every repetition of a
+case runs in a new scene.
+"""
+
+from copy import deepcopy
+
+from mathutils import Vector
+
+from . import generators
+
+CASES = {}
+
+
+def case(name: str, repeat: int = 5, **params):
+    """Register a benchmark case with its default parameters"""
+
+    def decorator(func):
+        CASES[name] = (func, repeat, params)
+        return func
+
+    return decorator
+
+
+def _get(context, index):
+    return context.scene.sketcher.entities.get(index)
+
+
+def _activate(context, sketch_index: int):
+    context.scene.sketcher.active_sketch_i = sketch_index
+
+
+@case("startup_background", repeat=3)
+def startup_background(context):
+    """Start blender in the background with only the addon enabled"""
+    import subprocess
+    import bpy
+
+    cmd = [
+        bpy.app.binary_path,
+        "--background",
+        "--factory-startup",
+        "--addons",
+        "CAD_Sketcher",
+    ]
+    yield
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
+
+@case("solve_rectangle_grid", rows=15, cols=15)
+def solve_rectangle_grid(context, rows, cols):
+    from CAD_Sketcher.solver import solve_system
+
+    sketch = _get(context, generators.rectangle_grid(context, rows, cols))
+    yield
+    solve_system(context, sketch=sketch)
+
+
+@case("solve_polyline_chain", count=500)
+def solve_polyline_chain(context, count):
+    from CAD_Sketcher.solver import solve_system
+
+    sketch = _get(context, generators.polyline_chain(context, count))
+    yield
+    solve_system(context, sketch=sketch)
+
+
+@case("solve_all_many_sketches", sketch_count=20, rows=3, cols=3)
+def solve_all_many_sketches(context, sketch_count, rows, cols):
+    from CAD_Sketcher.solver import Solver
+
+    generators.many_sketches(context, sketch_count, rows, cols)
+    yield
+    Solver(context, None, all=True).solve()
+
+
+@case("tweak_rectangle_grid", rows=15, cols=15)
+def tweak_rectangle_grid(context, rows, cols):
+    from CAD_Sketcher.solver import Solver
+
+    sketch_index = generators.rectangle_grid(context, rows, cols)
+    _activate(context, sketch_index)
+    sketch = _get(context, sketch_index)
+
+    # Tweak the corner opposite of the fixed point of the first rectangle
+    point = next(
+        e
+        for e in sketch.sketch_entities(context)
+        if e.is_point() and not e.fixed and e.co.y > 0
+    )
+    pos = point.location + Vector((0.1, 0.1, 0.0))
+    yield
+    solver = Solver(context, sketch)
+    solver.tweak(point, pos)
+    solver.solve(report=False)
+
+
+def _convert(context, sketch, mode):
+    from CAD_Sketcher.converters import update_convertor_geometry
+
+    sketch.convert_type = mode
+    update_convertor_geometry(context.scene, sketch=sketch)
+
+
+@case("convert_bezier_polyline_chain", count=1000)
+def convert_bezier_polyline_chain(context, count):
+    sketch = _get(context, generators.polyline_chain(context, count))
+    yield
+    _convert(context, sketch, "BEZIER")
+
+
+@case("convert_bezier_arc_chain", count=500)
+def convert_bezier_arc_chain(context, count):
+    sketch = _get(context, generators.arc_chain(context, count))
+    yield
+    _convert(context, sketch, "BEZIER")
+
+
+@case("convert_mesh_arc_chain", count=500)
+def convert_mesh_arc_chain(context, count):
+    sketch = _get(context, generators.arc_chain(context, count))
+    yield
+    _convert(context, sketch, "MESH")
+
+
+@case("convert_mesh_rectangle_grid", rows=15, cols=15)
+def convert_mesh_rectangle_grid(context, rows, cols):
+    sketch = _get(context, generators.rectangle_grid(context, rows, cols))
+    yield
+    _convert(context, sketch, "MESH")
+
+
+@case("evaluate_many_sketches", sketch_count=20, rows=3, cols=3)
+def evaluate_many_sketches(context, sketch_count, rows, cols):
+    from CAD_Sketcher.converters import evaluate_sketches
+
+    generators.many_sketches(context, sketch_count, rows, cols)
+    yield
+    evaluate_sketches(context)
+
+
+def convert_mesh_from_curve(context, sketch):
+    """Reference for the mesh conversion that goes through a bezier curve, this
+    is how meshes were created before the MeshConverter
+    """
+    import bpy
+    import bmesh
+    from CAD_Sketcher.converters import BezierConverter, DISSOLVE_ANGLE_LIMIT
+
+    curve = bpy.data.curves.new(sketch.name, "CURVE")
+    ob = bpy.data.objects.new(sketch.name, curve)
+    BezierConverter(context.scene, sketch).to_bezier(curve)
+    for spline in curve.splines:
+        spline.resolution_u = sketch.curve_resolution
+
+    bm = bmesh.new()
+    bm.from_mesh(ob.to_mesh())
+    ob.to_mesh_clear()
+    bmesh.ops.dissolve_limit(
+        bm, angle_limit=DISSOLVE_ANGLE_LIMIT, verts=bm.verts, edges=bm.edges
+    )
+
+    mesh = bpy.data.meshes.new(sketch.name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+@case("convert_mesh_from_curve_arc_chain", count=500)
+def convert_mesh_from_curve_arc_chain(context, count):
+    sketch = _get(context, generators.arc_chain(context, count))
+    yield
+    convert_mesh_from_curve(context, sketch)
+
+
+@case("convert_mesh_from_curve_rectangle_grid", rows=15, cols=15)
+def convert_mesh_from_curve_rectangle_grid(context, rows, cols):
+    sketch = _get(context, generators.rectangle_grid(context, rows, cols))
+    yield
+    convert_mesh_from_curve(context, sketch)
+
+
+def _polygon_coords(count):
+    import numpy as np
+
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    return np.column_stack((np.cos(angles), np.sin(angles))) * count
+
+
+@case("add_polygon_per_item", count=10000, repeat=3)
+def add_polygon_per_item(context, count):
+    entities = context.scene.sketcher.entities
+    sketch = generators.add_sketch(context)
+    coords = _polygon_coords(count)
+    yield
+    points = [entities.add_point_2d(co, sketch, index_reference=True) for co in coords]
+    for i in range(count):
+        entities.add_line_2d(
+            points[i], points[(i + 1) % count], sketch, index_reference=True
+        )
+
+
+@case("add_polygon_bulk", count=10000, repeat=3)
+def add_polygon_bulk(context, count):
+    import numpy as np
+
+    entities = context.scene.sketcher.entities
+    sketch = generators.add_sketch(context)
+    coords = _polygon_coords(count)
+    yield
+    points = entities.add_points_2d(coords, sketch)
+    entities.add_lines_2d(np.column_stack((points, np.roll(points, -1))), sketch)
+
+
+def _separate_lines(context, count):
+    import numpy as np
+
+    entities = context.scene.sketcher.entities
+    sketch = generators.add_sketch(context)
+    x = np.arange(count, dtype=np.float64) * 2
+    coords = np.column_stack((np.repeat(x, 2), np.tile((0.0, 0.1), count)))
+    coords[1::2, 0] += 1
+    points = entities.add_points_2d(coords, sketch, fixed=np.tile((True, False), count))
+    lines = entities.add_lines_2d(points.reshape(-1, 2), sketch)
+    return sketch, points.reshape(-1, 2), lines
+
+
+@case("constrain_lines_per_item", count=2000, repeat=3)
+def constrain_lines_per_item(context, count):
+    from CAD_Sketcher.solver import solve_system
+
+    constraints = context.scene.sketcher.constraints
+    sketch, points, lines = _separate_lines(context, count)
+    yield
+    for line, (p1, p2) in zip(lines, points):
+        constraints.add_horizontal(int(line), sketch=sketch)
+        constraints.add_distance(int(p1), int(p2), sketch, value=1.5)
+    solve_system(context, sketch=_get(context, sketch))
+
+
+@case("constrain_lines_bulk", count=2000, repeat=3)
+def constrain_lines_bulk(context, count):
+    from CAD_Sketcher.utilities.solver import defer_solves
+
+    constraints = context.scene.sketcher.constraints
+    sketch, points, lines = _separate_lines(context, count)
+    yield
+    with defer_solves(context):
+        constraints.add_many("HORIZONTAL", lines, sketch)
+        constraints.add_many("DISTANCE", points, sketch, values=1.5)
+
+
+@case("merge_points_polyline", count=100000, repeat=3)
+def merge_points_polyline(context, count):
+    """Merge the shared endpoints of a zigzag of separate lines"""
+    import numpy as np
+    from CAD_Sketcher.utilities.point_merge import merge_points
+
+    entities = context.scene.sketcher.entities
+    sketch_index = generators.add_sketch(context)
+
+    line_count = count // 2
+    x = np.arange(line_count + 1, dtype=np.float64)
+    joints = np.column_stack((x, (x % 2) * 0.5))
+    coords = np.column_stack((joints[:-1], joints[1:])).reshape(-1, 2)
+    points = entities.add_points_2d(coords, sketch_index)
+    entities.add_lines_2d(points.reshape(-1, 2), sketch_index)
+    sketch = _get(context, sketch_index)
+    yield
+    merge_points(context.scene, sketch)
+
+
+@case("copy_paste_rectangle_grid", rows=10, cols=10)
+def copy_paste_rectangle_grid(context, rows, cols):
+    import bpy
+    from CAD_Sketcher import global_data
+    from CAD_Sketcher.serialize import paste, iter_elements_dict
+    from CAD_Sketcher.utilities.select import select_all
+
+    sketch_index = generators.rectangle_grid(context, rows, cols)
+    _activate(context, sketch_index)
+    select_all(context)
+    yield
+    bpy.ops.view3d.slvs_copy()
+
+    # Same as the paste operator without invoking the move operator
+    buffer = deepcopy(global_data.COPY_BUFFER)
+    for element in iter_elements_dict(buffer):
+        if "sketch_i" in element.keys():
+            element["sketch_i"] = sketch_index
+    paste(context, buffer)
+
+
+@case("delete_polyline_chain", count=300)
+def delete_polyline_chain(context, count):
+    from CAD_Sketcher.operators.delete_entity import View3D_OT_slvs_delete_entity
+
+    sketch_index = generators.polyline_chain(context, count)
+    _activate(context, sketch_index)
+    entities = context.scene.sketcher.entities
+    indices = [line.slvs_index for line in entities.lines2D]
+    yield
+    for i in reversed(indices):
+        View3D_OT_slvs_delete_entity.delete(entities.get(i), context)
+
+
+@case("walker_polyline_chain", count=1000)
+def walker_polyline_chain(context, count):
+    from CAD_Sketcher.utilities.walker import EntityWalker
+
+    sketch = _get(context, generators.polyline_chain(context, count))
+    yield
+    EntityWalker(context.scene, sketch)
+
+
+@case("walker_arc_chain", count=500)
+def walker_arc_chain(context, count):
+    from CAD_Sketcher.utilities.walker import EntityWalker
+
+    sketch = _get(context, generators.arc_chain(context, count))
+    yield
+    EntityWalker(context.scene, sketch)
+
+
+@case("versioning_recalc_pointers", rows=10, cols=10, repeat=3)
+def versioning_recalc_pointers(context, rows, cols):
+    from CAD_Sketcher.versioning import recalc_pointers
+
+    generators.rectangle_grid(context, rows, cols)
+    generators.legacy_type_indices(context.scene)
+    yield
+    recalc_pointers(context.scene)
+
+
+@case("versioning_recalc_pointers_large", count=25000, repeat=1)
+def versioning_recalc_pointers_large(context, count):
+    """Legacy file with count points and as many lines connecting them"""
+    import numpy as np
+    from CAD_Sketcher.versioning import recalc_pointers
+
+    entities = context.scene.sketcher.entities
+    sketch = generators.add_sketch(context)
+    coords = np.column_stack((np.arange(count), np.zeros(count)))
+    points = entities.add_points_2d(coords, sketch)
+    entities.add_lines_2d(np.column_stack((points, np.roll(points, -1))), sketch)
+    generators.legacy_type_indices(context.scene)
+    yield
+    recalc_pointers(context.scene)
@@ -0,0 +1,186 @@
+"""Generators for synthetic sketches used by the benchmarks
+
+All generators work with index references to avoid stale data, see the
+"Gotcha's" section of the code docs.
+"""
+
+import math
+
+from CAD_Sketcher.utilities.index import assemble_index, breakdown_index
+
+
+def new_scene(name: str):
+    """Create an empty scene, elements should be added with the scene being
+    overridden in the context as there's no window in background mode
+    """
+    import bpy
+
+    return bpy.data.scenes.new(name)
+
+
+def remove_scene(scene):
+    import bpy
+
+    bpy.data.scenes.remove(scene)
+
+
+def add_sketch(context, wp=None) -> int:
+    """Add a sketch and return its index"""
+    entities = context.scene.sketcher.entities
+    if wp is None:
+        wp = entities.origin_plane_XY
+    return entities.add_sketch(wp, index_reference=True)
+
+
+def add_rectangle(context, sketch: int, origin, width: float, height: float):
+    """Add a fully constrained rectangle, returns point and line indices"""
+    entities = context.scene.sketcher.entities
+    constraints = context.scene.sketcher.constraints
+
+    x, y = origin
+    coords = ((x, y), (x + width, y), (x + width, y + height), (x, y + height))
+    points = [
+        entities.add_point_2d(co, sketch, fixed=(i == 0), index_reference=True)
+        for i, co in enumerate(coords)
+    ]
+    lines = [
+        entities.add_line_2d(
+            points[i], points[(i + 1) % 4], sketch, index_reference=True
+        )
+        for i in range(4)
+    ]
+
+    constraints.add_horizontal(lines[0], sketch=sketch)
+    constraints.add_horizontal(lines[2], sketch=sketch)
+    constraints.add_vertical(lines[1], sketch=sketch)
+    constraints.add_vertical(lines[3], sketch=sketch)
+    constraints.add_distance(points[0], points[1], sketch, value=width)
+    constraints.add_distance(points[1], points[2], sketch, value=height)
+    return points, lines
+
+
+def rectangle_grid(context, rows: int, cols: int, size=1.0, spacing=0.5, sketch=None):
+    """Add a grid of fully constrained rectangles to a sketch
+
+    Returns:
+        int: Index of the sketch
+    """
+    if sketch is None:
+        sketch = add_sketch(context)
+
+    step = size + spacing
+    for row in range(rows):
+        for col in range(cols):
+            add_rectangle(context, sketch, (col * step, row * step), size, size)
+    return sketch
+
+
+def polyline_chain(context, count: int, segment_length=1.0, closed=False, sketch=None):
+    """Add a chain of connected lines that zigzag along the x axis
+
+    Returns:
+        int: Index of the sketch
+    """
+    if sketch is None:
+        sketch = add_sketch(context)
+
+    entities = context.scene.sketcher.entities
+    constraints = context.scene.sketcher.constraints
+
+    points = []
+    for i in range(count + (0 if closed else 1)):
+        if closed:
+            angle = 2 * math.pi * i / count
+            radius = count * segment_length / (2 * math.pi)
+            co = (math.cos(angle) * radius, math.sin(angle) * radius)
+        else:
+            co = (i * segment_length, (i % 2) * segment_length / 2)
+        points.append(
+            entities.add_point_2d(co, sketch, fixed=(i == 0), index_reference=True)
+        )
+
+    for i in range(count):
+        p1, p2 = points[i], points[(i + 1) % len(points)]
+        entities.add_line_2d(p1, p2, sketch, index_reference=True)
+        constraints.add_distance(p1, p2, sketch, value=segment_length)
+    return sketch
+
+
+def arc_chain(context, count: int, radius=1.0, sketch=None):
+    """Add a chain of half circle arcs connected at their endpoints
+
+    Returns:
+        int: Index of the sketch
+    """
+    if sketch is None:
+        sketch = add_sketch(context)
+
+    entities = context.scene.sketcher.entities
+    nm = entities.add_normal_2d(sketch, index_reference=True)
+
+    start = entities.add_point_2d((0.0, 0.0), sketch, index_reference=True)
+    for i in range(count):
+        x = 2 * radius * i
+        ct = entities.add_point_2d((x + radius, 0.0), sketch, index_reference=True)
+        end = entities.add_point_2d((x + 2 * radius, 0.0), sketch, index_reference=True)
+        entities.add_arc(
+            nm, ct, start, end, sketch, invert=bool(i % 2), index_reference=True
+        )
+        start = end
+    return sketch
+
+
+def many_sketches(context, sketch_count: int, rows: int, cols: int):
+    """Add sketches on individual workplanes, each with a grid of rectangles
+
+    Returns:
+        List[int]: Indices of the sketches
+    """
+    entities = context.scene.sketcher.entities
+
+    sketches = []
+    for i in range(sketch_count):
+        p = entities.add_point_3d(
+            (0.0, 0.0, float(i)), fixed=True, index_reference=True
+        )
+        nm = entities.add_normal_3d(
+            (1.0, 0.0, 0.0, 0.0), fixed=True, index_reference=True
+        )
+        wp = entities.add_workplane(p, nm, fixed=True, index_reference=True)
+        sketch = add_sketch(context, wp)
+        rectangle_grid(context, rows, cols, sketch=sketch)
+        sketches.append(sketch)
+    return sketches
+
+
+def legacy_type_indices(scene, offset: int = 10):
+    """Rewrite all entity indices as if their type index was shifted by offset,
+    this mimics files that were written with a different set of entity types and
+    have to be fixed with versioning.recalc_pointers
+    """
+    from CAD_Sketcher.serialize import (
+        scene_to_dict,
+        scene_from_dict,
+        _replace_indices,
+        iter_elements_dict,
+    )
+
+    elements = scene_to_dict(scene)
+
+    mapping = {}
+    for elem in iter_elements_dict(elements):
+        index = elem.get("slvs_index")
+        if index is None:
+            continue
+        type_index, local_index = breakdown_index(index)
+        mapping[index] = assemble_index(type_index + offset, local_index)
+
+    _replace_indices(elements, mapping)
+
+    # Pointers that are stored directly on the entities group
+    entity_dict = elements["entities"]
+    for key, value in entity_dict.items():
+        if key.endswith("_i") and value in mapping:
+            entity_dict[key] = mapping[value]
+
+    scene_from_dict(scene, elements)
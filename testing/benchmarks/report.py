@@ -0,0 +1,88 @@
+"""Storing benchmark results and comparing them against a baseline
+
+This module doesn't depend on blender and can be used to compare result files
+from any python interpreter.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Union
+
+# Allowed slowdown relative to the baseline before a case counts as regression
+DEFAULT_THRESHOLD = 0.2
+
+# Cases faster than this (in seconds) are too noisy to be compared reliably
+MIN_TIME = 0.001
+
+
+def write(results: Dict, filepath: Union[str, Path]):
+    with open(filepath, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def read(filepath: Union[str, Path]) -> Dict:
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def compare(
+    results: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict]:
+    """Compare the median time of every case against the baseline.
+
+    The baseline may define per case thresholds under the key "thresholds"
+    which take precedence over the given threshold.
+
+    Returns:
+        List[Dict]: One entry per case that exists in both results
+    """
+    thresholds = baseline.get("thresholds", {})
+    base_cases = baseline.get("results", {})
+
+    comparison = []
+    for name, result in results.get("results", {}).items():
+        base = base_cases.get(name)
+        if not base:
+            continue
+
+        if base.get("params") != result.get("params"):
+            # Different problem size, not comparable
+            continue
+
+        base_time, time = base["median"], result["median"]
+        ratio = time / base_time if base_time else 1.0
+        limit = thresholds.get(name, threshold)
+        regressed = ratio > 1.0 + limit and time - base_time > MIN_TIME
+
+        comparison.append(
+            {
+                "name": name,
+                "baseline": base_time,
+                "time": time,
+                "ratio": ratio,
+                "threshold": limit,
+                "regressed": regressed,
+            }
+        )
+    return comparison
+
+
+def format_comparison(comparison: List[Dict]) -> str:
+    lines = [
+        "{:<36} {:>12} {:>12} {:>8}".format("Case", "Baseline", "Current", "Ratio")
+    ]
+    for entry in comparison:
+        lines.append(
+            "{:<36} {:>10.2f}ms {:>10.2f}ms {:>7.2f}x{}".format(
+                entry["name"],
+                entry["baseline"] * 1000,
+                entry["time"] * 1000,
+                entry["ratio"],
+                "  REGRESSION" if entry["regressed"] else "",
+            )
+        )
+    return "\n".join(lines)
+
+
+def has_regressions(comparison: List[Dict]) -> bool:
+    return any(entry["regressed"] for entry in comparison)
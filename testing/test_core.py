@@ -1,8 +1,10 @@
 from unittest import skip
-from testing.utils import BgsTestCase
+from testing.utils import BgsTestCase, Sketch2dTestCase
 from CAD_Sketcher.model.types import SlvsPoint3D
 from CAD_Sketcher.model.utilities import slvs_entity_pointer
 
+import math
+from mathutils import Vector
 from sys import float_info
 
 
@@ -40,3 +42,442 @@ class TestEntities(BgsTestCase):
 
         del bpy.types.Scene.test_group
         unregister_class(PointerTest)
+
+
+class TestBulkEntities(Sketch2dTestCase):
+    def test_add_points_and_lines_2d(self):
+        entities = self.entities
+        point_count = len(entities.points2D)
+
+        coords = [(0, 0), (1, 0), (1, 1)]
+        points = entities.add_points_2d(coords, self.sketch, fixed=[True, False, False])
+        lines = entities.add_lines_2d(
+            [(points[0], points[1]), (points[1], points[2])], self.sketch
+        )
+
+        self.assertEqual(len(entities.points2D), point_count + 3)
+        for index, co in zip(points, coords):
+            point = entities.get(int(index))
+            self.assertEqual(point.slvs_index, index)
+            self.assertEqual(tuple(point.co), co)
+            self.assertEqual(point.sketch, self.sketch)
+        self.assertTrue(entities.get(int(points[0])).fixed)
+        self.assertFalse(entities.get(int(points[1])).fixed)
+
+        line = entities.get(int(lines[1]))
+        self.assertEqual(line.p1.slvs_index, points[1])
+        self.assertEqual(line.p2.slvs_index, points[2])
+        self.assertEqual(line.sketch, self.sketch)
+
+
+class TestPointMerge(Sketch2dTestCase):
+    def test_merge_points(self):
+        from CAD_Sketcher.utilities.point_merge import merge_points
+
+        entities = self.entities
+        sketch = self.sketch
+        points = entities.add_points_2d([(0, 0), (1, 0), (1, 0.00001), (2, 1)], sketch)
+        lines = entities.add_lines_2d([points[:2], points[2:]], sketch)
+        self.constraints.add_distance(int(points[1]), int(points[2]), sketch)
+        point_count = len(entities.points2D)
+
+        result = merge_points(self.context.scene, sketch)
+
+        self.assertEqual(result, (1, 1))
+        self.assertEqual(len(entities.points2D), point_count - 1)
+        line1, line2 = (entities.get(int(i)) for i in lines)
+        self.assertEqual(line1.p2, line2.p1)
+        self.assertEqual(tuple(line2.p2.co), (2, 1))
+        for i, point in enumerate(entities.points2D):
+            self.assertEqual(point.slvs_index & 0xFFFFF, i)
+
+    def test_merge_points_keeps_segments(self):
+        from CAD_Sketcher.utilities.point_merge import merge_points
+
+        entities = self.entities
+        sketch = self.sketch
+        points = entities.add_points_2d([(0, 0), (0.00001, 0), (0, 0.00001)], sketch)
+        line = entities.add_line_2d(int(points[0]), int(points[1]), sketch)
+        point_count = len(entities.points2D)
+
+        # Only the point that isn't connected to the short line gets merged
+        result = merge_points(self.context.scene, sketch)
+
+        self.assertEqual(result, (1, 0))
+        self.assertEqual(len(entities.points2D), point_count - 1)
+        self.assertNotEqual(line.p1, line.p2)
+
+
+class TestVersioning(Sketch2dTestCase):
+    def test_recalc_pointers(self):
+        from CAD_Sketcher.utilities.index import breakdown_index, assemble_index
+        from CAD_Sketcher.versioning import recalc_pointers
+
+        entities = self.entities
+        points = entities.add_points_2d([(0, 0), (1, 0)], self.sketch)
+        line = entities.add_line_2d(int(points[0]), int(points[1]), self.sketch)
+
+        # Mimic indices of a file with a different set of entity types
+        legacy = {}
+        for index in points:
+            type_index, local_index = breakdown_index(int(index))
+            legacy[int(index)] = assemble_index(type_index + 10, local_index)
+            entities.get(int(index))["slvs_index"] = legacy[int(index)]
+        line["p1_i"] = legacy[int(points[0])]
+        line["p2_i"] = legacy[int(points[1])]
+
+        recalc_pointers(self.context.scene)
+
+        self.assertEqual(line.p1_i, points[0])
+        self.assertEqual(line.p2_i, points[1])
+        self.assertEqual(entities.get(line.p1_i).slvs_index, points[0])
+
+
+class TestStaleData(Sketch2dTestCase):
+    def test_remove_keeps_unaffected_data(self):
+        from CAD_Sketcher import global_data
+
+        entities = self.entities
+        points = entities.add_points_2d([(0, 0), (1, 0), (2, 0), (3, 0)], self.sketch)
+        line = entities.add_line_2d(int(points[2]), int(points[3]), self.sketch)
+        first, removed, moved = (int(i) for i in points[[0, 1, -1]])
+
+        global_data.selected[:] = [first, removed, moved]
+        for index in (first, moved):
+            global_data.batches[index] = object()
+        batch = global_data.batches[first]
+        for e in entities.all:
+            e.dirty = False
+
+        entities.remove(removed)
+
+        # The last point took the index of the removed one
+        self.assertEqual(global_data.selected, [first, removed])
+        self.assertIs(global_data.batches.get(first), batch)
+        self.assertNotIn(moved, global_data.batches)
+        self.assertFalse(entities.get(first).dirty)
+        self.assertTrue(entities.get(removed).dirty)
+        self.assertTrue(line.dirty)
+        self.assertEqual(line.p2_i, removed)
+
+
+class TestSketchMembership(Sketch2dTestCase):
+    def test_sketch_entities(self):
+        entities = self.entities
+        other = self.new_sketch()
+        points = entities.add_points_2d([(0, 0), (1, 0)], self.sketch)
+        line = entities.add_line_2d(int(points[0]), int(points[1]), self.sketch)
+        other_point = entities.add_point_2d((0, 1), other)
+        constraint = self.constraints.add_distance(
+            int(points[0]), int(points[1]), self.sketch
+        )
+
+        members = list(self.sketch.sketch_entities(self.context))
+        self.assertEqual(
+            [e.slvs_index for e in members], [*points.tolist(), line.slvs_index]
+        )
+        self.assertEqual(
+            [e.slvs_index for e in other.sketch_entities(self.context)],
+            [other_point.slvs_index],
+        )
+        self.assertEqual(
+            list(self.sketch.sketch_constraints(self.context)), [constraint]
+        )
+
+        # Membership is collected again after a removal
+        entities.remove(line.slvs_index)
+        self.assertEqual(
+            [e.slvs_index for e in self.sketch.sketch_entities(self.context)],
+            points.tolist(),
+        )
+
+    def test_sketch_pointer_write(self):
+        entities = self.entities
+        other = self.new_sketch()
+        point = entities.add_point_2d((0, 0), self.sketch, index_reference=True)
+        self.assertEqual(
+            [e.slvs_index for e in self.sketch.sketch_entities(self.context)],
+            [point],
+        )
+
+        # Moving an element to another sketch doesn't change any element count
+        entities.get(point).sketch = other
+        self.assertEqual(list(self.sketch.sketch_entities(self.context)), [])
+        self.assertEqual(
+            [e.slvs_index for e in other.sketch_entities(self.context)], [point]
+        )
+
+
+class TestDrawState(Sketch2dTestCase):
+    def test_entity_state(self):
+        from CAD_Sketcher.utilities.draw_state import DrawState
+
+        entities = self.entities
+        other = self.new_sketch()
+        other.visible = False
+        point = entities.add_point_2d((0, 0), self.sketch)
+        hidden = entities.add_point_2d((1, 0), other)
+        point.selected = True
+
+        state = DrawState(self.context)
+        for e in (point, hidden):
+            self.assertEqual(state.is_visible(e), e.is_visible(self.context))
+            self.assertEqual(state.is_selectable(e), e.is_selectable(self.context))
+            self.assertEqual(state.color(e), tuple(e.color(self.context)))
+
+        self.assertTrue(state.is_visible(point))
+        self.assertFalse(state.is_visible(hidden))
+        point.selected = False
+
+
+class TestCurveTessellation(BgsTestCase):
+    def test_coords_arc_lod(self):
+        from CAD_Sketcher.utilities.draw import coords_arc_lod
+
+        coords = coords_arc_lod(2.0, 16, angle=math.pi / 3, offset=math.pi / 2)
+        self.assertEqual(len(coords), 4)
+        self.assertAlmostEqual(coords[0][0], 0.0)
+        self.assertAlmostEqual(coords[0][1], 2.0)
+        self.assertAlmostEqual(coords[-1][0], -2.0 * math.sin(math.pi / 3))
+        self.assertAlmostEqual(coords[-1][1], 2.0 * math.cos(math.pi / 3))
+
+        circle = coords_arc_lod(1.0, 32)
+        self.assertEqual(len(circle), 33)
+        self.assertAlmostEqual(circle[-1][0], circle[0][0])
+        self.assertAlmostEqual(circle[-1][1], circle[0][1])
+
+
+class TestCulling(BgsTestCase):
+    def test_boxes_in_frustum(self):
+        import numpy as np
+        from CAD_Sketcher.utilities.culling import boxes_in_frustum
+
+        # Orthographic view of the unit cube
+        planes = np.array(
+            (
+                (1, 0, 0, 1),
+                (-1, 0, 0, 1),
+                (0, 1, 0, 1),
+                (0, -1, 0, 1),
+                (0, 0, 1, 1),
+                (0, 0, -1, 1),
+            ),
+            dtype=np.float64,
+        )
+        boxes = np.array(
+            (
+                ((-0.5, -0.5, 0), (0.5, 0.5, 0)),
+                ((0.5, 0.5, 0), (2, 2, 0)),
+                ((2, 0, 0), (3, 0, 0)),
+                ((-3, -3, 0), (3, 3, 0)),
+            ),
+            dtype=np.float64,
+        )
+        mask = boxes_in_frustum(planes, boxes)
+        self.assertEqual(mask.tolist(), [True, True, False, True])
+
+    def test_bounds_follow_points(self):
+        from CAD_Sketcher import global_data
+        from CAD_Sketcher.draw_handler import update_elements
+
+        entities = self.entities
+        p1 = entities.add_point_3d((0, 0, 0), index_reference=True)
+        p2 = entities.add_point_3d((1, 1, 0), index_reference=True)
+        line = entities.add_line_3d(p1, p2, index_reference=True)
+        update_elements(self.context)
+        self.assertEqual(global_data.bounds[line].tolist(), [[0, 0, 0], [1, 1, 0]])
+
+        # Points are updated before the line that depends on them
+        entities.get(p2).location = (2, -1, 3)
+        update_elements(self.context)
+        self.assertEqual(global_data.bounds[line].tolist(), [[0, -1, 0], [2, 0, 3]])
+
+
+class TestTransaction(BgsTestCase):
+    def test_rollback(self):
+        from CAD_Sketcher.utilities import transaction
+
+        entities = self.entities
+        constraints = self.constraints
+        p1 = entities.add_point_3d((0, 0, 0), index_reference=True)
+        point_count = len(entities.points3D)
+        distance_count = len(constraints.distance)
+
+        t = transaction.begin(self.context.scene)
+        p2 = entities.add_point_3d((1, 0, 0), index_reference=True)
+        constraints.add_distance(entities.get(p1), entities.get(p2))
+
+        point = entities.get(p1)
+        transaction.record(point)
+        point.location = (0, 0, 1)
+
+        self.assertTrue(t.rollback())
+        self.assertIsNone(transaction.get_active())
+        self.assertEqual(len(entities.points3D), point_count)
+        self.assertEqual(len(constraints.distance), distance_count)
+        self.assertEqual(tuple(entities.get(p1).location), (0, 0, 0))
+
+    def test_rollback_unrecorded_writes(self):
+        from CAD_Sketcher.utilities import transaction
+        from CAD_Sketcher.utilities.bpy import setprop
+
+        entities = self.entities
+        p1 = entities.add_point_3d((0, 0, 0))
+        p2 = entities.add_point_3d((1, 0, 0))
+        c = self.constraints.add_distance(p1, p2)
+        c.value = 1
+
+        t = transaction.begin(self.context.scene)
+        p1.construction = True
+        setprop(c, "value", 2)
+
+        self.assertTrue(t.rollback())
+        self.assertFalse(p1.construction)
+        self.assertEqual(c.value, 1)
+
+    def test_rollback_after_remove(self):
+        from CAD_Sketcher.utilities import transaction
+
+        entities = self.entities
+        entities.add_point_3d((0, 0, 0))
+        p2 = entities.add_point_3d((1, 0, 0))
+        point_count = len(entities.points3D)
+
+        # The length doesn't change but the removed point can't be restored
+        t = transaction.begin(self.context.scene)
+        entities.remove(p2.slvs_index)
+        entities.add_point_3d((2, 0, 0))
+
+        self.assertEqual(len(entities.points3D), point_count)
+        self.assertFalse(t.rollback())
+
+
+class TestMeshConverter(Sketch2dTestCase):
+    def test_to_mesh(self):
+        import bpy
+        from CAD_Sketcher.converters import MeshConverter
+
+        entities = self.entities
+        sketch = self.sketch
+        nm = entities.add_normal_2d(sketch)
+
+        # Closed path of two lines and an arc
+        p1 = entities.add_point_2d((0, 0), sketch)
+        p2 = entities.add_point_2d((2, 0), sketch)
+        p3 = entities.add_point_2d((2, 2), sketch)
+        ct = entities.add_point_2d((1, 2), sketch)
+        p4 = entities.add_point_2d((0, 2), sketch)
+        entities.add_line_2d(p1, p2, sketch)
+        entities.add_line_2d(p2, p3, sketch)
+        entities.add_arc(nm, ct, p3, p4, sketch)
+        entities.add_line_2d(p4, p1, sketch)
+
+        mesh = MeshConverter(self.context.scene, sketch, resolution=12).to_mesh(
+            bpy.data.meshes.new("direct")
+        )
+
+        # Corners of the lines and 12 segments per quarter of the half circle
+        self.assertEqual(len(mesh.vertices), 2 + 24 + 1)
+        corners = {(0, 0), (2, 0), (2, 2), (0, 2)}
+        for v in mesh.vertices:
+            x, y, z = v.co
+            self.assertAlmostEqual(z, 0)
+            if (round(x, 5), round(y, 5)) not in corners:
+                self.assertGreater(y, 2)
+                self.assertAlmostEqual((v.co.xy - Vector((1, 2))).length, 1, places=5)
+
+        # The vertices form a single closed loop
+        edges = [tuple(e.vertices) for e in mesh.edges]
+        self.assertEqual(len(edges), len(mesh.vertices))
+        neighbours = {i: set() for i in range(len(mesh.vertices))}
+        for a, b in edges:
+            neighbours[a].add(b)
+            neighbours[b].add(a)
+        self.assertTrue(all(len(n) == 2 for n in neighbours.values()))
+
+        previous, current, visited = 0, min(neighbours[0]), {0}
+        while current != 0:
+            visited.add(current)
+            previous, current = current, (neighbours[current] - {previous}).pop()
+        self.assertEqual(len(visited), len(mesh.vertices))
+
+        self.assertTrue(len(mesh.polygons))
+        self.assertTrue(all(p.normal.z > 0 for p in mesh.polygons))
+
+
+class TestEvaluateSketch(Sketch2dTestCase):
+    def test_evaluate(self):
+        import bpy
+
+        entities = self.entities
+        sketch = self.sketch
+        nm = entities.add_normal_2d(sketch)
+
+        coords = ((0, 0), (1, 0), (1, 1), (0, 1))
+        points = [entities.add_point_2d(co, sketch) for co in coords]
+        for i, p in enumerate(points):
+            entities.add_line_2d(p, points[(i + 1) % len(points)], sketch)
+        ct = entities.add_point_2d((3, 0), sketch)
+        entities.add_circle(nm, ct, 1, sketch)
+
+        data_count = len(bpy.data.meshes), len(bpy.data.curves)
+        polylines = sketch.evaluate(self.context, solve=False)
+        splines = sketch.evaluate(
+            self.context, mode="BEZIER", solve=False, world_space=True
+        )
+        self.assertEqual((len(bpy.data.meshes), len(bpy.data.curves)), data_count)
+
+        self.assertEqual(len(polylines), 2)
+        self.assertTrue(all(p.cyclic for p in polylines))
+        square = min(polylines, key=lambda p: len(p.coords))
+        self.assertEqual(square.coords.shape, (4, 2))
+
+        self.assertEqual(len(splines), 2)
+        for spline in splines:
+            self.assertEqual(spline.co.shape[1], 3)
+            self.assertEqual(spline.co.shape, spline.handle_left.shape)
+
+
+class TestBatch(BgsTestCase):
+    def test_summarize(self):
+        from CAD_Sketcher.batch import summarize
+
+        results = [
+            {"ok": True, "error": None, "time": 1.0},
+            {"ok": False, "error": None, "time": 2.0},
+            {"ok": False, "error": "RuntimeError: Cannot read file", "time": 0.0},
+        ]
+        summary = summarize(results, 2.5)
+        self.assertEqual(
+            (summary["ok"], summary["failed"], summary["errors"]), (1, 1, 1)
+        )
+        self.assertEqual(summary["cpu_time"], 3.0)
+
+
+class TestBezierConverter(Sketch2dTestCase):
+    def test_circle(self):
+        import bpy
+        from CAD_Sketcher.converters import BezierConverter
+
+        entities = self.entities
+        sketch = self.sketch
+        nm = entities.add_normal_2d(sketch)
+        ct = entities.add_point_2d((1, 1), sketch)
+        entities.add_circle(nm, ct, 2, sketch)
+
+        curve = bpy.data.curves.new("circle", "CURVE")
+        BezierConverter(self.context.scene, sketch).to_bezier(curve)
+
+        spline = curve.splines[0]
+        self.assertTrue(spline.use_cyclic_u)
+        self.assertEqual(len(spline.bezier_points), 4)
+
+        # Handle length of a quarter circle
+        handle_length = 4 / 3 * math.tan(math.pi / 8) * 2
+        center = ct.co.to_3d()
+        for point in spline.bezier_points:
+            self.assertAlmostEqual((point.co - center).length, 2, places=5)
+            for handle in (point.handle_left, point.handle_right):
+                self.assertAlmostEqual(
+                    (handle - point.co).length, handle_length, places=5
+                )
@@ -62,3 +62,298 @@ class TestSolver2d(Sketch2dTestCase):
         # circle = entities.add_circle(nm, p6, 30, sketch2)
 
         self.assertTrue(sketch2.solve(context))
+
+
+class TestParallelSolver(BgsTestCase):
+    def _add_sketch(self, length):
+        entities = self.entities
+        sketch = entities.add_sketch(entities.origin_plane_XY, index_reference=True)
+        p1 = entities.add_point_2d((0, 0), sketch, fixed=True, index_reference=True)
+        p2 = entities.add_point_2d((1, 1), sketch, index_reference=True)
+        line = entities.add_line_2d(p1, p2, sketch, index_reference=True)
+        self.constraints.add_horizontal(line, sketch=sketch)
+        self.constraints.add_distance(p1, p2, sketch, value=length)
+        return sketch
+
+    def test_groups_match_serial(self):
+        from CAD_Sketcher.solver import Solver
+        from CAD_Sketcher.utilities import solver_pool
+
+        self.entities.ensure_origin_elements(self.context)
+        sketches = [self.entities.get(self._add_sketch(i + 1)) for i in range(3)]
+
+        solver = Solver(self.context, None, all=True)
+        solver._init_slvs_data()
+        data = solver_pool.export_system(solver.solvesys)
+        groups = [solver._get_group(s) for s in sketches]
+        static_groups = (solver.group_fixed, solver.group_3d)
+
+        for g in groups:
+            chunk = solver_pool.split_system(data, g, static_groups)
+            result = solver_pool.solve_group(chunk, g, True)
+            retval = solver.solvesys.solve(group=g, reportFailed=True)
+
+            self.assertEqual(result.retval, retval)
+            self.assertEqual(result.dof, solver.solvesys.Dof)
+            for h, val in result.params:
+                self.assertAlmostEqual(val, solver.solvesys.getParam(h).val)
+
+        if not solver_pool.is_supported():
+            return
+
+        results = solver_pool.solve_groups(data, groups, static_groups, True)
+        self.assertEqual([r.group for r in results], groups)
+
+
+class TestComponentSolver(Sketch2dTestCase):
+    def setUp(self):
+        from CAD_Sketcher.utilities.preferences import get_prefs
+
+        self.prefs = get_prefs()
+        self.prefs.decompose_sketches = True
+        return super().setUp()
+
+    def tearDown(self):
+        self.prefs.decompose_sketches = False
+        return super().tearDown()
+
+    def _add_line(self, y, length):
+        entities = self.entities
+        sketch = self.sketch
+        p1 = entities.add_point_2d((0, y), sketch, fixed=True, index_reference=True)
+        p2 = entities.add_point_2d((1, y + 1), sketch, index_reference=True)
+        line = entities.add_line_2d(p1, p2, sketch, index_reference=True)
+        self.constraints.add_horizontal(line, sketch=sketch)
+        self.constraints.add_distance(p1, p2, sketch, value=length)
+        return p2, line
+
+    def test_failure_is_local(self):
+        p2, _line = self._add_line(0, 2)
+        _p4, line = self._add_line(2, 3)
+
+        # Conflicts with the horizontal constraint of the second line
+        self.constraints.add_vertical(line, sketch=self.sketch)
+
+        self.assertFalse(self.sketch.solve(self.context))
+        self.assertEqual(self.sketch.solver_state, "INCONSISTENT")
+        self.assertAlmostEqual(self.entities.get(p2).co.x, 2, places=5)
+
+    def test_settled_compares_inputs(self):
+        from CAD_Sketcher.utilities import solver_components
+
+        self._add_line(0, 2)
+
+        # Values are stored with single precision, the first solves settle them
+        self.solve()
+        self.solve()
+
+        # Pretend other inputs that failed to solve share the same hashes
+        settled = solver_components._settled
+        for key in settled:
+            settled[key] = (((), ()), (1, 0, []))
+
+        self.assertTrue(self.sketch.solve(self.context))
+        self.assertEqual(self.sketch.solver_state, "OKAY")
+
+
+class TestSolveCache(Sketch2dTestCase):
+    def test_unchanged_sketch_hits_cache(self):
+        from CAD_Sketcher.utilities.preferences import get_prefs
+        from CAD_Sketcher.utilities.solve_cache import cache
+
+        prefs = get_prefs()
+        prefs.use_solve_cache = True
+
+        entities = self.entities
+        sketch = self.sketch
+        p1 = entities.add_point_2d((0, 0), sketch, fixed=True, index_reference=True)
+        p2 = entities.add_point_2d((1, 1), sketch, index_reference=True)
+        line = entities.add_line_2d(p1, p2, sketch, index_reference=True)
+        self.constraints.add_horizontal(line, sketch=sketch)
+        self.constraints.add_distance(p1, p2, sketch, value=2)
+
+        # Values are stored with single precision, the first solves settle them
+        self.solve()
+        self.solve()
+        hits = cache.hits
+        self.solve()
+        prefs.use_solve_cache = False
+
+        self.assertEqual(cache.hits, hits + 1)
+        self.assertEqual(sketch.solver_state, "OKAY")
+        self.assertAlmostEqual(entities.get(p2).co.x, 2, places=5)
+
+    def test_sketch_depends_on_solved_3d(self):
+        from CAD_Sketcher.solver import Solver
+        from CAD_Sketcher.utilities.preferences import get_prefs
+
+        prefs = get_prefs()
+        prefs.use_solve_cache = True
+
+        entities = self.entities
+        constraints = self.constraints
+        sketch = self.sketch
+        origin = entities.add_point_3d((0, 0, 0), fixed=True)
+        point_3d = entities.add_point_3d((3, 0, 0))
+        constraints.add_distance(origin, point_3d, value=2)
+        point_2d = entities.add_point_2d((1, 0), sketch)
+        constraints.add_distance(point_3d, point_2d, sketch, value=1)
+
+        # Cache a sketch result that was solved against the unsolved 3D point
+        Solver(self.context, sketch).solve(report=False)
+
+        # The 3D group now hits the cache and moves the 3D point
+        for _ in range(2):
+            point_3d.location = (3, 0, 0)
+            point_2d.co = (1, 0)
+            Solver(self.context, None, all=True).solve(report=False)
+        prefs.use_solve_cache = False
+
+        self.assertAlmostEqual(point_3d.location.x, 2, places=4)
+        distance = (point_2d.location - point_3d.location).length
+        self.assertAlmostEqual(distance, 1, places=4)
+
+
+class TestSolveScheduler(Sketch2dTestCase):
+    def test_coalesce(self):
+        from CAD_Sketcher.utilities import solver
+
+        entities = self.entities
+        points = [
+            entities.add_point_2d((i, 0), self.sketch, index_reference=True)
+            for i in range(5)
+        ]
+
+        with solver.defer_solves(self.context):
+            for i in points:
+                entities.get(i).fixed = True
+
+            self.assertTrue(solver.has_pending())
+            self.assertEqual(
+                solver._pending[self.context.scene.as_pointer()],
+                {self.sketch.slvs_index},
+            )
+
+            # Pending solves survive renaming the scene
+            self.context.scene.name += "_renamed"
+            self.sketch.dof = 6
+
+        self.assertFalse(solver.has_pending())
+        self.assertEqual(self.sketch.dof, 0)
+
+
+class TestAsyncTweak(Sketch2dTestCase):
+    def test_latest_position_wins(self):
+        import time
+
+        from mathutils import Vector
+        from CAD_Sketcher.utilities.async_solver import AsyncTweak
+
+        entities = self.entities
+        p1 = entities.add_point_2d((0, 0), self.sketch)
+        p2 = entities.add_point_2d((10, 0), self.sketch)
+        p1.fixed = True
+        self.constraints.add_distance(p1, p2, self.sketch).value = 10
+
+        tweak = AsyncTweak(self.context, p2, self.sketch)
+        for y in range(1, 4):
+            tweak.request(Vector((10, y, 0)))
+
+        # Starting the worker process takes a moment
+        deadline = time.time() + 30
+        while not tweak.update() and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertTrue(tweak.finish())
+        self.assertAlmostEqual(p2.co.length, 10, places=4)
+        self.assertGreater(p2.co.y, 0)
+
+
+class TestBulkConstraints(Sketch2dTestCase):
+    def test_add_many(self):
+        import numpy as np
+        from CAD_Sketcher.utilities import solver
+
+        entities = self.entities
+        constraints = self.constraints
+        sketch = self.sketch
+
+        coords = [(0, 0), (1, 0.5), (2, -0.5), (3, 1)]
+        points = entities.add_points_2d(
+            coords, sketch, fixed=[True, False, False, False]
+        )
+        lines = entities.add_lines_2d(
+            np.column_stack((points[:-1], points[1:])), sketch
+        )
+
+        with solver.defer_solves(self.context):
+            constraints.add_many("HORIZONTAL", lines, sketch)
+            constraints.add_many(
+                "DISTANCE", np.column_stack((points[:-1], points[1:])), sketch, values=2
+            )
+            self.assertTrue(solver.has_pending())
+        self.assertFalse(solver.has_pending())
+
+        for i, index in enumerate(points):
+            point = entities.get(int(index))
+            self.assertAlmostEqual(point.co.y, 0, places=5)
+            self.assertAlmostEqual(abs(point.co.x), 2 * i, places=5)
+
+    def test_add_many_coincident_points(self):
+        entities = self.entities
+        constraints = self.constraints
+        sketch = self.sketch
+
+        points = entities.add_points_2d([(0, 0), (1, 0), (1, 1), (0, 1)], sketch)
+        lines = entities.add_lines_2d([points[:2], points[2:]], sketch)
+        point_count = len(entities.points2D)
+
+        # Point to point rows merge the points, the shifted last point still
+        # gets its constraint
+        indices = constraints.add_many(
+            "COINCIDENT", [[points[1], points[2]], [points[3], lines[0]]], sketch
+        )
+
+        self.assertEqual(len(entities.points2D), point_count - 1)
+        line1, line2 = (entities.get(int(i)) for i in lines)
+        self.assertEqual(line1.p2, line2.p1)
+
+        self.assertEqual(len(indices), 1)
+        coincident = constraints.coincident[int(indices[0])]
+        self.assertEqual(coincident.entity1, line2.p2)
+        self.assertEqual(coincident.entity2, line1)
+
+    def test_add_many_matches_add(self):
+        entities = self.entities
+        constraints = self.constraints
+        sketch = self.sketch
+
+        p0 = entities.add_point_2d((0, 0), sketch, index_reference=True)
+        p1 = entities.add_point_2d((3, 1), sketch, index_reference=True)
+        p2 = entities.add_point_2d((-1, 2), sketch, index_reference=True)
+        line1 = entities.add_line_2d(p0, p1, sketch, index_reference=True)
+        line2 = entities.add_line_2d(p0, p2, sketch, index_reference=True)
+        circle = entities.add_circle(
+            sketch.wp.nm, p0, 1.5, sketch, index_reference=True
+        )
+
+        cases = (
+            ("DISTANCE", constraints.add_distance, (p2, line1), -2.0),
+            ("DISTANCE", constraints.add_distance, (p0, p1), None),
+            ("ANGLE", constraints.add_angle, (line1, line2), None),
+            ("DIAMETER", constraints.add_diameter, (circle,), 4.0),
+        )
+        for type, add, args, value in cases:
+            settings = {} if value is None else {"value": value}
+            single = add(*args, sketch=sketch, init=True, **settings)
+            props = ("value", "setting", "flip", "align", "draw_offset")
+            expected = {p: getattr(single, p) for p in props if hasattr(single, p)}
+
+            index = constraints.add_many(
+                type, [args], sketch, values=None if value is None else [value]
+            )[0]
+            bulk = constraints.get_list(type)[int(index)]
+
+            for prop, val in expected.items():
+                with self.subTest(type=type, prop=prop):
+                    self.assertEqual(getattr(bulk, prop), val)
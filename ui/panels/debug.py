@@ -3,8 +3,88 @@ from bpy.types import Context
 from .. import constants
 from .. import declarations
 from .. import preferences
+from ... import global_data
+from ...utilities import solver_stats, solve_cache
 from . import VIEW3D_PT_sketcher_base
 
+# Number of solver runs to display
+STATS_DISPLAY_COUNT = 5
+
+
+def _format_time(seconds: float) -> str:
+    return "{:.2f}ms".format(seconds * 1000)
+
+
+def draw_solver_stats(layout):
+    box = layout.box()
+    row = box.row(align=True)
+    row.label(text="Solver Statistics")
+    row.operator(declarations.Operators.ExportSolverStats, text="", icon="EXPORT")
+    row.operator(declarations.Operators.ClearSolverStats, text="", icon="TRASH")
+
+    cache = solve_cache.cache
+    box.label(
+        text="Cache: {} hits, {} misses, {} entries".format(
+            cache.hits, cache.misses, len(cache)
+        )
+    )
+
+    if not solver_stats.history:
+        box.label(text="No solver runs recorded")
+        return
+
+    col = box.column(align=True)
+    col.scale_y = 0.8
+    for record in reversed(list(solver_stats.history)[-STATS_DISPLAY_COUNT:]):
+        col.label(
+            text="{}{}: {}".format(
+                record.sketch or "3D",
+                " (tweak)" if record.tweak else "",
+                _format_time(record.total_time),
+            )
+        )
+        col.label(
+            text="  E:{} P:{} C:{}".format(
+                record.entity_count, record.param_count, record.constraint_count
+            )
+        )
+        col.label(
+            text="  "
+            + " ".join(
+                "{}:{}".format(name, _format_time(t))
+                for name, t in record.phases.items()
+            )
+        )
+        for group in record.groups:
+            col.label(
+                text="  g{} {} DoF:{} Failed:{}".format(
+                    group["group"], group["result"], group["dof"], group["failed"]
+                )
+            )
+            if group.get("cached"):
+                col.label(text="    Cached")
+            components = group.get("components")
+            if components:
+                col.label(
+                    text="    Components:{} Skipped:{}".format(
+                        len(components), sum(c["skipped"] for c in components)
+                    )
+                )
+        col.separator()
+
+
+def draw_startup_timings(layout):
+    box = layout.box()
+    box.label(text="Startup")
+    col = box.column(align=True)
+    col.scale_y = 0.8
+    for name, (import_time, register_time) in global_data.startup_timings.items():
+        col.label(
+            text="{}: import {} register {}".format(
+                name, _format_time(import_time), _format_time(register_time)
+            )
+        )
+
 
 class VIEW3D_PT_sketcher_debug(VIEW3D_PT_sketcher_base):
     """Debug Menu"""
@@ -28,9 +108,16 @@ class VIEW3D_PT_sketcher_debug(VIEW3D_PT_sketcher_base):
         layout.prop(prefs, "hide_inactive_constraints")
         layout.prop(prefs, "all_entities_selectable")
         layout.prop(prefs, "force_redraw")
+        layout.prop(prefs, "use_async_tweak")
         layout.prop(context.scene.sketcher, "selectable_constraints")
         layout.prop(prefs, "use_align_view")
 
+        layout.prop(prefs, "collect_solver_stats")
+        if prefs.collect_solver_stats:
+            draw_solver_stats(layout)
+
+        draw_startup_timings(layout)
+
     @classmethod
     def poll(cls, context: Context):
         prefs = preferences.get_prefs()
@@ -1,6 +1,7 @@
 from bpy.types import Context
 
 from .. import declarations
+from ...utilities.data_handling import entities_3d
 from . import VIEW3D_PT_sketcher_base
 
 
@@ -21,9 +22,12 @@ class VIEW3D_PT_sketcher_entities(VIEW3D_PT_sketcher_base):
         col.scale_y = 0.8
 
         sketch = context.scene.sketcher.active_sketch
-        for e in context.scene.sketcher.entities.all:
-            if not e.is_active(sketch):
-                continue
+        if sketch:
+            entities = sketch.sketch_entities(context)
+        else:
+            entities = entities_3d(context)
+
+        for e in entities:
             if e.is_sketch():
                 continue
 
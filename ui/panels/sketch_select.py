@@ -80,6 +80,8 @@ class VIEW3D_PT_sketcher(VIEW3D_PT_sketcher_base):
             if sketch.convert_type != "NONE":
                 layout.prop(sketch, "fill_shape")
 
+            layout.operator(declarations.Operators.MergePoints, icon="AUTOMERGE_ON")
+
             layout.operator(
                 declarations.Operators.DeleteEntity,
                 text="Delete Sketch",
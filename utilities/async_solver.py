@@ -0,0 +1,107 @@
+"""Solve tweaks in the background while the user keeps dragging
+
+Only the most recent position is solved, positions that arrive while a solve
+is running replace each other. The solver input is exported in the main thread
+when a solve is started and solved in a worker process of solver_pool, the
+result is applied from the main thread whenever update is called, e.g. on a
+timer event of a modal operator.
+
+NOTE: py_slvs holds the GIL while solving, a thread would block blender's main
+thread for the whole solve. The worker process keeps the UI responsive.
+"""
+
+import logging
+
+from ..solver import Solver
+from . import solver_pool
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTweak:
+    """Tweak an entity with the solver running in the background"""
+
+    def __init__(self, context, entity, sketch):
+        self.context = context
+        self.entity = entity
+        self.sketch = sketch
+
+        self._future = None
+        self._solver = None
+        self._pending_pos = None
+        self.last_pos = None
+
+    def _solver_for(self, pos):
+        solver = Solver(self.context, self.sketch)
+        solver.tweak(self.entity, pos)
+        return solver
+
+    def request(self, pos):
+        """Request a solve for the given position, replaces older requests that
+        haven't been started yet
+        """
+        self._pending_pos = pos
+        self.last_pos = pos
+        self._submit()
+
+    def _submit(self):
+        if self._future is not None or self._pending_pos is None:
+            return
+
+        pos, self._pending_pos = self._pending_pos, None
+        solver = self._solver_for(pos)
+        data, group = solver.export_group(report=False)
+
+        try:
+            future = solver_pool.submit(solver_pool.solve_group, data, group, False)
+        except Exception as e:
+            # The last position is still solved when the tweak finishes
+            logger.warning("Couldn't start background solve: {}".format(e))
+            return
+
+        self._solver = solver
+        self._future = future
+
+    def update(self) -> bool:
+        """Apply a finished solve and start the next one
+
+        Returns:
+            bool: True if a result was applied
+        """
+        future = self._future
+        if future is None or not future.done():
+            return False
+
+        self._future = None
+        solver, self._solver = self._solver, None
+
+        applied = False
+        try:
+            result = future.result()
+        except Exception as e:
+            # A broken pool is started again with the next solve
+            solver_pool.shutdown()
+            logger.warning("Background solve failed: {}".format(e))
+        else:
+            # Keep the last converged state if this one failed
+            if result.retval in (0, 5):
+                solver.apply_group_result(result)
+                applied = True
+
+        self._submit()
+        return applied
+
+    def finish(self):
+        """Stop background solving and solve the last position synchronously"""
+        self.cancel()
+        if self.last_pos is None:
+            return True
+        return self._solver_for(self.last_pos).solve(report=False)
+
+    def cancel(self):
+        # The pool is shared, a solve that already runs finishes and is ignored
+        if self._future is not None:
+            self._future.cancel()
+        self._pending_pos = None
+        self._future = None
+        self._solver = None
@@ -2,9 +2,12 @@ import re
 from typing import Any, Sequence, Union
 
 import bpy
+import numpy as np
 from bpy.types import Context, Object
 from mathutils import Vector
 
+from . import transaction
+
 
 class bpyEnum:
     """
@@ -120,6 +123,7 @@ def add_new_empty(context: Context, location: Vector, name="") -> Object:
 
 def setprop(data, key, value):
     """Set an id prop without triggering it's update mehtod"""
+    transaction.record_write(data, key)
     prop = data.rna_type.properties[key]
 
     # Handle Enums which have to be set by the item's id rather than identifier
@@ -127,3 +131,18 @@ def setprop(data, key, value):
         value = prop.enum_items[value].value
 
     data[key] = value
+
+
+def foreach_set_tail(collection, name: str, values, start: int):
+    """Write values to the items of a collection starting at a given index,
+    foreach_set only works on whole collections so existing values are read first
+    """
+    values = np.ascontiguousarray(values)
+    count = len(collection) - start
+    item_size = values.size // count
+
+    data = np.empty(len(collection) * item_size, dtype=values.dtype)
+    if start:
+        collection.foreach_get(name, data)
+    data[start * item_size :] = values.ravel()
+    collection.foreach_set(name, data)
@@ -0,0 +1,132 @@
+"""View frustum culling of entities
+
+Entities store an axis aligned bounding box in world space whenever their
+geometry changed, sketches combine the boxes of their entities. Sketches
+outside of the view are skipped as a whole, the remaining entities are tested
+individually.
+"""
+
+import logging
+from typing import Set
+
+import numpy as np
+from bpy.types import Context
+
+from .. import global_data
+from .membership import get_membership
+
+logger = logging.getLogger(__name__)
+
+
+def entity_bounds(entity):
+    """Returns the world space bounding box of an entity as an array of
+    shape (2, 3) or None if the entity can't be culled
+    """
+    if entity.is_point():
+        coords = [entity.location]
+    elif entity.is_line():
+        coords = [entity.p1.location, entity.p2.location]
+    elif entity.is_curve():
+        # Bounds of the whole circle are good enough for arcs
+        center = entity.wp.matrix_basis @ entity.ct.co.to_3d()
+        radius = entity.radius
+        coords = [center - radius * np.ones(3), center + radius * np.ones(3)]
+    else:
+        return None
+
+    coords = np.array(coords, dtype=np.float64)
+    return np.stack((coords.min(axis=0), coords.max(axis=0)))
+
+
+def update_bounds(entity):
+    """Store the bounds of an entity after its geometry changed"""
+    index = entity.slvs_index
+    bounds = entity_bounds(entity)
+    if bounds is None:
+        global_data.bounds.pop(index, None)
+    else:
+        global_data.bounds[index] = bounds
+
+    if hasattr(entity, "sketch_i"):
+        global_data.sketch_bounds.pop(entity.sketch_i, None)
+
+
+def frustum_planes(rv3d) -> np.ndarray:
+    """Returns the planes of the view frustum as an array of shape (6, 4), a
+    point is inside if it's on the positive side of all planes
+    """
+    mat = np.array(rv3d.perspective_matrix)
+    w = mat[3]
+    return np.array(
+        (w + mat[0], w - mat[0], w + mat[1], w - mat[1], w + mat[2], w - mat[2])
+    )
+
+
+def boxes_in_frustum(planes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Returns a mask of the boxes of shape (N, 2, 3) that intersect the frustum,
+    boxes that are close to the frustum's corners might be kept
+    """
+    inside = np.ones(len(boxes), dtype=bool)
+    for plane in planes:
+        # Test the corner that's furthest in the plane's direction
+        corner = np.where(plane[:3] >= 0, boxes[:, 1], boxes[:, 0])
+        inside &= corner @ plane[:3] + plane[3] >= 0
+    return inside
+
+
+def _sketch_bounds(scene, sketch_index: int):
+    bounds = global_data.sketch_bounds.get(sketch_index)
+    if bounds is not None:
+        return bounds
+
+    boxes = [
+        global_data.bounds.get(index)
+        for index in get_membership(scene).entities.get(sketch_index, ())
+    ]
+    if not boxes or any(box is None for box in boxes):
+        # Bounds aren't known yet
+        return None
+
+    boxes = np.array(boxes)
+    bounds = np.stack((boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)))
+    global_data.sketch_bounds[sketch_index] = bounds
+    return bounds
+
+
+def _cull_boxes(planes, indices, boxes) -> Set[int]:
+    if not indices:
+        return set()
+    mask = boxes_in_frustum(planes, np.array(boxes))
+    return {index for index, inside in zip(indices, mask) if not inside}
+
+
+def get_culled(context: Context) -> Set[int]:
+    """Returns the indices of entities outside of the view"""
+    rv3d = context.region_data
+    if not rv3d:
+        return set()
+
+    scene = context.scene
+    planes = frustum_planes(rv3d)
+    membership = get_membership(scene)
+
+    # Skip whole sketches first
+    sketch_indices, sketch_boxes = [], []
+    for sketch in scene.sketcher.entities.sketches:
+        bounds = _sketch_bounds(scene, sketch.slvs_index)
+        if bounds is not None:
+            sketch_indices.append(sketch.slvs_index)
+            sketch_boxes.append(bounds)
+
+    culled = set()
+    for sketch_index in _cull_boxes(planes, sketch_indices, sketch_boxes):
+        culled.update(membership.entities.get(sketch_index, ()))
+
+    indices, boxes = [], []
+    for index, bounds in global_data.bounds.items():
+        if index in culled:
+            continue
+        indices.append(index)
+        boxes.append(bounds)
+    culled.update(_cull_boxes(planes, indices, boxes))
+    return culled
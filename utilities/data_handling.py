@@ -4,6 +4,7 @@ from typing import Generator, Deque, List, Sequence
 from bpy.types import Scene, Context
 
 from ..model.types import SlvsGenericEntity, SlvsSketch, GenericConstraint
+from .membership import get_membership
 
 
 def to_list(value):
@@ -94,14 +95,8 @@ def is_entity_referenced(entity: SlvsGenericEntity, context: Context) -> bool:
 
 
 def get_sketch_deps_indicies(sketch: SlvsSketch, context: Context):
-    deps = deque()
-    for entity in get_scene_entities(context.scene):
-        if not hasattr(entity, "sketch_i"):
-            continue
-        if sketch.slvs_index != entity.sketch.slvs_index:
-            continue
-        deps.append(entity.slvs_index)
-    return deps
+    membership = get_membership(context.scene)
+    return deque(membership.entities.get(sketch.slvs_index, ()))
 
 
 def get_constraint_local_indices(
@@ -1,12 +1,24 @@
+import math
 from collections import deque
 from math import sin, cos
 from typing import List
 
+import numpy as np
+from bpy_extras.view3d_utils import location_3d_to_region_2d
 from mathutils import Vector, Matrix
 
 from .. import global_data
 from .constants import FULL_TURN
 
+# Segments of a full turn for each level of detail of curves
+CURVE_LODS = (8, 16, 32, 64, 128, 256)
+DEFAULT_CURVE_LOD = 64
+
+# Maximum distance in pixels between a curve and its tessellation
+CURVE_LOD_TOLERANCE = 0.5
+
+_unit_circles = {}
+
 
 # def draw_circle_2d(cx: float, cy: float, r: float, num_segments: int):
 #     """NOTE: Not used?"""
@@ -126,3 +138,98 @@ def coords_arc_2d(
         else:
             coords.append((co_x, co_y))
     return coords
+
+
+def unit_circle(segments: int) -> np.ndarray:
+    """Returns the cached coordinates of a unit circle with the given number
+    of segments, the first point isn't repeated at the end
+    """
+    coords = _unit_circles.get(segments)
+    if coords is None:
+        angles = np.arange(segments) * (FULL_TURN / segments)
+        coords = _unit_circles[segments] = np.column_stack(
+            (np.cos(angles), np.sin(angles))
+        )
+    return coords
+
+
+def coords_arc_lod(
+    radius: float, segments: int, angle: float = FULL_TURN, offset: float = 0.0
+) -> np.ndarray:
+    """Tessellate an arc around the origin from the unit circle template
+
+    Arguments:
+        segments: Number of segments of a full turn, the arc gets as many
+            as it spans with a shorter last segment to end exactly at angle.
+        angle: The arc's angle, starting at offset.
+        offset: The angle of the arc's start point.
+
+    Returns:
+        numpy.ndarray: Coordinates of shape (N, 2) along the arc.
+    """
+    count = min(max(math.ceil(segments * angle / FULL_TURN - 1e-9), 1), segments)
+
+    coords = np.empty((count + 1, 2))
+    coords[:count] = unit_circle(segments)[:count]
+    coords[count] = (cos(angle), sin(angle))
+
+    c, s = cos(offset), sin(offset)
+    rotation = np.array(((c, s), (-s, c)))
+    return radius * coords @ rotation
+
+
+def coords_to_3d(matrix: Matrix, coords) -> np.ndarray:
+    """Transform 2d coordinates by a 4x4 matrix, e.g. onto a workplane"""
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    mat = np.array(matrix)
+    return (coords @ mat[:3, :2].T + mat[:3, 3]).astype(np.float32)
+
+
+def curve_lod(context, center: Vector, radius: float) -> int:
+    """Returns the number of segments per full turn so a circle with its
+    projected radius deviates less than CURVE_LOD_TOLERANCE pixels
+    """
+    region, rv3d = context.region, context.region_data
+    if not region or not rv3d or not radius:
+        return DEFAULT_CURVE_LOD
+
+    right = rv3d.view_rotation @ Vector((radius, 0.0, 0.0))
+    a = location_3d_to_region_2d(region, rv3d, center)
+    b = location_3d_to_region_2d(region, rv3d, center + right)
+    if a is None or b is None:
+        return DEFAULT_CURVE_LOD
+
+    # Deviation of a chord is about radius * (pi / n)^2 / 2
+    needed = math.pi * math.sqrt((b - a).length / (2 * CURVE_LOD_TOLERANCE))
+    for segments in CURVE_LODS:
+        if segments >= needed:
+            return segments
+    return CURVE_LODS[-1]
+
+
+def curve_lod_view_changed(context) -> bool:
+    """Check if the view changed since the curve lods were last updated"""
+    region, rv3d = context.region, context.region_data
+    view = None
+    if region and rv3d:
+        view = (rv3d.perspective_matrix.copy(), region.width, region.height)
+
+    if view == global_data.curve_lod_view:
+        return False
+    global_data.curve_lod_view = view
+    return True
+
+
+def update_curve_lod(entity, context):
+    """Tag a curve entity for update when its level of detail changed"""
+    center = entity.wp.matrix_basis @ entity.ct.co.to_3d()
+    segments = curve_lod(context, center, entity.radius)
+
+    index = entity.slvs_index
+    if global_data.curve_lods.get(index) != segments:
+        global_data.curve_lods[index] = segments
+        entity.is_dirty = True
+
+
+def get_curve_lod(entity) -> int:
+    return global_data.curve_lods.get(entity.slvs_index, DEFAULT_CURVE_LOD)
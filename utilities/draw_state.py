@@ -0,0 +1,234 @@
+"""Per frame evaluation of how entities get drawn
+
+Whether an entity is visible, selectable or active and which color it's drawn
+with depends on its sketch, the active sketch and the addon preferences.
+Instead of resolving these for every entity in every draw call, all entities
+are evaluated in one sweep at the start of a frame and the draw and selection
+passes look up the result.
+"""
+
+import logging
+
+import numpy as np
+from bpy.types import Context
+
+from .. import global_data
+from .index import assemble_index, breakdown_index
+from .preferences import get_prefs
+
+logger = logging.getLogger(__name__)
+
+# Order of the entity colors, see DrawState._color_codes
+ENTITY_COLORS = (
+    "default",
+    "fixed",
+    "highlight",
+    "selected",
+    "selected_highlight",
+    "inactive",
+    "inactive_selected",
+)
+
+
+def _get_array(collection, prop, dtype):
+    values = np.empty(len(collection), dtype=dtype)
+    collection.foreach_get(prop, values)
+    return values
+
+
+def _theme_colors(theme):
+    return {
+        prop.identifier: tuple(getattr(theme, prop.identifier))
+        for prop in theme.bl_rna.properties
+        if prop.type == "FLOAT"
+    }
+
+
+def _state_key(context: Context):
+    from ..model.group_entities import _entity_collections
+
+    sketcher = context.scene.sketcher
+    return (
+        context.scene.as_pointer(),
+        sketcher.active_sketch_i,
+        tuple(len(getattr(sketcher.entities, name)) for name in _entity_collections),
+    )
+
+
+class DrawState:
+    """Visibility, selectability, active state and color of all entities"""
+
+    def __init__(self, context: Context):
+        from ..model.group_entities import _entity_types, _entity_collections
+
+        self.key = _state_key(context)
+        self.active_sketch_i = context.scene.sketcher.active_sketch_i
+
+        # Read preferences only once
+        prefs = get_prefs()
+        experimental = prefs.show_debug_settings
+        all_selectable = experimental and prefs.all_entities_selectable
+        self.hide_inactive_constraints = (
+            not experimental or prefs.hide_inactive_constraints
+        )
+
+        entity_colors = _theme_colors(prefs.theme_settings.entity)
+        self.palette = tuple(entity_colors[name] for name in ENTITY_COLORS)
+        self.constraint_colors = _theme_colors(prefs.theme_settings.constraint)
+
+        # Everything that affects the text of dimension labels
+        unit_settings = context.scene.unit_settings
+        self.text_size = prefs.text_size
+        self.label_settings = (
+            unit_settings.system,
+            unit_settings.length_unit,
+            unit_settings.use_separate,
+            unit_settings.scale_length,
+            unit_settings.system_rotation,
+            prefs.decimal_precision,
+            prefs.imperial_precision,
+            prefs.angle_precision,
+            prefs.text_size,
+            context.preferences.system.ui_scale,
+        )
+
+        sketcher = context.scene.sketcher
+        entities = sketcher.entities
+        show_origin = sketcher.show_origin
+
+        # The active sketch is always visible
+        active_sketch_i = sketcher.active_sketch_i
+        sketches = entities.sketches
+        sketch_visible = _get_array(sketches, "visible", bool)
+        sketch_wp = _get_array(sketches, "wp_i", np.int32)
+        active_wp = -1
+        if active_sketch_i != -1:
+            _, active_local = breakdown_index(active_sketch_i)
+            sketch_visible[active_local] = True
+            active_wp = sketch_wp[active_local]
+
+        selected = np.array(global_data.selected, dtype=np.int32)
+        highlighted = np.array(
+            [global_data.hover]
+            + [e.slvs_index for e in global_data.highlight_entities if e],
+            dtype=np.int32,
+        )
+
+        self._visible = []
+        self._selectable = []
+        self._active = []
+        self._color = []
+        for type_index, cls in enumerate(_entity_types):
+            collection = getattr(entities, _entity_collections[type_index])
+            count = len(collection)
+            indices = assemble_index(type_index, np.arange(count, dtype=np.int32))
+
+            visible = _get_array(collection, "visible", bool)
+            if "sketch_i" in cls.bl_rna.properties:
+                sketch_i = _get_array(collection, "sketch_i", np.int32)
+                _, sketch_local = breakdown_index(np.maximum(sketch_i, 0))
+                valid = (sketch_i != -1) & (sketch_local < len(sketches))
+                sketch_local = np.where(valid, sketch_local, 0)
+
+                if len(sketches):
+                    visible &= valid & sketch_visible[sketch_local]
+                    shares_wp = valid & (sketch_wp[sketch_local] == active_wp)
+                else:
+                    visible[:] = False
+                    shares_wp = np.zeros(count, dtype=bool)
+
+                active = sketch_i == active_sketch_i
+                if active_sketch_i != -1:
+                    # Allow to select entities that share the active sketch's wp
+                    selectable = shares_wp
+                else:
+                    selectable = active
+            else:
+                if cls.is_sketch():
+                    visible |= indices == active_sketch_i
+                active = np.full(count, active_sketch_i == -1)
+                selectable = active
+
+            origin = _get_array(collection, "origin", bool)
+            visible = np.where(origin, show_origin, visible)
+            selectable = visible & (selectable | all_selectable)
+
+            fixed = _get_array(collection, "fixed", bool) & ~origin
+            self._visible.append(visible)
+            self._selectable.append(selectable)
+            self._active.append(active)
+            self._color.append(
+                self._color_codes(
+                    active,
+                    np.isin(indices, selected),
+                    np.isin(indices, highlighted),
+                    fixed,
+                )
+            )
+
+    @staticmethod
+    def _color_codes(active, selected, highlight, fixed):
+        """Returns the index into the palette for every entity"""
+        conditions = (
+            ~active & highlight,
+            ~active & selected,
+            ~active,
+            selected & highlight,
+            selected,
+            highlight,
+            fixed,
+        )
+        choices = (
+            ENTITY_COLORS.index(name)
+            for name in (
+                "highlight",
+                "inactive_selected",
+                "inactive",
+                "selected_highlight",
+                "selected",
+                "highlight",
+                "fixed",
+            )
+        )
+        return np.select(conditions, tuple(choices), ENTITY_COLORS.index("default"))
+
+    def _lookup(self, values, entity) -> bool:
+        type_index, local_index = breakdown_index(entity.slvs_index)
+        return bool(values[type_index][local_index])
+
+    def is_visible(self, entity) -> bool:
+        return self._lookup(self._visible, entity)
+
+    def is_selectable(self, entity) -> bool:
+        return self._lookup(self._selectable, entity)
+
+    def is_active(self, entity) -> bool:
+        return self._lookup(self._active, entity)
+
+    def color(self, entity):
+        type_index, local_index = breakdown_index(entity.slvs_index)
+        return self.palette[self._color[type_index][local_index]]
+
+    def is_constraint_active(self, constraint) -> bool:
+        """Same as GenericConstraint.is_active with the active sketch"""
+        if not hasattr(constraint, "sketch_i"):
+            return self.active_sketch_i == -1
+        if not self.hide_inactive_constraints:
+            return True
+        return constraint.sketch_i == self.active_sketch_i
+
+
+def update_draw_state(context: Context) -> DrawState:
+    """Evaluate all entities for a new frame"""
+    state = global_data.draw_state = DrawState(context)
+    return state
+
+
+def get_draw_state(context: Context) -> DrawState:
+    """Returns the state of the current frame, adding or removing entities or
+    changing the active sketch causes a new evaluation
+    """
+    state = global_data.draw_state
+    if state is None or state.key != _state_key(context):
+        state = update_draw_state(context)
+    return state
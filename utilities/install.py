@@ -1,6 +1,7 @@
 import site
 import sys
 import importlib
+import importlib.util
 import subprocess
 from importlib import reload
 from types import ModuleType
@@ -12,7 +13,7 @@ from .. import global_data
 logger = logging.getLogger(__name__)
 
 
-def check_module(package: str, raise_exception: bool = False) -> ModuleType:
+def _ensure_user_site():
     """
     Note: Blender might be installed in a directory that needs admin rights
     and thus defaulting to a user installation. That path however might not
@@ -22,6 +23,17 @@ def check_module(package: str, raise_exception: bool = False) -> ModuleType:
     p = site.USER_SITE
     if p not in sys.path:
         sys.path.append(p)
+
+
+def has_module(package: str) -> bool:
+    """Check if a package is installed without importing it"""
+
+    _ensure_user_site()
+    return importlib.util.find_spec(package) is not None
+
+
+def check_module(package: str, raise_exception: bool = False) -> ModuleType:
+    _ensure_user_site()
     try:
         module = importlib.import_module(package)
         return module
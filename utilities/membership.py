@@ -0,0 +1,88 @@
+"""Membership of entities and constraints in sketches
+
+Finding the elements of a sketch used to mean iterating over the whole scene
+and dereferencing every element's sketch pointer. The membership of all
+sketches is instead collected at once with foreach_get and reused until
+invalidate_membership() is called. This has to happen whenever elements get
+added, removed, re-indexed or their sketch pointer is written.
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+from bpy.types import Scene
+
+from .. import global_data
+from .index import assemble_index
+
+logger = logging.getLogger(__name__)
+
+
+def _group_by(mapping: Dict[int, list], keys, values):
+    """Append values to the lists in mapping keyed by the value's sketch index"""
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    unique, starts = np.unique(keys, return_index=True)
+    for key, group in zip(unique.tolist(), np.split(values, starts[1:])):
+        if key == -1:
+            continue
+        mapping.setdefault(key, []).extend(group.tolist())
+
+
+class SketchMembership:
+    """Indices of the entities and constraints that belong to each sketch
+
+    Exposes:
+        entities -> Global entity indices per sketch index, in the order of
+            SlvsEntities.all
+        constraints -> Tuples of constraint type and local index per sketch index
+    """
+
+    def __init__(self, scene: Scene):
+        from ..model.group_entities import _entity_types, _entity_collections
+        from ..model.group_constraints import SlvsConstraints
+
+        self.scene = scene.as_pointer()
+        self.entities: Dict[int, List[int]] = {}
+        self.constraints: Dict[int, List[Tuple[str, int]]] = {}
+
+        sketcher = scene.sketcher
+        for type_index, cls in enumerate(_entity_types):
+            collection = getattr(sketcher.entities, _entity_collections[type_index])
+            count = len(collection)
+            if not count or "sketch_i" not in cls.bl_rna.properties:
+                continue
+
+            sketch_i = np.empty(count, dtype=np.int32)
+            collection.foreach_get("sketch_i", sketch_i)
+            indices = assemble_index(type_index, np.arange(count, dtype=np.int32))
+            _group_by(self.entities, sketch_i, indices)
+
+        for cls in SlvsConstraints._constraints:
+            collection = sketcher.constraints.get_list(cls.type)
+            count = len(collection)
+            if not count or "sketch_i" not in cls.bl_rna.properties:
+                continue
+
+            sketch_i = np.empty(count, dtype=np.int32)
+            collection.foreach_get("sketch_i", sketch_i)
+            local = np.empty(count, dtype=object)
+            local[:] = [(cls.type, i) for i in range(count)]
+            _group_by(self.constraints, sketch_i, local)
+
+
+def get_membership(scene: Scene) -> SketchMembership:
+    """Returns the sketch membership of a scene, collects it again if it was
+    invalidated or belongs to another scene
+    """
+    membership = global_data.sketch_membership
+    if membership is None or membership.scene != scene.as_pointer():
+        logger.debug("Collect sketch membership of {}".format(scene.name))
+        membership = global_data.sketch_membership = SketchMembership(scene)
+    return membership
+
+
+def invalidate_membership(*_args):
+    """Forget the collected membership, also used as an undo and load handler"""
+    global_data.sketch_membership = None
@@ -0,0 +1,302 @@
+"""Merge coincident points of a sketch
+
+Pasted, duplicated or generated geometry often ends up with separate points at
+the same location. Merging them connects the segments the same way as the
+coincident tool does for a single pair of points, but for a whole sketch at
+once: pointers are rewritten in bulk and the duplicates are removed afterwards.
+Explicit pairs of points, e.g. from bulk coincident constraints, are merged
+the same way.
+"""
+
+import logging
+from collections import namedtuple
+from itertools import combinations
+
+import numpy as np
+from mathutils.kdtree import KDTree
+
+from ..model.group_entities import _entity_collections
+from ..model.utilities import iter_pointer_collections, remap_pointers
+from .index import assemble_index
+
+logger = logging.getLogger(__name__)
+
+# Default distance below which points are considered coincident
+MERGE_TOLERANCE = 1e-4
+
+MergeResult = namedtuple("MergeResult", ("points", "constraints"))
+
+# Point pointers of segments that must not end up on the same point
+_SEGMENT_POINTS = {
+    "lines2D": ("p1_i", "p2_i"),
+    "lines3D": ("p1_i", "p2_i"),
+    "arcs": ("ct_i", "p1_i", "p2_i"),
+}
+
+
+def find_duplicates(coords, fixed, tolerance: float = MERGE_TOLERANCE) -> np.ndarray:
+    """Find points that lie within tolerance of another point
+
+    Arguments:
+        coords: Array of shape (N, 2) with the point coordinates.
+        fixed: Array of N booleans, fixed points are never merged into others.
+        tolerance: Maximum distance of merged points.
+
+    Returns:
+        numpy.ndarray: Index of the point each point is merged into, points that
+        are kept map to themselves.
+    """
+    count = len(coords)
+    target = np.arange(count)
+    if not count:
+        return target
+
+    tree = KDTree(count)
+    for i, (x, y) in enumerate(coords):
+        tree.insert((x, y, 0.0), i)
+    tree.balance()
+
+    # Prefer fixed points as targets, otherwise the one with the lowest index
+    for i in np.lexsort((target, ~np.asarray(fixed, dtype=bool))):
+        if target[i] != i:
+            continue
+
+        x, y = coords[i]
+        for _co, j, _dist in tree.find_range((x, y, 0.0), tolerance):
+            if j == i or target[j] != j or fixed[j]:
+                continue
+            target[j] = i
+    return target
+
+
+def _merge_targets(pairs, fixed) -> np.ndarray:
+    """Join the points of all pairs into groups that are merged into one point
+
+    Arguments:
+        pairs: Array of shape (N, 2) with local indices of points.
+        fixed: Array with a boolean for every point of the type, fixed points
+            are never merged into others.
+
+    Returns:
+        numpy.ndarray: Index of the point each point is merged into.
+    """
+    target = np.arange(len(fixed))
+
+    def find(i):
+        while target[i] != i:
+            target[i] = target[target[i]]
+            i = target[i]
+        return i
+
+    for a, b in pairs:
+        a, b = find(a), find(b)
+        if a == b:
+            continue
+        if fixed[a] and fixed[b]:
+            raise ValueError("Cannot merge the fixed points {} and {}".format(a, b))
+
+        # Prefer fixed points as targets, otherwise the one with the lowest index
+        if fixed[b] or (not fixed[a] and b < a):
+            a, b = b, a
+        target[b] = a
+
+    for i in np.unique(pairs):
+        target[i] = find(i)
+    return target
+
+
+def _keep_segments(scene, type_index: int, target) -> int:
+    """Undo merges that would collapse a segment into a single point, expects
+    every point to be merged directly into a point that is kept
+
+    Returns:
+        int: Number of points that are no longer merged.
+    """
+    entities = scene.sketcher.entities
+    kept = 0
+    for name, props in _SEGMENT_POINTS.items():
+        collection = getattr(entities, name)
+        count = len(collection)
+        if not count:
+            continue
+
+        pointers = np.empty((len(props), count), dtype=np.int32)
+        for row, prop in zip(pointers, props):
+            collection.foreach_get(prop, row)
+
+        for i, j in combinations(range(len(props)), 2):
+            a, b = pointers[i], pointers[j]
+            affected = ((a >> 20) == type_index) & ((b >> 20) == type_index) & (a != b)
+            a, b = a[affected] & 0xFFFFF, b[affected] & 0xFFFFF
+            collapsed = target[a] == target[b]
+
+            # Keep the point that isn't the target of the merge
+            a, b = a[collapsed], b[collapsed]
+            unmerge = np.where(target[a] != a, a, b)
+            kept += int(np.count_nonzero(target[unmerge] != unmerge))
+            target[unmerge] = unmerge
+    return kept
+
+
+def _remove_items(collection, indices):
+    for i in sorted(indices, reverse=True):
+        collection.remove(int(i))
+
+
+def _remove_degenerate_constraints(scene, points, sketch_index=None) -> int:
+    """Remove constraints that reference one of the given points twice
+
+    Arguments:
+        points: Global indices of the points that others were merged into.
+        sketch_index: Only remove constraints of this sketch if given.
+    """
+    removed = 0
+    for collection, props in iter_pointer_collections(scene):
+        # Only constraints have entity pointers
+        if "entity2_i" not in props or not len(collection):
+            continue
+        if sketch_index is not None and "sketch_i" not in props:
+            continue
+
+        count = len(collection)
+        e1 = np.empty(count, dtype=np.int32)
+        e2 = np.empty(count, dtype=np.int32)
+        collection.foreach_get("entity1_i", e1)
+        collection.foreach_get("entity2_i", e2)
+
+        degenerate = (e1 == e2) & np.isin(e1, points)
+        if sketch_index is not None:
+            sketch_i = np.empty(count, dtype=np.int32)
+            collection.foreach_get("sketch_i", sketch_i)
+            degenerate &= sketch_i == sketch_index
+
+        degenerate = np.flatnonzero(degenerate)
+        _remove_items(collection, degenerate)
+        removed += len(degenerate)
+    return removed
+
+
+def _apply_merge(
+    scene, type_index: int, target, sketch_index=None, indices=None
+) -> MergeResult:
+    """Merge the points of one type into their targets and remove them
+
+    Arguments:
+        type_index: Type index of the merged points.
+        target: Local index of the point each point of the type is merged into,
+            points that are kept map to themselves.
+        sketch_index: Only clean up constraints of this sketch if given.
+        indices: Optional array of global indices that is remapped in place.
+    """
+    points = getattr(scene.sketcher.entities, _entity_collections[type_index])
+    merged = np.flatnonzero(target != np.arange(len(target)))
+    if not len(merged):
+        return MergeResult(0, 0)
+
+    # New local index of every point after the duplicates are removed
+    keep = np.ones(len(target), dtype=bool)
+    keep[merged] = False
+    new_local = np.cumsum(keep) - 1
+    new_local[merged] = new_local[target[merged]]
+
+    mapping = assemble_index(type_index, new_local)
+    remap_pointers(scene, type_index, mapping)
+    if indices is not None:
+        affected = (indices >> 20) == type_index
+        indices[affected] = mapping[indices[affected] & 0xFFFFF]
+    removed_constraints = _remove_degenerate_constraints(
+        scene, np.unique(mapping[merged]), sketch_index
+    )
+
+    _remove_items(points, merged)
+    slvs_indices = assemble_index(type_index, np.arange(len(points), dtype=np.int32))
+    points.foreach_set("slvs_index", slvs_indices)
+
+    scene.sketcher.purge_stale_data()
+    return MergeResult(len(merged), removed_constraints)
+
+
+def merge_point_pairs(scene, pairs, sketch_index=None, indices=None) -> MergeResult:
+    """Merge each pair of points into one point like the coincident tool does
+
+    Arguments:
+        pairs: Array of shape (N, 2) with the global indices of two points of
+            the same type.
+        sketch_index: Only clean up constraints of this sketch if given.
+        indices: Optional array of global indices that is updated in place to
+            the indices of the merged points.
+
+    Returns:
+        MergeResult: Number of removed points and removed constraints that
+        referenced two merged points.
+    """
+    pairs = np.asarray(pairs, dtype=np.int32).reshape(-1, 2)
+    type_indices = pairs >> 20
+    if np.any(type_indices[:, 0] != type_indices[:, 1]):
+        raise ValueError("Only points of the same type can be merged")
+
+    # Find all targets first so invalid pairs don't leave a partial merge
+    entities = scene.sketcher.entities
+    targets = {}
+    for type_index in np.unique(type_indices[:, 0]):
+        type_index = int(type_index)
+        points = getattr(entities, _entity_collections[type_index])
+        count = len(points)
+
+        fixed = np.empty(count, dtype=bool)
+        points.foreach_get("fixed", fixed)
+        origin = np.empty(count, dtype=bool)
+        points.foreach_get("origin", origin)
+
+        local = pairs[type_indices[:, 0] == type_index] & 0xFFFFF
+        targets[type_index] = _merge_targets(local, fixed | origin)
+
+    point_count, constraint_count = 0, 0
+    for type_index, target in targets.items():
+        result = _apply_merge(scene, type_index, target, sketch_index, indices)
+        point_count += result.points
+        constraint_count += result.constraints
+    return MergeResult(point_count, constraint_count)
+
+
+def merge_points(scene, sketch, tolerance: float = MERGE_TOLERANCE) -> MergeResult:
+    """Merge all 2D points of a sketch that are within tolerance of each other
+
+    Returns:
+        MergeResult: Number of removed points and removed constraints that
+        referenced two merged points.
+    """
+    entities = scene.sketcher.entities
+    points = entities.points2D
+    count = len(points)
+    if not count:
+        return MergeResult(0, 0)
+
+    type_index = _entity_collections.index("points2D")
+
+    sketch_i = np.empty(count, dtype=np.int32)
+    points.foreach_get("sketch_i", sketch_i)
+    local = np.flatnonzero(sketch_i == sketch.slvs_index)
+
+    co = np.empty(count * 2, dtype=np.float32)
+    points.foreach_get("co", co)
+    fixed = np.empty(count, dtype=bool)
+    points.foreach_get("fixed", fixed)
+
+    duplicates = find_duplicates(co.reshape(-1, 2)[local], fixed[local], tolerance)
+    target = np.arange(count)
+    target[local] = local[duplicates]
+
+    # Segments don't collapse when their endpoints are within tolerance
+    kept = _keep_segments(scene, type_index, target)
+    if kept:
+        logger.debug("Kept {} points that would collapse a segment".format(kept))
+
+    result = _apply_merge(scene, type_index, target, sketch.slvs_index)
+    if result.points:
+        logger.info(
+            "Merged {} points of {}, removed {} constraints".format(
+                result.points, sketch, result.constraints
+            )
+        )
+    return result
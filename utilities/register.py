@@ -1,9 +1,15 @@
 import os
 import sys
+import time
+import logging
 import importlib
 from typing import List
 from traceback import print_exc
 
+from .. import global_data
+
+logger = logging.getLogger(__name__)
+
 
 # From: https://github.com/iyadahmed/bpy_helper/blob/main/bpy_helper/register.py
 def cleanse_modules(parent_module_name):
@@ -26,17 +32,34 @@ def get_name():
 
 # Similar to bpy.utils.register_submodule_factory
 def module_register_factory(parent_module_name: str, module_names: List[str]):
-    modules = [
-        importlib.import_module(f"{parent_module_name}.{name}") for name in module_names
-    ]
+    """Modules are only imported once they get registered, the time it takes to
+    import and register each module is stored in global_data.startup_timings
+
+    NOTE: The import time of a module includes the modules it imports that
+    weren't imported before
+    """
+    modules = []
 
     def register():
-        for m in modules:
+        modules.clear()
+        for name in module_names:
+            start = time.perf_counter()
+            m = importlib.import_module(f"{parent_module_name}.{name}")
+            imported = time.perf_counter()
+            modules.append(m)
             try:
                 m.register()
             except Exception:
                 print_exc()
 
+            timings = (imported - start, time.perf_counter() - imported)
+            global_data.startup_timings[name] = timings
+            logger.debug(
+                "Module {}: import {:.2f}ms, register {:.2f}ms".format(
+                    name, *(t * 1000 for t in timings)
+                )
+            )
+
     def unregister():
         for m in reversed(modules):
             try:
@@ -0,0 +1,123 @@
+"""Cache of solver results keyed by the inputs of a solver group
+
+Keys are built from the exported solver data with handles replaced by their
+position, this makes them independent of data in other groups as well as of
+the group's own number.
+"""
+
+from collections import OrderedDict, namedtuple
+from typing import Dict, List, Tuple, Union
+
+from .solver_pool import SystemData
+
+# Number of solved groups that are kept
+CACHE_SIZE = 64
+
+CachedResult = namedtuple("CachedResult", ("params", "retval", "dof", "failed"))
+
+GroupKey = namedtuple("GroupKey", ("hash", "inputs", "params", "constraints"))
+
+
+def _map_handles(items) -> Dict[int, int]:
+    mapping = {item[0]: i + 1 for i, item in enumerate(items)}
+    # Keep unset references and SLVS_FREE_IN_3D
+    mapping[0] = 0
+    return mapping
+
+
+def group_key(data: SystemData, group: int) -> GroupKey:
+    """Returns the canonical key of the data needed to solve a group, expects
+    data that was split with solver_pool.split_system
+    """
+    p_map = _map_handles(data.params)
+    e_map = _map_handles(data.entities)
+
+    params = tuple((g == group, val) for _h, g, val in data.params)
+    entities = tuple(
+        (
+            g == group,
+            type,
+            e_map[wp],
+            e_map[normal],
+            e_map[distance],
+            tuple(e_map[p] for p in points),
+            tuple(p_map[p] for p in entity_params),
+        )
+        for _h, g, type, wp, normal, distance, points, entity_params in data.entities
+    )
+    constraints = tuple(
+        (type, e_map[wp], val, *(e_map[ref] for ref in refs), other, other2)
+        for _h, _g, type, wp, val, *refs, other, other2 in data.constraints
+    )
+
+    inputs = (params, entities, constraints)
+    return GroupKey(
+        hash(inputs),
+        inputs,
+        [h for h, g, _val in data.params if g == group],
+        [c[0] for c in data.constraints],
+    )
+
+
+class SolveCache:
+    """Least recently used cache of solved groups"""
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: GroupKey) -> Union[CachedResult, None]:
+        """Returns the cached result with handles of the given key"""
+        entry = self._data.get(key.hash)
+
+        # Different inputs might share a hash
+        if entry is None or entry[0] != key.inputs:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._data.move_to_end(key.hash)
+
+        _inputs, values, retval, dof, failed = entry
+        return CachedResult(
+            list(zip(key.params, values)),
+            retval,
+            dof,
+            [key.constraints[i] for i in failed],
+        )
+
+    def put(
+        self,
+        key: GroupKey,
+        params: List[Tuple[int, float]],
+        retval: int,
+        dof: int,
+        failed: List[int],
+    ):
+        """Store the result of a solved group, params are (handle, value) pairs"""
+        values = dict(params)
+        constraint_positions = {h: i for i, h in enumerate(key.constraints)}
+
+        self._data[key.hash] = (
+            key.inputs,
+            tuple(values[h] for h in key.params),
+            retval,
+            dof,
+            tuple(constraint_positions[h] for h in failed if h in constraint_positions),
+        )
+        self._data.move_to_end(key.hash)
+        if len(self._data) > self.size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+cache = SolveCache()
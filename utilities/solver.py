@@ -1,9 +1,141 @@
+import logging
+from contextlib import contextmanager
+
+import bpy
 from bpy.types import Context
 
 from ..solver import solve_system
 
+logger = logging.getLogger(__name__)
+
+# Index of the 3D group in the pending solves
+NO_SKETCH = -1
+
+# Maps scene pointers to the indices of sketches that need to be solved,
+# unlike names pointers don't change when a scene gets renamed
+_pending = {}
+
+# Depth of nested defer_solves blocks
+_deferred = 0
+
+
+def _get_sketch(element, context: Context):
+    sketch = getattr(element, "sketch", None)
+    if sketch is None:
+        sketch = context.scene.sketcher.active_sketch
+    return sketch
+
+
+def schedule_solve(context: Context, sketch=None):
+    """Mark a sketch as needing a solve, all pending solves run once on the
+    next tick of the event loop
+    """
+    index = sketch.slvs_index if sketch else NO_SKETCH
+    _pending.setdefault(context.scene.as_pointer(), set()).add(index)
+
+    if _deferred:
+        return
+    if not bpy.app.timers.is_registered(_solve_pending):
+        bpy.app.timers.register(_solve_pending, first_interval=0.0)
+
+
+@contextmanager
+def defer_solves(context: Context = None):
+    """Collect all solves that are requested inside the block, e.g. while
+    adding many elements, and run them once when the outermost block exits
+    """
+    global _deferred
+    _deferred += 1
+    try:
+        yield
+    finally:
+        _deferred -= 1
+
+    if not _deferred:
+        flush(context)
+
+
+def _find_scene(pointer: int):
+    for scene in bpy.data.scenes:
+        if scene.as_pointer() == pointer:
+            return scene
+    return None
+
+
+def has_pending() -> bool:
+    return bool(_pending)
+
+
+def flush(context: Context = None) -> bool:
+    """Run all pending solves now
+
+    Returns:
+        bool: False if any of the solves failed
+    """
+    if bpy.app.timers.is_registered(_solve_pending):
+        bpy.app.timers.unregister(_solve_pending)
+
+    if not _pending or _deferred:
+        return True
+
+    if context is None:
+        context = bpy.context
+
+    pending = dict(_pending)
+    _pending.clear()
+
+    ok = True
+    for pointer, indices in pending.items():
+        scene = _find_scene(pointer)
+        if scene is None:
+            continue
+
+        with context.temp_override(scene=scene):
+            entities = scene.sketcher.entities
+            logger.debug(
+                "Run {} scheduled solves in {}".format(len(indices), scene.name)
+            )
+            for index in sorted(indices):
+                sketch = None if index == NO_SKETCH else entities.get(index)
+                if index != NO_SKETCH and sketch is None:
+                    # Sketch was removed in the meantime
+                    continue
+                ok &= solve_system(context, sketch=sketch)
+    return ok
+
+
+def clear_pending(*_args):
+    """Drop all pending solves, e.g. when another file is loaded"""
+    _pending.clear()
+    if bpy.app.timers.is_registered(_solve_pending):
+        bpy.app.timers.unregister(_solve_pending)
+
+
+def _tag_redraw():
+    wm = bpy.context.window_manager
+    if not wm:
+        return
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == "VIEW_3D":
+                area.tag_redraw()
+
+
+def _solve_pending():
+    flush()
+    # Nothing else redraws the view after a solve that ran on a timer
+    _tag_redraw()
+    # Don't repeat the timer
+    return None
+
 
 def update_system_cb(self, context: Context):
-    """Update scene and re-run the solver, used as a property update callback"""
-    sketch = context.scene.sketcher.active_sketch
-    solve_system(context, sketch=sketch)
+    """Solve the affected sketch, used as a property update callback
+
+    Updates inside of a defer_solves block are combined into one solve when the
+    block exits. Otherwise the sketch is solved right away, blender pushes the
+    undo step of an edit before the next tick and would store unsolved geometry.
+    """
+    schedule_solve(context, sketch=_get_sketch(self, context))
+    if not _deferred:
+        flush(context)
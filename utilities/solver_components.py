@@ -0,0 +1,212 @@
+"""Split a solver group into components that don't share any free params
+
+Geometry that isn't connected through constraints can be solved independently,
+this keeps the systems that have to be solved small and limits failures to the
+component that actually contains the conflicting constraints.
+"""
+
+from collections import OrderedDict, namedtuple
+from typing import Iterable, List
+
+from .solver_pool import SystemData, build_system
+
+# Maximum difference of a param before and after solving to count as unchanged
+PARAM_TOLERANCE = 1e-6
+
+# Number of settled components that are remembered
+SETTLED_SIZE = 1024
+
+# Components that didn't change when they were last solved, maps the hashes of
+# the static data and the component to their inputs and (retval, dof, failed)
+_settled = OrderedDict()
+
+ComponentResult = namedtuple(
+    "ComponentResult", ("retval", "dof", "failed", "params", "skipped", "size")
+)
+
+Signature = namedtuple("Signature", ("hash", "inputs"))
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parents = {}
+
+    def add(self, key):
+        self.parents.setdefault(key, key)
+
+    def find(self, key):
+        parents = self.parents
+        root = key
+        while parents[root] != root:
+            root = parents[root]
+        # Path compression
+        while parents[key] != root:
+            parents[key], key = root, parents[key]
+        return root
+
+    def union(self, keys):
+        keys = iter(keys)
+        first = next(keys, None)
+        if first is None:
+            return
+        root = self.find(first)
+        for key in keys:
+            other = self.find(key)
+            if other != root:
+                self.parents[other] = root
+
+
+def find_components(data: SystemData, group: int) -> List[SystemData]:
+    """Returns the params, entities and constraints of a group split into
+    connected components
+
+    Entities without free params, e.g. 2D normals, don't connect geometry and
+    are added to every component.
+    """
+    uf = _UnionFind()
+    for h, g, _val in data.params:
+        if g == group:
+            uf.add(h)
+
+    # Free params that each entity depends on, including the ones of its points
+    entity_params = {}
+    for h, g, _type, _wp, normal, distance, points, params in data.entities:
+        if g != group:
+            continue
+        free = {p for p in params if p in uf.parents}
+        for ref in (*points, normal, distance):
+            free.update(entity_params.get(ref, ()))
+        entity_params[h] = free
+        uf.union(free)
+
+    constraint_params = {}
+    for c in data.constraints:
+        if c[1] != group:
+            continue
+        free = set()
+        # ptA, ptB, entityA, entityB, entityC, entityD
+        for ref in c[5:11]:
+            free.update(entity_params.get(ref, ()))
+        constraint_params[c[0]] = free
+        uf.union(free)
+
+    def _component(free, fallback):
+        if not free:
+            return fallback
+        return uf.find(next(iter(free)))
+
+    components = {}
+
+    def _get(key):
+        if key not in components:
+            components[key] = SystemData([], [], [])
+        return components[key]
+
+    for p in data.params:
+        if p[1] == group:
+            _get(uf.find(p[0])).params.append(p)
+
+    shared = []
+    for e in data.entities:
+        if e[1] != group:
+            continue
+        free = entity_params[e[0]]
+        if not free:
+            shared.append(e)
+            continue
+        _get(_component(free, None)).entities.append(e)
+
+    for c in data.constraints:
+        if c[1] != group:
+            continue
+        key = _component(constraint_params[c[0]], ("constraint", c[0]))
+        _get(key).constraints.append(c)
+
+    result = list(components.values())
+    for component in result:
+        component.entities[:0] = shared
+    return result
+
+
+def static_data(data: SystemData, static_groups: Iterable[int]) -> SystemData:
+    """Returns the params and entities that are needed by every component"""
+    static_groups = set(static_groups)
+    return SystemData(
+        [p for p in data.params if p[1] in static_groups],
+        [e for e in data.entities if e[1] in static_groups],
+        [],
+    )
+
+
+def _with_static(component: SystemData, static: SystemData):
+    return SystemData(
+        static.params + component.params,
+        static.entities + component.entities,
+        component.constraints,
+    )
+
+
+def signature(data: SystemData) -> Signature:
+    """All inputs and their hash, equal data results in an equal signature"""
+    inputs = (tuple(data.params), tuple(data.entities), tuple(data.constraints))
+    return Signature(hash(inputs), inputs)
+
+
+def _is_unchanged(component: SystemData, params) -> bool:
+    return all(
+        abs(old[2] - new) <= PARAM_TOLERANCE
+        for old, (_h, new) in zip(component.params, params)
+    )
+
+
+def solve_component(
+    component: SystemData,
+    static: SystemData,
+    static_signature: Signature,
+    group: int,
+    report: bool,
+) -> ComponentResult:
+    """Solve a single component, skips the solve if neither the component nor
+    the static data changed since it was last solved without changes
+    """
+    size = len(component.params)
+    component_signature = signature(component)
+    key = (static_signature.hash, component_signature.hash)
+    inputs = (static_signature.inputs, component_signature.inputs)
+
+    # Different inputs might share a hash
+    settled = _settled.get(key)
+    if settled is not None and settled[0] == inputs:
+        _settled.move_to_end(key)
+        _inputs, (retval, dof, failed) = settled
+        return ComponentResult(retval, dof, failed, [], True, size)
+
+    solvesys = build_system(_with_static(component, static))
+    retval = solvesys.solve(group=group, reportFailed=report, findFreeParams=False)
+    params = [(h, solvesys.getParam(h).val) for h, _g, _val in component.params]
+    failed = list(solvesys.Failed)
+    dof = solvesys.Dof
+
+    if retval in (0, 5) and _is_unchanged(component, params):
+        _settled[key] = (inputs, (retval, dof, failed))
+        _settled.move_to_end(key)
+        if len(_settled) > SETTLED_SIZE:
+            _settled.popitem(last=False)
+
+    return ComponentResult(retval, dof, failed, params, False, size)
+
+
+def combine_retval(results: List[ComponentResult]) -> int:
+    """Returns the first failure of any component or the most significant
+    successful result
+    """
+    for r in results:
+        if r.retval not in (0, 5):
+            return r.retval
+    if any(r.retval == 5 for r in results):
+        return 5
+    return 0
+
+
+def clear():
+    _settled.clear()
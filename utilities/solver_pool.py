@@ -0,0 +1,187 @@
+"""Solve independent solver groups concurrently in worker processes
+
+The solver system of the main process is exported into plain tuples of params,
+entities and constraints and split per group. Every worker rebuilds a system
+that only holds the data of the static groups and the group it has to solve,
+keeping the original handles so results can be merged back without remapping.
+
+Workers are spawned instead of forked, forking blender while it holds a GPU
+context and other threads isn't safe. They only import the standalone module in
+the worker directory, see worker/cad_sketcher_slvs_worker.py. The pool is kept
+alive between solves as starting the processes is expensive.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable, List, Union
+
+logger = logging.getLogger(__name__)
+
+# Minimal number of groups for which solving in worker processes pays off
+MIN_GROUPS = 2
+
+# Directory of the worker module, it's imported by name in spawned processes
+WORKER_PATH = os.path.join(os.path.dirname(__file__), "worker")
+WORKER_MODULE = "cad_sketcher_slvs_worker"
+
+
+def _import_worker():
+    # Spawned processes inherit sys.path and can import the module without
+    # importing the addon package
+    if WORKER_PATH not in sys.path:
+        sys.path.append(WORKER_PATH)
+    return importlib.import_module(WORKER_MODULE)
+
+
+_worker = _import_worker()
+SystemData = _worker.SystemData
+GroupResult = _worker.GroupResult
+build_system = _worker.build_system
+solve_group = _worker.solve_group
+
+_executor = None
+_executor_workers = 0
+
+
+def is_supported() -> bool:
+    return "spawn" in multiprocessing.get_all_start_methods()
+
+
+def get_worker_count(requested: int = 0) -> int:
+    """Returns the number of worker processes, 0 means one per cpu"""
+    if requested > 0:
+        return requested
+    return os.cpu_count() or 1
+
+
+def export_system(solvesys) -> SystemData:
+    """Copy all params, entities and constraints of a system into plain tuples"""
+    params = []
+    for h in range(1, solvesys.ParamHandle + 1):
+        p = solvesys.getParam(h)
+        params.append((p.h, p.group, p.val))
+
+    entities = []
+    for h in range(1, solvesys.EntityHandle + 1):
+        e = solvesys.getEntity(h)
+        entities.append(
+            (
+                *(getattr(e, attr) for attr in _worker.ENTITY_ATTRS),
+                tuple(solvesys.getEntityPoint(h, i) for i in range(4)),
+                tuple(solvesys.getEntityParam(h, i) for i in range(4)),
+            )
+        )
+
+    constraints = []
+    for h in range(1, solvesys.ConstraintHandle + 1):
+        c = solvesys.getConstraint(h)
+        constraints.append(tuple(getattr(c, attr) for attr in _worker.CONSTRAINT_ATTRS))
+
+    return SystemData(params, entities, constraints)
+
+
+def split_system(
+    data: SystemData, group: int, static_groups: Iterable[int]
+) -> SystemData:
+    """Returns the subset of data that's needed to solve the given group"""
+
+    def _is_relevant(g):
+        return g == group or g in static_groups
+
+    return SystemData(
+        [p for p in data.params if _is_relevant(p[1])],
+        [e for e in data.entities if _is_relevant(e[1])],
+        # Constraints of other groups don't affect the result
+        [c for c in data.constraints if c[1] == group],
+    )
+
+
+def apply_params(solvesys, group: int, params):
+    """Write solved (handle, value) pairs of a group back into the main system"""
+    from py_slvs import slvs
+
+    for h, val in params:
+        solvesys.addParam(slvs.makeParam(h, group, val), True)
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """Returns the shared pool of worker processes, it's only recreated when
+    more workers are requested than it has
+    """
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers < workers:
+        shutdown()
+        _executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _executor_workers = workers
+    return _executor
+
+
+@contextmanager
+def _hide_main_module():
+    # Spawned processes run the main module of the parent again, in blender
+    # that's a script that imports bpy or no file at all
+    main = sys.modules["__main__"]
+    attrs = {k: v for k, v in vars(main).items() if k in ("__file__", "__spec__")}
+    main.__spec__ = None
+    vars(main).pop("__file__", None)
+    try:
+        yield
+    finally:
+        vars(main).update(attrs)
+        if "__spec__" not in attrs:
+            del main.__spec__
+
+
+def submit(func, *args, workers: int = 1) -> Future:
+    """Run a function of the worker module in the shared pool"""
+    with _hide_main_module():
+        return get_executor(workers).submit(func, *args)
+
+
+def shutdown():
+    """Stop the worker processes, e.g. when the addon is unregistered"""
+    global _executor, _executor_workers
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _executor_workers = 0
+
+
+def solve_groups(
+    data: SystemData,
+    groups: List[int],
+    static_groups: Iterable[int],
+    report: bool,
+    workers: int = 0,
+) -> Union[List[GroupResult], None]:
+    """Solve groups in a process pool
+
+    Returns:
+        List[GroupResult]: Results in the same order as the given groups or None
+        if the groups couldn't be solved in parallel, callers are expected to
+        fall back to serial solving in that case.
+    """
+    if len(groups) < MIN_GROUPS or not is_supported():
+        return None
+
+    static_groups = set(static_groups)
+    chunks = [split_system(data, g, static_groups) for g in groups]
+
+    try:
+        futures = [
+            submit(solve_group, chunk, g, report, workers=get_worker_count(workers))
+            for chunk, g in zip(chunks, groups)
+        ]
+        return [future.result() for future in futures]
+    except Exception as e:
+        # A broken pool is started again on the next solve
+        shutdown()
+        logger.warning("Parallel solving failed, fall back to serial: {}".format(e))
+        return None
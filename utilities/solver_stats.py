@@ -0,0 +1,140 @@
+import json
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Union
+
+logger = logging.getLogger(__name__)
+
+# Number of solver runs that are kept in memory
+HISTORY_SIZE = 100
+
+history = deque(maxlen=HISTORY_SIZE)
+
+
+class SolveRecord:
+    """Metrics collected during a single run of the solver"""
+
+    __slots__ = (
+        "timestamp",
+        "sketch",
+        "all",
+        "tweak",
+        "entity_count",
+        "param_count",
+        "constraint_count",
+        "phases",
+        "groups",
+    )
+
+    def __init__(self, sketch=None, all=False):
+        self.timestamp = time.time()
+        self.sketch = str(sketch) if sketch else None
+        self.all = all
+        self.tweak = False
+        self.entity_count = 0
+        self.param_count = 0
+        self.constraint_count = 0
+        # Wall time in seconds per phase
+        self.phases = {}
+        # One entry per solved group
+        self.groups = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Measure the wall time of a block, repeated phases are accumulated"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + duration
+
+    @contextmanager
+    def group(self, group: int, sketch=None):
+        """Measure the solve of a single group, yields the group's entry"""
+        entry = {
+            "group": group,
+            "sketch": str(sketch) if sketch else None,
+            "result": None,
+            "dof": None,
+            "failed": 0,
+            "time": 0.0,
+        }
+        self.groups.append(entry)
+        with self.phase("solve"):
+            start = time.perf_counter()
+            try:
+                yield entry
+            finally:
+                entry["time"] = time.perf_counter() - start
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.phases.values())
+
+    def to_dict(self):
+        return {
+            "timestamp": self.timestamp,
+            "sketch": self.sketch,
+            "all": self.all,
+            "tweak": self.tweak,
+            "entities": self.entity_count,
+            "params": self.param_count,
+            "constraints": self.constraint_count,
+            "phases": dict(self.phases),
+            "total_time": self.total_time,
+            "groups": list(self.groups),
+        }
+
+
+def is_enabled() -> bool:
+    from .preferences import use_experimental
+
+    try:
+        return use_experimental("collect_solver_stats", False)
+    except KeyError:
+        # Addon preferences aren't available e.g. in a worker process
+        return False
+
+
+def new_record(sketch=None, all=False) -> Union[SolveRecord, None]:
+    """Returns a new record if statistics are enabled, None otherwise"""
+    if not is_enabled():
+        return None
+    return SolveRecord(sketch, all)
+
+
+def measure(record: Union[SolveRecord, None], name: str):
+    """Returns a context manager that measures a phase if a record is given"""
+    if record is None:
+        return nullcontext()
+    return record.phase(name)
+
+
+def measure_group(record: Union[SolveRecord, None], group: int, sketch=None):
+    """Returns a context manager that measures a group's solve if a record is given"""
+    if record is None:
+        return nullcontext()
+    return record.group(group, sketch)
+
+
+def commit(record: SolveRecord):
+    """Store a finished record in the history and write it to the log"""
+    history.append(record)
+    logger.info(json.dumps(record.to_dict()))
+
+
+def clear():
+    history.clear()
+
+
+def to_json(indent=2) -> str:
+    return json.dumps([r.to_dict() for r in history], indent=indent)
+
+
+def export(filepath: str):
+    """Write the history of solver runs to a json file"""
+    with open(filepath, "w") as f:
+        f.write(to_json())
@@ -0,0 +1,157 @@
+"""Lightweight transactions on the sketcher data of a scene
+
+Stateful operators preview their result while the user is still interacting,
+reverting such a preview with blender's global undo is expensive as it restores
+the whole file. A transaction instead remembers the size of every entity and
+constraint collection as well as the original values of elements that are
+written to, rolling back only touches what has actually changed.
+
+Entities and constraints record themselves when one of their properties is
+assigned, as does utilities.bpy.setprop. Code that writes to existing elements
+in other ways, e.g. by modifying vectors in place, has to call
+record_write(element, name) before the write. Removed elements and pointers
+that are rewritten in bulk can't be restored, such changes call invalidate and
+the transaction falls back to blender's undo.
+"""
+
+import logging
+from typing import Union
+
+from bpy.types import PropertyGroup, Scene
+
+logger = logging.getLogger(__name__)
+
+_active = None
+
+# Runtime properties that don't need to be reverted
+UNTRACKED_PROPS = {"dirty"}
+
+
+def _to_python(value):
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    return value
+
+
+class Transaction:
+    def __init__(self, scene: Scene):
+        from ..model.group_entities import _entity_collections
+
+        sketcher = scene.sketcher
+        self.scene = scene
+        self.entity_lengths = [
+            (c, len(c))
+            for c in (getattr(sketcher.entities, name) for name in _entity_collections)
+        ]
+        self.constraint_lengths = [
+            (c, len(c)) for c in sketcher.constraints.get_lists()
+        ]
+        # Maps the path of written elements to their original id properties
+        self.snapshots = {}
+        # Reason why the changes can't be rolled back
+        self.invalid = None
+
+    def record(self, element: PropertyGroup):
+        if element.id_data != self.scene:
+            # Only sketcher data of the scene can be rolled back
+            return
+
+        path = element.path_from_id()
+        if path in self.snapshots:
+            return
+        self.snapshots[path] = {k: _to_python(v) for k, v in element.items()}
+
+    def invalidate(self, reason: str):
+        if self.invalid is None:
+            self.invalid = reason
+
+    def rollback(self) -> bool:
+        """Revert all changes, returns False if that isn't possible"""
+        global _active
+        if _active is self:
+            _active = None
+
+        if self.invalid is not None:
+            logger.debug("Transaction can't be rolled back: {}".format(self.invalid))
+            return False
+
+        for collection, length in self.entity_lengths + self.constraint_lengths:
+            if len(collection) < length:
+                # Elements have been removed, they can't be restored
+                return False
+
+        # Remove elements that have been added, the last element of a collection
+        # is removed without moving others. Removing them through the sketcher
+        # collections also invalidates runtime data like batches and selection
+        sketcher = self.scene.sketcher
+        for collection, length in self.constraint_lengths:
+            for i in reversed(range(length, len(collection))):
+                sketcher.constraints.remove(collection[i])
+        for collection, length in reversed(self.entity_lengths):
+            for i in reversed(range(length, len(collection))):
+                sketcher.entities.remove(collection[i].slvs_index)
+
+        for path, values in self.snapshots.items():
+            try:
+                element = self.scene.path_resolve(path)
+            except ValueError:
+                # Element was added during the transaction
+                continue
+
+            for key in set(element.keys()) - values.keys():
+                del element[key]
+            for key, value in values.items():
+                element[key] = value
+
+            if hasattr(element, "tag_update"):
+                element.tag_update()
+
+        logger.debug("Rolled back {} written elements".format(len(self.snapshots)))
+        return True
+
+    def commit(self):
+        """Keep all changes"""
+        global _active
+        if _active is self:
+            _active = None
+
+
+def begin(scene: Scene) -> Transaction:
+    """Start a new transaction, replaces a previously active one"""
+    global _active
+    _active = Transaction(scene)
+    return _active
+
+
+def get_active() -> Union[Transaction, None]:
+    return _active
+
+
+def record(element: PropertyGroup):
+    """Store the values of an element before it gets written to, does nothing
+    if no transaction is active
+    """
+    if _active is None:
+        return
+    _active.record(element)
+
+
+def invalidate(reason: str):
+    """Mark changes that can't be rolled back, e.g. removed elements, the
+    active transaction then falls back to undo
+    """
+    if _active is None:
+        return
+    _active.invalidate(reason)
+
+
+def record_write(element: PropertyGroup, name: str):
+    """Record an element before its property with the given name is set"""
+    if _active is None or name in UNTRACKED_PROPS:
+        return
+    # Python properties end up writing rna properties themselves
+    if name not in element.bl_rna.properties:
+        return
+    _active.record(element)
@@ -4,16 +4,20 @@ from typing import List
 from bpy.types import Scene
 
 from ..model.types import SlvsGenericEntity
+from .membership import get_membership
 
 logger = logging.getLogger(__name__)
 
 
-def point_entity_mapping(scene):
-    """Get a entities per point mapping"""
+def point_entity_mapping(scene, entities=None):
+    """Get a entities per point mapping, optionally only of the given entities"""
 
     points = []
-    entities = []
-    for entity in scene.sketcher.entities.all:
+    point_entities = []
+    lookup = {}
+    if entities is None:
+        entities = scene.sketcher.entities.all
+    for entity in entities:
         if entity.is_point():
             continue
         if not hasattr(entity, "connection_points"):
@@ -21,16 +25,16 @@ def point_entity_mapping(scene):
         for p in entity.connection_points():
             if not p.is_point():
                 continue
-            if p not in points:
+            i = lookup.get(p.slvs_index)
+            if i is None:
+                i = lookup[p.slvs_index] = len(points)
                 points.append(p)
-            i = points.index(p)
-            if i >= len(entities):
-                entities.append([])
-            ents = entities[i]
+                point_entities.append([])
+            ents = point_entities[i]
             if entity not in ents:
                 ents.append(entity)
-    assert len(points) == len(entities)
-    return points, entities
+    assert len(points) == len(point_entities)
+    return points, point_entities
 
 
 def shares_point(seg_1, seg_2):
@@ -54,20 +58,25 @@ class EntityWalker:
         self.paths: List[tuple[List[SlvsGenericEntity, bool]]] = []
         self.scene: Scene = scene
         self.sketch = sketch
-        self.points, self.entities = point_entity_mapping(scene)
         self.entity = entity
 
-        # TODO: use sketch.entities?
-        sketch_index = self.sketch.slvs_index
-        for e in self.scene.sketcher.entities.all:
-            if not hasattr(e, "sketch") or e.sketch_i != sketch_index:
-                continue
+        entities = self.scene.sketcher.entities
+        membership = get_membership(self.scene)
+        members = [
+            entities.get(index)
+            for index in membership.entities.get(self.sketch.slvs_index, ())
+        ]
+        for e in members:
             if not e.is_path():
                 continue
             if e.construction:
                 continue
             self.sketch_entities.append(e)
 
+        # Only entities of the sketch can be part of its paths
+        self.points, self.entities = point_entity_mapping(scene, members)
+        self._point_lookup = {p.slvs_index: i for i, p in enumerate(self.points)}
+
         self._run()
 
     @staticmethod
@@ -97,7 +106,7 @@ class EntityWalker:
         )
 
     def _get_connected_entities(self, point):
-        return self.entities[self.points.index(point)]
+        return self.entities[self._point_lookup[point.slvs_index]]
 
     def _branch_path(self):
         self.paths.append(([], []))
@@ -0,0 +1,66 @@
+"""Solve a single solver group from exported data
+
+This module runs in worker processes that are started with the spawn method,
+it's imported by name from its own directory and must not import bpy or the
+addon package, only py_slvs.
+"""
+
+from collections import namedtuple
+
+SystemData = namedtuple("SystemData", ("params", "entities", "constraints"))
+GroupResult = namedtuple("GroupResult", ("group", "retval", "dof", "failed", "params"))
+
+ENTITY_ATTRS = ("h", "group", "type", "wrkpl", "normal", "distance")
+CONSTRAINT_ATTRS = (
+    "h",
+    "group",
+    "type",
+    "wrkpl",
+    "valA",
+    "ptA",
+    "ptB",
+    "entityA",
+    "entityB",
+    "entityC",
+    "entityD",
+    "other",
+    "other2",
+)
+
+
+def build_system(data: SystemData):
+    """Create a system from exported data, handles are kept as they are"""
+    from py_slvs import slvs
+
+    solvesys = slvs.System()
+
+    for h, g, val in data.params:
+        solvesys.addParam(slvs.makeParam(h, g, val))
+
+    for *values, points, params in data.entities:
+        e = slvs.entity()
+        for attr, value in zip(ENTITY_ATTRS, values):
+            setattr(e, attr, value)
+        solvesys.addEntity(e)
+
+        h = e.h
+        for i in range(4):
+            solvesys.setEntityPoint(h, i, points[i])
+            solvesys.setEntityParam(h, i, params[i])
+
+    for values in data.constraints:
+        c = slvs.constraint()
+        for attr, value in zip(CONSTRAINT_ATTRS, values):
+            setattr(c, attr, value)
+        solvesys.addConstraint(c)
+
+    return solvesys
+
+
+def solve_group(data: SystemData, group: int, report: bool) -> GroupResult:
+    """Solve a single group, this is what runs in the worker processes"""
+    solvesys = build_system(data)
+    retval = solvesys.solve(group=group, reportFailed=report, findFreeParams=False)
+
+    params = [(h, solvesys.getParam(h).val) for h, g, _val in data.params if g == group]
+    return GroupResult(group, retval, solvesys.Dof, list(solvesys.Failed), params)
@@ -1,6 +1,9 @@
 import bpy
 import logging
+import numpy as np
+
 from . import get_addon_version_tuple
+from .utilities.index import assemble_index
 
 logger = logging.getLogger(__name__)
 
@@ -20,22 +23,38 @@ def recalc_pointers(scene):
     """Updates type index of entities keeping local index as is"""
 
     # TODO: Move to utilities.data_handling
-    from .model.utilities import update_pointers
+    from .model.group_entities import _entity_collections
+    from .model.utilities import remap_indices
+
+    # Collect all changed indices first, pointers are then updated in one pass
+    mapping = {}
+    entities = scene.sketcher.entities
+    for type_index, name in enumerate(_entity_collections):
+        collection = getattr(entities, name)
+        if not len(collection):
+            continue
+
+        indices = np.empty(len(collection), dtype=np.int32)
+        collection.foreach_get("slvs_index", indices)
+        new_indices = assemble_index(type_index, indices & 0xFFFFF)
 
-    msg = ""
-    entities = list(scene.sketcher.entities.all)
-    for e in reversed(entities):
-        i = e.slvs_index
-        # scene.sketcher.entities._set_index(e)
-        scene.sketcher.entities.recalc_type_index(e)
+        changed = indices != new_indices
+        if not changed.any():
+            continue
+
+        collection.foreach_set("slvs_index", new_indices)
+        mapping.update(zip(indices[changed].tolist(), new_indices[changed].tolist()))
 
-        if i != e.slvs_index:
-            msg += "\n - {}: {} -> {}".format(e, i, e.slvs_index)
-            update_pointers(scene, i, e.slvs_index)
+    if not mapping:
+        return
 
-    if msg:
+    if logger.isEnabledFor(logging.DEBUG):
+        msg = "".join("\n - {} -> {}".format(*item) for item in mapping.items())
         logger.debug("Update entity indices:" + msg)
 
+    remap_indices(scene, mapping)
+    scene.sketcher.purge_stale_data()
+
 
 def do_versioning(self):
 